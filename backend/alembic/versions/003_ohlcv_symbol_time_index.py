@@ -0,0 +1,23 @@
+"""Index ohlcv by (symbol, time) for per-symbol range reads.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_ohlcv_symbol_time", "ohlcv", ["symbol", "time"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ohlcv_symbol_time", table_name="ohlcv")
@@ -1,16 +1,29 @@
-"""Alpha Vantage REST adapter. Uses ALPHA_VANTAGE_API_KEY; respects rate limiter."""
+"""Alpha Vantage REST adapter (sync and async). Uses ALPHA_VANTAGE_API_KEY; respects rate limiter."""
 import logging
 import os
 import time
+from datetime import datetime, timedelta
 from typing import Any, Optional
 
-import requests
-
-from app.adapters.base import DataSourceAdapter
+from app.adapters.base import (
+    AsyncDataSourceAdapter,
+    DataSourceAdapter,
+    QuotaUnavailable,
+    UpstreamUnavailable,
+    raise_if_transient,
+)
+from app.config import get_settings
+from app.services.fetch_planner import AssetTypeMemo, is_known_etf, remember_asset_type
+from app.services.http_client import get_async_http_client, get_http_client
 from app.services.rate_limiter import get_alpha_vantage_limiter
 
 logger = logging.getLogger(__name__)
 BASE_URL = "https://www.alphavantage.co/query"
+# outputsize=compact returns the latest 100 bars; use it for incremental refreshes that fit in that window
+COMPACT_MAX_AGE_DAYS = 120
+# Phrases of an "Information" body that is a rate limit; other Information bodies (invalid key, premium endpoint)
+# will not change on a retry
+RATE_LIMIT_PHRASES = ("rate limit", "requests per", "call frequency")
 
 
 def _to_float(val: Any) -> Optional[float]:
@@ -27,145 +40,297 @@ def _to_int(val: Any) -> Optional[int]:
     return int(n) if n is not None else None
 
 
+def _days_since(date_str: str) -> Optional[int]:
+    try:
+        return (datetime.utcnow() - datetime.strptime(date_str[:10], "%Y-%m-%d")).days
+    except (TypeError, ValueError):
+        return None
+
+
 def _get_api_key() -> Optional[str]:
     return os.getenv("ALPHA_VANTAGE_API_KEY")
 
 
-def _request(params: dict[str, str]) -> Optional[dict[str, Any]]:
+def _prepare(params: dict[str, str]) -> Optional[dict[str, str]]:
+    """Params with the API key, or None when there is no key."""
     key = _get_api_key()
     if not key:
         return None
-    limiter = get_alpha_vantage_limiter()
-    if not limiter.can_call():
-        return None
     params["apikey"] = key
+    return params
+
+
+def _slot_unavailable() -> None:
+    """Raise QuotaUnavailable: no slot within ALPHA_VANTAGE_MAX_WAIT_SECONDS (or the daily budget is used), which
+    says nothing about the symbol."""
+    wait = get_settings().alpha_vantage_max_wait_seconds
+    logger.debug("Alpha Vantage slot not available within %ss (or daily budget used); falling back", wait)
+    raise QuotaUnavailable(f"Alpha Vantage slot not available within {wait}s")
+
+
+def _check_response(data: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """None for an error answer (e.g. unknown symbol) or an "Information" body that is not a rate limit (invalid
+    key, premium endpoint: the adapter abstains as without a key); a rate-limit note raises."""
+    if "Note" in data:
+        raise UpstreamUnavailable(f"Alpha Vantage rate limit: {data['Note']}")
+    if "Information" in data:
+        info = str(data["Information"])
+        if any(phrase in info.lower() for phrase in RATE_LIMIT_PHRASES):
+            raise UpstreamUnavailable(f"Alpha Vantage rate limit: {info}")
+        logger.warning("Alpha Vantage information response; skipping: %s", info[:200])
+        return None
+    if "Error Message" in data:
+        logger.debug("Alpha Vantage error response; skipping")
+        return None
+    return data
+
+
+def _request(params: dict[str, str]) -> Optional[dict[str, Any]]:
+    prepared = _prepare(params)
+    if prepared is None:
+        return None
+    if not get_alpha_vantage_limiter().try_acquire(get_settings().alpha_vantage_max_wait_seconds):
+        _slot_unavailable()
     try:
-        limiter.record_call()
-        r = requests.get(BASE_URL, params=params, timeout=30)
+        r = get_http_client().get(BASE_URL, params=prepared, read_timeout=30)
         r.raise_for_status()
-        data = r.json()
-        if "Error Message" in data or "Note" in data:
-            logger.debug("Alpha Vantage rate limit or error response; skipping")
-            return None
-        return data
-    except Exception:
+        return _check_response(r.json())
+    except Exception as e:
+        raise_if_transient(e)
         return None
 
 
+async def _request_async(params: dict[str, str]) -> Optional[dict[str, Any]]:
+    prepared = _prepare(params)
+    if prepared is None:
+        return None
+    if not await get_alpha_vantage_limiter().acquire_async(get_settings().alpha_vantage_max_wait_seconds):
+        _slot_unavailable()
+    try:
+        r = await get_async_http_client().get(BASE_URL, params=prepared, read_timeout=30)
+        r.raise_for_status()
+        return _check_response(r.json())
+    except Exception as e:
+        raise_if_transient(e)
+        return None
+
+
+# Request params and response parsing shared by the sync and async adapters
+
+def _symbol_search_params(name: str) -> dict[str, str]:
+    return {"function": "SYMBOL_SEARCH", "keywords": name, "datatype": "json"}
+
+
+def _parse_symbol_search(data: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    if not data or "bestMatches" not in data:
+        return None
+    matches = data.get("bestMatches") or []
+    for m in matches:
+        symbol = m.get("1. symbol")
+        if symbol and isinstance(symbol, str) and symbol.strip():
+            return {
+                "symbol": symbol.strip(),
+                "name": (m.get("2. name") or symbol).strip() if isinstance(m.get("2. name"), str) else symbol.strip(),
+            }
+    return None
+
+
+def _parse_quote(data: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    if not data or "Global Quote" not in data:
+        return None
+    gq = data["Global Quote"]
+    return {
+        "symbol": gq.get("01. symbol"),
+        "price": gq.get("05. price"),
+        "volume": gq.get("06. volume"),
+        "change": gq.get("09. change"),
+        "change_percent": gq.get("10. change percent"),
+    }
+
+
+def _series_params(symbol: str, data_type: str, since: Optional[str]) -> Optional[dict[str, str]]:
+    func_map = {
+        "daily": "TIME_SERIES_DAILY",
+        "weekly": "TIME_SERIES_WEEKLY",
+        "monthly": "TIME_SERIES_MONTHLY",
+    }
+    func = func_map.get(data_type)
+    if not func:
+        return None
+    outputsize = "full" if data_type == "daily" else "compact"
+    age_days = _days_since(since) if since else None
+    if age_days is not None and age_days <= COMPACT_MAX_AGE_DAYS:
+        outputsize = "compact"
+    return {"function": func, "symbol": symbol, "outputsize": outputsize}
+
+
+def _parse_series(data: Optional[dict[str, Any]], since: Optional[str]) -> Optional[list[dict[str, Any]]]:
+    if not data:
+        return None
+    key = next((k for k in data if "Time Series" in k), None)
+    if not key:
+        return None
+    series = data[key]
+    out = []
+    for date_str, v in series.items():
+        open_ = _to_float(v.get("1. open"))
+        high = _to_float(v.get("2. high"))
+        low = _to_float(v.get("3. low"))
+        close = _to_float(v.get("4. close"))
+        vol = _to_int(v.get("5. volume"))
+        out.append({
+            "time": date_str,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": vol,
+        })
+    if since:
+        out = [b for b in out if b["time"] >= since]
+    out.sort(key=lambda x: x["time"])
+    return out
+
+
+def _merge_etf_profile(data: dict[str, Any], etf_data: Optional[dict[str, Any]]) -> dict[str, Any]:
+    if etf_data and isinstance(etf_data, dict):
+        for k, v in etf_data.items():
+            if k not in data and v is not None and v != "":
+                data[k] = v
+    return data
+
+
+def _wants_etf_profile(overview: Optional[dict[str, Any]]) -> bool:
+    """OVERVIEW is empty for ETFs and names the AssetType otherwise, so ETF_PROFILE is only worth a call when
+    OVERVIEW came back empty or says ETF."""
+    if overview is None:
+        return False
+    return not overview or AssetTypeMemo.normalize(overview.get("AssetType")) == "etf"
+
+
+def _fundamentals(symbol: str, overview: Optional[dict[str, Any]], etf: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """Merge the OVERVIEW and ETF_PROFILE responses (either may be missing) and remember the asset type."""
+    if etf:
+        remember_asset_type(symbol, "ETF")
+    if overview:
+        remember_asset_type(symbol, overview.get("AssetType"))
+        if not overview.get("Symbol"):
+            overview["Symbol"] = symbol
+        return _merge_etf_profile(overview, etf)
+    if etf:
+        return _merge_etf_profile({"Symbol": symbol, "AssetType": "ETF"}, etf)
+    return None
+
+
+def _news_params(symbol: str, limit: int) -> dict[str, str]:
+    time_to = datetime.utcnow()
+    time_from = time_to - timedelta(days=7)
+    return {
+        "function": "NEWS_SENTIMENT",
+        "tickers": symbol,
+        "limit": str(min(limit, 50)),
+        "time_from": time_from.strftime("%Y%m%dT%H%M00"),
+        "time_to": time_to.strftime("%Y%m%dT%H%M00"),
+    }
+
+
+def _parse_news(data: Optional[dict[str, Any]], symbol: str, limit: int) -> Optional[list[dict[str, Any]]]:
+    if not data:
+        logger.debug("Alpha Vantage get_news no response symbol=%s", symbol)
+        return None
+    if "feed" not in data:
+        if "Error Message" in data:
+            logger.debug("Alpha Vantage get_news error symbol=%s: %s", symbol, data.get("Error Message"))
+        elif "Note" in data:
+            logger.debug("Alpha Vantage get_news rate limit or note symbol=%s", symbol)
+        return None
+    feed = data["feed"][:limit]
+    out = [
+        {
+            "title": item.get("title"),
+            "url": item.get("url"),
+            "summary": item.get("summary"),
+            "time_published": item.get("time_published"),
+            "sentiment_score": item.get("overall_sentiment_score"),
+        }
+        for item in feed
+    ]
+    logger.info("Alpha Vantage get_news symbol=%s items=%s", symbol, len(out))
+    return out
+
+
 class AlphaVantageAdapter(DataSourceAdapter):
     def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
         """Resolve stock name to ticker using SYMBOL_SEARCH. Returns {symbol, name} or None."""
-        data = _request({"function": "SYMBOL_SEARCH", "keywords": name, "datatype": "json"})
-        if not data or "bestMatches" not in data:
-            return None
-        matches = data.get("bestMatches") or []
-        for m in matches:
-            symbol = m.get("1. symbol")
-            if symbol and isinstance(symbol, str) and symbol.strip():
-                return {
-                    "symbol": symbol.strip(),
-                    "name": (m.get("2. name") or symbol).strip() if isinstance(m.get("2. name"), str) else symbol.strip(),
-                }
-        return None
+        return _parse_symbol_search(_request(_symbol_search_params(name)))
 
     def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
-        data = _request({"function": "GLOBAL_QUOTE", "symbol": symbol})
-        if not data or "Global Quote" not in data:
-            return None
-        gq = data["Global Quote"]
-        return {
-            "symbol": gq.get("01. symbol"),
-            "price": gq.get("05. price"),
-            "volume": gq.get("06. volume"),
-            "change": gq.get("09. change"),
-            "change_percent": gq.get("10. change percent"),
-        }
+        return _parse_quote(_request({"function": "GLOBAL_QUOTE", "symbol": symbol}))
 
     def get_series(
         self,
         symbol: str,
         data_type: str,
+        since: Optional[str] = None,
     ) -> Optional[list[dict[str, Any]]]:
-        func_map = {
-            "daily": "TIME_SERIES_DAILY",
-            "weekly": "TIME_SERIES_WEEKLY",
-            "monthly": "TIME_SERIES_MONTHLY",
-        }
-        func = func_map.get(data_type)
-        if not func:
-            return None
-        outputsize = "full" if data_type == "daily" else "compact"
-        data = _request({"function": func, "symbol": symbol, "outputsize": outputsize})
-        if not data:
-            return None
-        key = next((k for k in data if "Time Series" in k), None)
-        if not key:
+        params = _series_params(symbol, data_type, since)
+        if not params:
             return None
-        series = data[key]
-        out = []
-        for date_str, v in series.items():
-            open_ = _to_float(v.get("1. open"))
-            high = _to_float(v.get("2. high"))
-            low = _to_float(v.get("3. low"))
-            close = _to_float(v.get("4. close"))
-            vol = _to_int(v.get("5. volume"))
-            out.append({
-                "time": date_str,
-                "open": open_,
-                "high": high,
-                "low": low,
-                "close": close,
-                "volume": vol,
-            })
-        out.sort(key=lambda x: x["time"])
-        return out
+        return _parse_series(_request(params), since)
 
     def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
-        data = _request({"function": "OVERVIEW", "symbol": symbol})
-        if not data:
+        """OVERVIEW, plus ETF_PROFILE only for ETFs; known ETFs skip OVERVIEW (one call either way when known)."""
+        known_etf = is_known_etf(symbol)
+        overview = None if known_etf else _request({"function": "OVERVIEW", "symbol": symbol})
+        if not known_etf and overview is None:
             return None
-        if not data.get("Symbol"):
-            data["Symbol"] = symbol
-        etf_data = _request({"function": "ETF_PROFILE", "symbol": symbol})
-        if etf_data and isinstance(etf_data, dict):
-            for k, v in etf_data.items():
-                if k not in data and v is not None and v != "":
-                    data[k] = v
-        return data
+        etf = None
+        if known_etf or _wants_etf_profile(overview):
+            etf = _request({"function": "ETF_PROFILE", "symbol": symbol})
+        return _fundamentals(symbol, overview, etf)
 
     def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
-        from datetime import datetime, timedelta
         if not _get_api_key():
             logger.debug("Alpha Vantage get_news skipped: no API key")
             return None
-        time_to = datetime.utcnow()
-        time_from = time_to - timedelta(days=7)
-        data = _request({
-            "function": "NEWS_SENTIMENT",
-            "tickers": symbol,
-            "limit": str(min(limit, 50)),
-            "time_from": time_from.strftime("%Y%m%dT%H%M00"),
-            "time_to": time_to.strftime("%Y%m%dT%H%M00"),
-        })
-        if not data:
-            logger.debug("Alpha Vantage get_news no response symbol=%s", symbol)
+        return _parse_news(_request(_news_params(symbol, limit)), symbol, limit)
+
+
+class AsyncAlphaVantageAdapter(AsyncDataSourceAdapter):
+    """AlphaVantageAdapter over the async HTTP client; shares the process-wide rate limiter."""
+
+    # symbol_resolution.source stays the same as for the sync adapter
+    source_name = "AlphaVantageAdapter"
+
+    async def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return _parse_symbol_search(await _request_async(_symbol_search_params(name)))
+
+    async def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return _parse_quote(await _request_async({"function": "GLOBAL_QUOTE", "symbol": symbol}))
+
+    async def get_series(
+        self,
+        symbol: str,
+        data_type: str,
+        since: Optional[str] = None,
+    ) -> Optional[list[dict[str, Any]]]:
+        params = _series_params(symbol, data_type, since)
+        if not params:
+            return None
+        return _parse_series(await _request_async(params), since)
+
+    async def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        known_etf = is_known_etf(symbol)
+        overview = None if known_etf else await _request_async({"function": "OVERVIEW", "symbol": symbol})
+        if not known_etf and overview is None:
             return None
-        if "feed" not in data:
-            if "Error Message" in data:
-                logger.debug("Alpha Vantage get_news error symbol=%s: %s", symbol, data.get("Error Message"))
-            elif "Note" in data:
-                logger.debug("Alpha Vantage get_news rate limit or note symbol=%s", symbol)
+        etf = None
+        if known_etf or _wants_etf_profile(overview):
+            etf = await _request_async({"function": "ETF_PROFILE", "symbol": symbol})
+        return _fundamentals(symbol, overview, etf)
+
+    async def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        if not _get_api_key():
+            logger.debug("Alpha Vantage get_news skipped: no API key")
             return None
-        feed = data["feed"][:limit]
-        out = [
-            {
-                "title": item.get("title"),
-                "url": item.get("url"),
-                "summary": item.get("summary"),
-                "time_published": item.get("time_published"),
-                "sentiment_score": item.get("overall_sentiment_score"),
-            }
-            for item in feed
-        ]
-        logger.info("Alpha Vantage get_news symbol=%s items=%s", symbol, len(out))
-        return out
+        return _parse_news(await _request_async(_news_params(symbol, limit)), symbol, limit)
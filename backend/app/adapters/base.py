@@ -3,12 +3,52 @@ from abc import ABC, abstractmethod
 from typing import Any, Optional
 
 
+class UpstreamUnavailable(ConnectionError):
+    """An upstream call failed for a transient reason (timeout, connection error, HTTP 429/5xx, provider rate-limit
+    note). Unlike a None answer it says nothing about whether the data exists, so it is never remembered as a miss."""
+
+
+class QuotaUnavailable(UpstreamUnavailable):
+    """The local rate limiter had no slot for the call, so nothing was sent upstream. Not a failure of the
+    adapter (circuit breakers ignore it), but not an answer either."""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for errors that say nothing about the data: HTTP 429/5xx, timeouts and connection errors (requests'
+    exceptions are OSErrors; httpx and curl_cffi ones are matched by module), provider rate limits."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    if isinstance(exc, (OSError, TimeoutError)):
+        return True
+    return type(exc).__module__.split(".")[0] in ("httpx", "curl_cffi") or "RateLimit" in type(exc).__name__
+
+
+def raise_if_transient(exc: BaseException) -> None:
+    """Re-raise exc as UpstreamUnavailable when it is transient; adapters return None for everything else."""
+    if isinstance(exc, UpstreamUnavailable):
+        raise exc
+    if is_transient_error(exc):
+        raise UpstreamUnavailable(f"{type(exc).__name__}: {exc}") from exc
+
+
+def format_change_percent(value: Any) -> Optional[str]:
+    """Quote change_percent in the shared shape: Alpha Vantage's "1.2345%" string (None stays None)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value if value.endswith("%") else f"{value}%"
+    return f"{float(value):.4f}%"
+
+
 class DataSourceAdapter(ABC):
     """Abstract interface for external financial data sources."""
 
     @abstractmethod
     def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
-        """Latest price and volume for symbol. Returns None if unsupported or error."""
+        """Latest price and volume for symbol: {symbol, price, volume, change, change_percent} with change_percent
+        as a "1.2345%" string (format_change_percent). Returns None if unsupported or not found; raises UpstreamUnavailable
+        when the upstream could not answer (see is_transient_error). The same holds for every method below."""
         pass
 
     @abstractmethod
@@ -16,10 +56,33 @@ class DataSourceAdapter(ABC):
         self,
         symbol: str,
         data_type: str,
+        since: Optional[str] = None,
     ) -> Optional[list[dict[str, Any]]]:
-        """OHLCV series. data_type: daily, weekly, monthly. Returns list of {time, open, high, low, close, volume}."""
+        """OHLCV series. data_type: daily, weekly, monthly. Returns list of {time, open, high, low, close, volume}.
+        since (YYYY-MM-DD): only bars on or after this date are needed, so adapters should request a smaller window."""
         pass
 
+    # True when get_series_many fetches symbols in grouped requests instead of one get_series call each
+    supports_batch_series = False
+
+    def get_series_many(
+        self,
+        symbols: list[str],
+        data_type: str,
+        since: Optional[str] = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """OHLCV series for several symbols: {symbol: bars} for the symbols that returned data.
+        Default calls get_series per symbol; adapters with a multi-ticker endpoint override it."""
+        out = {}
+        for symbol in symbols:
+            try:
+                bars = self.get_series(symbol, data_type, since=since)
+            except Exception:
+                bars = None
+            if bars:
+                out[symbol] = bars
+        return out
+
     @abstractmethod
     def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
         """Company overview, income, balance, cash flow, earnings. Returns dict or None."""
@@ -37,3 +100,35 @@ class DataSourceAdapter(ABC):
     def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
         """Resolve stock name to ticker and name. Returns {symbol, name} or None. Optional override."""
         return None
+
+
+class AsyncDataSourceAdapter(ABC):
+    """Async variant of DataSourceAdapter for the event-loop scan path (ScanService.scan_async).
+    Same methods, arguments and return shapes; implementations must not block the loop."""
+
+    @abstractmethod
+    async def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def get_series(
+        self,
+        symbol: str,
+        data_type: str,
+        since: Optional[str] = None,
+    ) -> Optional[list[dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    async def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        pass
+
+    async def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return None
+
+    async def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return None
@@ -0,0 +1,116 @@
+"""Adapter set for the configured DATA_SOURCE_MODE: live (default), record, replay or synthetic."""
+import logging
+from datetime import date
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Sequence
+
+from app.adapters.alpha_vantage import AlphaVantageAdapter, AsyncAlphaVantageAdapter
+from app.adapters.base import AsyncDataSourceAdapter, DataSourceAdapter
+from app.adapters.replay import (
+    AsyncRecordingAdapter,
+    AsyncReplayAdapter,
+    FaultInjector,
+    RecordingAdapter,
+    ReplayAdapter,
+    ReplayCorpus,
+)
+from app.adapters.synthetic import AsyncSyntheticAdapter, SyntheticAdapter, SyntheticMarket
+from app.adapters.yahoo import AsyncYahooFinanceAdapter, YahooFinanceAdapter
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DATA_SOURCE_MODES = ("live", "record", "replay", "synthetic")
+DEFAULT_CORPUS_PATH = Path(__file__).resolve().parent.parent.parent / ".corpus" / "market_data.jsonl.gz"
+# Live adapters in preference order; record and replay keep the same sources and order
+LIVE_ADAPTERS = (AlphaVantageAdapter, YahooFinanceAdapter)
+LIVE_ASYNC_ADAPTERS = (AsyncAlphaVantageAdapter, AsyncYahooFinanceAdapter)
+
+_corpus: ReplayCorpus | None = None
+_faults: FaultInjector | None = None
+_market: SyntheticMarket | None = None
+_lock = Lock()
+
+
+def data_source_mode() -> str:
+    mode = get_settings().data_source_mode
+    if mode not in DATA_SOURCE_MODES:
+        logger.warning("unknown DATA_SOURCE_MODE=%s, using live", mode)
+        return "live"
+    return mode
+
+
+def _parse_latency(value: str) -> Optional[float]:
+    """REPLAY_LATENCY_MS: a number, or "recorded" to replay each call's recorded latency."""
+    if value.strip().lower() == "recorded":
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logger.warning("invalid REPLAY_LATENCY_MS=%r, using 0", value)
+        return 0.0
+
+
+def get_corpus() -> ReplayCorpus:
+    global _corpus, _faults
+    with _lock:
+        if _corpus is None:
+            settings = get_settings()
+            _corpus = ReplayCorpus(Path(settings.data_corpus_path) if settings.data_corpus_path else DEFAULT_CORPUS_PATH)
+            _faults = FaultInjector(
+                latency_ms=_parse_latency(settings.replay_latency_ms),
+                jitter_ms=settings.replay_jitter_ms,
+                error_rate=settings.replay_error_rate,
+                seed=settings.replay_seed,
+            )
+        return _corpus
+
+
+def get_fault_injector() -> FaultInjector:
+    get_corpus()
+    return _faults
+
+
+def get_synthetic_market() -> SyntheticMarket:
+    global _market
+    with _lock:
+        if _market is None:
+            settings = get_settings()
+            end_date = None
+            if settings.synthetic_end_date:
+                try:
+                    end_date = date.fromisoformat(settings.synthetic_end_date)
+                except ValueError:
+                    logger.warning("invalid SYNTHETIC_END_DATE=%r, using today", settings.synthetic_end_date)
+            _market = SyntheticMarket(seed=settings.synthetic_seed, years=settings.synthetic_years, end_date=end_date)
+        return _market
+
+
+def create_adapters(sources: Optional[Sequence[str]] = None) -> list[DataSourceAdapter]:
+    """Adapters in preference order for the current mode; sources limits them by name (e.g. ["YahooFinanceAdapter"])."""
+    classes = [c for c in LIVE_ADAPTERS if sources is None or c.__name__ in sources]
+    mode = data_source_mode()
+    if mode == "synthetic":
+        # One adapter replaces all providers, whatever sources asked for
+        return [SyntheticAdapter(get_synthetic_market())]
+    if mode == "replay":
+        return [
+            ReplayAdapter(get_corpus(), c.__name__, get_fault_injector(), supports_batch_series=c.supports_batch_series)
+            for c in classes
+        ]
+    if mode == "record":
+        return [RecordingAdapter(c(), get_corpus()) for c in classes]
+    return [c() for c in classes]
+
+
+def create_async_adapters() -> list[AsyncDataSourceAdapter]:
+    mode = data_source_mode()
+    if mode == "synthetic":
+        return [AsyncSyntheticAdapter(get_synthetic_market())]
+    if mode == "replay":
+        # Same source names as the sync adapters, so health and the planner are shared
+        return [AsyncReplayAdapter(get_corpus(), c.__name__, get_fault_injector()) for c in LIVE_ADAPTERS]
+    if mode == "record":
+        return [AsyncRecordingAdapter(c(), get_corpus()) for c in LIVE_ASYNC_ADAPTERS]
+    return [c() for c in LIVE_ASYNC_ADAPTERS]
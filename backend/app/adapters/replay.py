@@ -0,0 +1,314 @@
+"""Record/replay adapters: capture real adapter responses to a gzip corpus and serve them back offline.
+
+DATA_SOURCE_MODE=record wraps the live adapters and appends every answer (misses included) to the corpus;
+DATA_SOURCE_MODE=replay serves the corpus with optional injected latency and errors, so scans, forecasts and
+the advice pipeline can be benchmarked repeatably without network.
+
+Corpus: gzip JSON lines, one {source, method, key, value, latency_ms} record per line. Each record is written as
+its own gzip member, so recording can be interrupted at any point; a truncated last member is skipped on load.
+Recording is meant for a single process.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+
+from app.adapters.base import AsyncDataSourceAdapter, DataSourceAdapter, UpstreamUnavailable
+
+logger = logging.getLogger(__name__)
+
+CorpusKey = tuple[str, str, tuple]  # (source, method, args)
+
+
+class InjectedFault(UpstreamUnavailable):
+    """Error raised by a replay adapter to simulate a failing upstream call."""
+
+
+def _source(adapter: Any) -> str:
+    return getattr(adapter, "source_name", None) or type(adapter).__name__
+
+
+def _merge_bars(old: Optional[list[dict]], new: Optional[list[dict]]) -> Optional[list[dict]]:
+    """Series are recorded once per (symbol, data_type); incremental fetches add to the bars already there."""
+    if not old or not new:
+        return new or old
+    by_time = {b["time"]: b for b in old}
+    by_time.update((b["time"], b) for b in new)
+    return [by_time[t] for t in sorted(by_time)]
+
+
+class ReplayCorpus:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = Lock()
+        self._entries: dict[CorpusKey, dict[str, Any]] = {}
+        self.loaded = 0
+        self.recorded = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._put(json.loads(line))
+                        self.loaded += 1
+        except (EOFError, OSError, ValueError) as e:
+            logger.warning("replay corpus %s: stopped at a damaged record after %s records (%s)", self.path, self.loaded, e)
+        logger.info("replay corpus loaded path=%s records=%s keys=%s", self.path, self.loaded, len(self._entries))
+
+    def _put(self, record: dict[str, Any]) -> None:
+        key = (record["source"], record["method"], tuple(record["key"]))
+        if record["method"] == "get_series":
+            prev = self._entries.get(key)
+            if prev is not None:
+                record = {**record, "value": _merge_bars(prev["value"], record["value"])}
+        self._entries[key] = record
+
+    def get(self, source: str, method: str, key: tuple) -> Optional[dict[str, Any]]:
+        """The record for this call, or None when it was never recorded (not the same as a recorded miss)."""
+        with self._lock:
+            rec = self._entries.get((source, method, key))
+            if rec is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return rec
+
+    def record(self, source: str, method: str, key: tuple, value: Any, latency_ms: float) -> None:
+        rec = {"source": source, "method": method, "key": list(key), "value": value, "latency_ms": round(latency_ms, 1)}
+        line = json.dumps(rec, default=str) + "\n"
+        with self._lock:
+            self._put(json.loads(line))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+            self.recorded += 1
+
+    def identifiers(self) -> dict[str, list[str]]:
+        """Recorded ISINs and symbols (for benchmarks)."""
+        with self._lock:
+            keys = list(self._entries)
+        isins = sorted({k[2][0] for k in keys if k[1] == "resolve_isin"})
+        symbols = sorted({k[2][0] for k in keys if k[1] in ("get_quote", "get_series", "get_fundamentals", "get_news")})
+        return {"isins": isins, "symbols": symbols}
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "keys": len(self._entries),
+                "loaded": self.loaded,
+                "recorded": self.recorded,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _call_key(method: str, args: tuple) -> tuple:
+    """Corpus key per method: series by (symbol, data_type) with `since` applied on replay; news by symbol with
+    `limit` applied on replay."""
+    if method == "get_series":
+        return args[:2]
+    return args[:1]
+
+
+def _shape(method: str, value: Any, args: tuple, kwargs: dict[str, Any]) -> Any:
+    if value is None:
+        return None
+    if method == "get_series":
+        since = kwargs.get("since") or (args[2] if len(args) > 2 else None)
+        return [b for b in value if not since or b["time"] >= since]
+    if method == "get_news":
+        limit = kwargs.get("limit") or (args[1] if len(args) > 1 else 10)
+        return value[:limit]
+    return value
+
+
+class FaultInjector:
+    """Seeded latency and error draws shared by the replay adapters of one corpus."""
+
+    def __init__(self, latency_ms: Optional[float], jitter_ms: float, error_rate: float, seed: int):
+        self.latency_ms = latency_ms  # None = replay recorded latencies
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+        self.injected_errors = 0
+
+    def draw(self, recorded_ms: float) -> tuple[float, bool]:
+        """(delay in seconds, whether to fail this call)."""
+        with self._lock:
+            base = recorded_ms if self.latency_ms is None else self.latency_ms
+            delay = max(0.0, self._rng.gauss(base, self.jitter_ms) if self.jitter_ms else base) / 1000
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+            return delay, fail
+
+
+class _ReplayLookup:
+    def __init__(self, corpus: ReplayCorpus, source: str, faults: FaultInjector):
+        self.corpus = corpus
+        self.source_name = source
+        self.faults = faults
+
+    def _lookup(self, method: str, args: tuple, kwargs: dict[str, Any]) -> tuple[float, bool, Any]:
+        rec = self.corpus.get(self.source_name, method, _call_key(method, args))
+        if rec is None:
+            delay, fail = self.faults.draw(0.0)
+            return delay, fail, None
+        delay, fail = self.faults.draw(rec.get("latency_ms") or 0.0)
+        return delay, fail, _shape(method, rec["value"], args, kwargs)
+
+
+class ReplayAdapter(_ReplayLookup, DataSourceAdapter):
+    """Serves one source's recorded answers (source_name matches the recorded adapter, so routing, the planner
+    and symbol_resolution.source behave as with the live adapter)."""
+
+    def __init__(self, corpus: ReplayCorpus, source: str, faults: FaultInjector, supports_batch_series: bool = False):
+        super().__init__(corpus, source, faults)
+        self.supports_batch_series = supports_batch_series
+
+    def _replay(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        delay, fail, value = self._lookup(method, args, kwargs)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise InjectedFault(f"injected {method} failure source={self.source_name}")
+        return value
+
+    def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self._replay("get_quote", symbol)
+
+    def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return self._replay("get_series", symbol, data_type, since=since)
+
+    def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self._replay("get_fundamentals", symbol)
+
+    def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return self._replay("get_news", symbol, limit=limit)
+
+    def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return self._replay("resolve_isin", isin)
+
+    def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return self._replay("resolve_by_name", name)
+
+
+class AsyncReplayAdapter(_ReplayLookup, AsyncDataSourceAdapter):
+    """ReplayAdapter for the async scan path: latency is awaited on the event loop."""
+
+    async def _replay(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        delay, fail, value = self._lookup(method, args, kwargs)
+        if delay:
+            await asyncio.sleep(delay)
+        if fail:
+            raise InjectedFault(f"injected {method} failure source={self.source_name}")
+        return value
+
+    async def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return await self._replay("get_quote", symbol)
+
+    async def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return await self._replay("get_series", symbol, data_type, since=since)
+
+    async def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return await self._replay("get_fundamentals", symbol)
+
+    async def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return await self._replay("get_news", symbol, limit=limit)
+
+    async def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return await self._replay("resolve_isin", isin)
+
+    async def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return await self._replay("resolve_by_name", name)
+
+
+class RecordingAdapter(DataSourceAdapter):
+    """Wraps a live adapter and records each answer under the wrapped adapter's source name. Exceptions are
+    passed through and not recorded."""
+
+    def __init__(self, inner: DataSourceAdapter, corpus: ReplayCorpus):
+        self.inner = inner
+        self.corpus = corpus
+        self.source_name = _source(inner)
+        self.supports_batch_series = inner.supports_batch_series
+
+    def _record(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        value = getattr(self.inner, method)(*args, **kwargs)
+        self.corpus.record(self.source_name, method, _call_key(method, args), value, 1000 * (time.perf_counter() - start))
+        return value
+
+    def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self._record("get_quote", symbol)
+
+    def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return self._record("get_series", symbol, data_type, since=since)
+
+    def get_series_many(self, symbols: list[str], data_type: str, since: Optional[str] = None) -> dict[str, list[dict[str, Any]]]:
+        start = time.perf_counter()
+        out = self.inner.get_series_many(symbols, data_type, since=since)
+        per_symbol_ms = 1000 * (time.perf_counter() - start) / max(1, len(symbols))
+        # Symbols the batch left out are recorded as misses (None), so they replay as answered rather than as
+        # never recorded; a miss does not drop bars recorded earlier (_merge_bars)
+        for symbol in symbols:
+            self.corpus.record(self.source_name, "get_series", (symbol, data_type), out.get(symbol), per_symbol_ms)
+        return out
+
+    def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self._record("get_fundamentals", symbol)
+
+    def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return self._record("get_news", symbol, limit=limit)
+
+    def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return self._record("resolve_isin", isin)
+
+    def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return self._record("resolve_by_name", name)
+
+
+class AsyncRecordingAdapter(AsyncDataSourceAdapter):
+    """RecordingAdapter for async adapters."""
+
+    def __init__(self, inner: AsyncDataSourceAdapter, corpus: ReplayCorpus):
+        self.inner = inner
+        self.corpus = corpus
+        self.source_name = _source(inner)
+
+    async def _record(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        value = await getattr(self.inner, method)(*args, **kwargs)
+        self.corpus.record(self.source_name, method, _call_key(method, args), value, 1000 * (time.perf_counter() - start))
+        return value
+
+    async def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return await self._record("get_quote", symbol)
+
+    async def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return await self._record("get_series", symbol, data_type, since=since)
+
+    async def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return await self._record("get_fundamentals", symbol)
+
+    async def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return await self._record("get_news", symbol, limit=limit)
+
+    async def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return await self._record("resolve_isin", isin)
+
+    async def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return await self._record("resolve_by_name", name)
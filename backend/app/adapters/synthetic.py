@@ -0,0 +1,309 @@
+"""Synthetic market data for scale testing: seeded geometric Brownian motion OHLCV, fundamentals and news.
+
+Every symbol gets its own random stream derived from (seed, symbol), so a symbol's data does not depend on which
+other symbols were generated or in what order. Prices follow one path from SYNTHETIC_EPOCH; the requested years of
+history are a window on it ending today (or SYNTHETIC_END_DATE), so later runs extend the same path and
+incremental refreshes line up with stored bars. Each column (returns, open gap, high, low, volume) draws from its
+own stream, so moving the end date only appends draws and never shifts the values of earlier bars.
+
+The universe is S00000, S00001, ... with ISINs in the unassigned ZZ country prefix (valid check digits), so
+synthetic data can never be mistaken for a real listing.
+"""
+import re
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional
+
+import numpy as np
+
+from app.adapters.base import AsyncDataSourceAdapter, DataSourceAdapter, format_change_percent
+from app.services.resample import RESAMPLED_DATA_TYPES, resample_ohlcv
+
+SYNTHETIC_EPOCH = date(1990, 1, 1)
+# The profile's start price is the close on this date, so recent prices stay in a realistic range
+PRICE_ANCHOR = date(2020, 1, 1)
+MIN_PRICE = 0.01
+TRADING_DAYS_PER_YEAR = 252
+SECTORS = (
+    "Technology", "Healthcare", "Financial Services", "Consumer Cyclical", "Industrials",
+    "Energy", "Utilities", "Real Estate", "Basic Materials", "Communication Services", "Consumer Defensive",
+)
+NEWS_TEMPLATES = (
+    "{name} reports quarterly results {direction} expectations",
+    "Analysts {verb} {name} price target after investor day",
+    "{name} announces share buyback program",
+    "{name} shares {move} as sector rotates",
+    "{name} expands into new markets",
+    "Regulators review {name} acquisition plans",
+)
+_SYMBOL_RE = re.compile(r"^S(\d{5})$")
+_NAME_RE = re.compile(r"^Synthetic Corp (\d{5})$")
+
+
+def _isin_check_digit(body: str) -> str:
+    """ISIN check digit (Luhn over the letters-as-numbers expansion of the first 11 characters)."""
+    digits = "".join(str(int(c, 36)) for c in body)
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        n = int(d) * (2 if i % 2 == 0 else 1)
+        total += n // 10 + n % 10
+    return str((10 - total % 10) % 10)
+
+
+def synthetic_symbol(index: int) -> str:
+    return f"S{index:05d}"
+
+
+def synthetic_isin(index: int) -> str:
+    body = f"ZZ{index:09d}"
+    return body + _isin_check_digit(body)
+
+
+def synthetic_name(index: int) -> str:
+    return f"Synthetic Corp {index:05d}"
+
+
+def synthetic_universe(count: int, start: int = 0) -> list[dict[str, str]]:
+    """[{isin, symbol, name}] for indexes start .. start + count - 1."""
+    return [
+        {"isin": synthetic_isin(i), "symbol": synthetic_symbol(i), "name": synthetic_name(i)}
+        for i in range(start, start + count)
+    ]
+
+
+def _isin_index(isin: str) -> Optional[int]:
+    if len(isin) != 12 or not isin.startswith("ZZ") or not isin[2:11].isdigit():
+        return None
+    if _isin_check_digit(isin[:11]) != isin[11]:
+        return None
+    return int(isin[2:11])
+
+
+class SyntheticMarket:
+    """Deterministic data per symbol for a seed. Any symbol works; universe symbols also resolve from their ISIN."""
+
+    def __init__(self, seed: int = 42, years: float = 2.0, end_date: Optional[date] = None):
+        self.seed = seed
+        self.years = years
+        self.end_date = end_date
+
+    def _rng(self, symbol: str, stream: str, salt: int = 0) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(f"{symbol}:{stream}".encode()), salt])
+
+    def _end(self) -> date:
+        return self.end_date or datetime.now(timezone.utc).date()
+
+    @staticmethod
+    def name(symbol: str) -> str:
+        m = _SYMBOL_RE.match(symbol)
+        return synthetic_name(int(m.group(1))) if m else f"Synthetic {symbol}"
+
+    def _profile(self, symbol: str) -> dict[str, float]:
+        """Per-symbol GBM and volume parameters: annual drift, annual volatility, start price, mean volume."""
+        rng = self._rng(symbol, "profile")
+        return {
+            "mu": float(rng.normal(0.07, 0.10)),
+            "sigma": float(rng.uniform(0.15, 0.55)),
+            "price": float(np.exp(rng.normal(np.log(40.0), 1.0))),
+            "volume": float(np.exp(rng.normal(np.log(800_000.0), 1.2))),
+        }
+
+    def _path(self, symbol: str) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Business days from SYNTHETIC_EPOCH to the end date and the OHLCV arrays on them. Draw i of every column
+        belongs to day i, whatever the end date."""
+        days = np.arange(np.datetime64(SYNTHETIC_EPOCH), np.datetime64(self._end()) + 1, dtype="datetime64[D]")
+        days = days[np.is_busday(days)]
+        n = len(days)
+        p = self._profile(symbol)
+        dt = 1.0 / TRADING_DAYS_PER_YEAR
+        step_sigma = p["sigma"] * np.sqrt(dt)
+        returns = (p["mu"] - 0.5 * p["sigma"] ** 2) * dt + step_sigma * self._rng(symbol, "path").standard_normal(n)
+        log_path = np.cumsum(returns)
+        log_path -= log_path[min(n - 1, int(np.searchsorted(days, np.datetime64(PRICE_ANCHOR))))]
+        close = np.maximum(p["price"] * np.exp(log_path), MIN_PRICE)
+        prev_close = np.concatenate(([close[0]], close[:-1]))
+        # Overnight gap carries a small part of the day's move; the intraday range widens with volatility
+        open_ = prev_close * np.exp(0.2 * step_sigma * self._rng(symbol, "open").standard_normal(n))
+        open_ = np.maximum(open_, MIN_PRICE)
+        high_gap = np.abs(self._rng(symbol, "high").normal(0.0, 0.5 * step_sigma, n))
+        low_gap = np.abs(self._rng(symbol, "low").normal(0.0, 0.5 * step_sigma, n))
+        high = np.maximum(open_, close) * np.exp(high_gap)
+        low = np.maximum(np.minimum(open_, close) * np.exp(-low_gap), MIN_PRICE)
+        # Volume is lognormal around the symbol's mean and rises on large moves
+        volume_noise = self._rng(symbol, "volume").normal(0.0, 0.35, n)
+        volume = p["volume"] * np.exp(volume_noise) * (1.0 + 0.5 * np.abs(returns) / step_sigma)
+        return days, {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+    def _bars(self, symbol: str, start: Optional[np.datetime64] = None, last: Optional[int] = None) -> list[dict[str, Any]]:
+        """Canonical bars from `start`, or the `last` n bars of the path."""
+        days, cols = self._path(symbol)
+        first = int(np.searchsorted(days, start)) if start is not None else max(0, len(days) - (last or len(days)))
+        rounded = {k: np.round(v[first:], 4) for k, v in cols.items() if k != "volume"}
+        volume = cols["volume"][first:].astype(np.int64)
+        times = days[first:].astype(str)
+        return [
+            {
+                "time": str(times[i]),
+                "open": float(rounded["open"][i]),
+                "high": float(rounded["high"][i]),
+                "low": float(rounded["low"][i]),
+                "close": float(rounded["close"][i]),
+                "volume": int(volume[i]),
+            }
+            for i in range(len(times))
+        ]
+
+    def daily(self, symbol: str, since: Optional[str] = None) -> list[dict[str, Any]]:
+        """Daily bars for the configured years of history (from `since` when given), oldest first."""
+        start = np.datetime64(self._end()) - int(round(self.years * 365.25))
+        if since:
+            start = max(start, np.datetime64(since[:10]))
+        return self._bars(symbol, start=start)
+
+    def series(self, symbol: str, data_type: str, since: Optional[str] = None) -> list[dict[str, Any]]:
+        if data_type in RESAMPLED_DATA_TYPES:
+            bars = resample_ohlcv(self.daily(symbol), data_type)
+            return [b for b in bars if not since or b["time"] >= since]
+        return self.daily(symbol, since=since)
+
+    def quote(self, symbol: str) -> dict[str, Any]:
+        prev, last = self._bars(symbol, last=2)
+        change = last["close"] - prev["close"]
+        return {
+            "symbol": symbol,
+            "price": last["close"],
+            "volume": last["volume"],
+            "change": round(change, 4),
+            "change_percent": format_change_percent(100.0 * change / prev["close"]),
+        }
+
+    def fundamentals(self, symbol: str) -> dict[str, Any]:
+        """Overview in the shape the Yahoo adapter returns, consistent with the price path."""
+        rng = self._rng(symbol, "fundamentals")
+        year = self._bars(symbol, last=TRADING_DAYS_PER_YEAR)
+        price = year[-1]["close"]
+        shares = int(np.exp(rng.normal(np.log(2e8), 1.0)))
+        margin = float(rng.uniform(-0.05, 0.35))
+        revenue = shares * price * float(rng.uniform(0.3, 4.0))
+        eps = round(revenue * margin / shares, 2)
+        return {
+            "Symbol": symbol,
+            "Name": self.name(symbol),
+            "AssetType": "Common Stock",
+            "MarketCapitalization": int(shares * price),
+            "PERatio": round(price / eps, 2) if eps > 0 else None,
+            "EPS": eps,
+            "52WeekHigh": max(b["high"] for b in year),
+            "52WeekLow": min(b["low"] for b in year),
+            "Beta": round(float(rng.normal(1.0, 0.3)), 2),
+            "DividendYield": round(float(rng.uniform(0.0, 0.05)), 4) if rng.random() < 0.6 else None,
+            "ProfitMargin": round(margin, 4),
+            "RevenueTTM": int(revenue),
+            "GrossProfitTTM": int(revenue * float(rng.uniform(0.2, 0.7))),
+            "ReturnOnEquityTTM": round(float(rng.normal(0.12, 0.1)), 4),
+            "Sector": SECTORS[int(rng.integers(len(SECTORS)))],
+            "Industry": "Synthetic",
+            "Country": "ZZ",
+            "SharesOutstanding": shares,
+            "AnalystTargetPrice": round(price * float(rng.normal(1.08, 0.15)), 2),
+            "QuarterlyRevenueGrowthYOY": round(float(rng.normal(0.05, 0.12)), 4),
+        }
+
+    def news(self, symbol: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Up to `limit` articles from the last 7 days (a new set each day), newest first, with sentiment scores."""
+        end = self._end()
+        rng = self._rng(symbol, "news", salt=end.toordinal())
+        name = self.name(symbol)
+        now = datetime(end.year, end.month, end.day, tzinfo=timezone.utc)
+        count = min(limit, int(rng.integers(3, 13)))
+        offsets = np.sort(rng.uniform(0, 7 * 24 * 3600, count))
+        out = []
+        for k in range(count):
+            score = float(np.clip(rng.normal(0.05, 0.25), -1.0, 1.0))
+            title = NEWS_TEMPLATES[int(rng.integers(len(NEWS_TEMPLATES)))].format(
+                name=name,
+                direction="above" if score > 0 else "below",
+                verb="raise" if score > 0 else "cut",
+                move="rise" if score > 0 else "fall",
+            )
+            published = now - timedelta(seconds=float(offsets[k]))
+            out.append({
+                "title": title,
+                "url": f"https://example.com/synthetic/{symbol}/{end.isoformat()}/{k}",
+                "summary": f"Synthetic article for load testing. {title}.",
+                "time_published": published.strftime("%Y%m%dT%H%M%S"),
+                "sentiment_score": round(score, 4),
+            })
+        return out
+
+    def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        index = _isin_index(isin.strip().upper())
+        if index is None:
+            return None
+        return {"symbol": synthetic_symbol(index), "name": synthetic_name(index)}
+
+    def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        m = _NAME_RE.match(name.strip())
+        if not m:
+            return None
+        index = int(m.group(1))
+        return {"symbol": synthetic_symbol(index), "name": synthetic_name(index)}
+
+
+class SyntheticAdapter(DataSourceAdapter):
+    """Adapter over SyntheticMarket; never calls the network."""
+
+    # Grouped series are as cheap as single ones, so bulk refreshes take the batch path
+    supports_batch_series = True
+
+    def __init__(self, market: SyntheticMarket):
+        self.market = market
+
+    def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self.market.quote(symbol)
+
+    def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return self.market.series(symbol, data_type, since=since) or None
+
+    def get_series_many(self, symbols: list[str], data_type: str, since: Optional[str] = None) -> dict[str, list[dict[str, Any]]]:
+        out = {s: self.market.series(s, data_type, since=since) for s in symbols}
+        return {s: bars for s, bars in out.items() if bars}
+
+    def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self.market.fundamentals(symbol)
+
+    def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return self.market.news(symbol, limit=limit)
+
+    def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return self.market.resolve_isin(isin)
+
+    def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return self.market.resolve_by_name(name)
+
+
+class AsyncSyntheticAdapter(AsyncDataSourceAdapter):
+    """Async SyntheticAdapter. Generation is a few milliseconds of NumPy per call, so it runs inline."""
+
+    source_name = "SyntheticAdapter"
+
+    def __init__(self, market: SyntheticMarket):
+        self._sync = SyntheticAdapter(market)
+
+    async def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self._sync.get_quote(symbol)
+
+    async def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return self._sync.get_series(symbol, data_type, since=since)
+
+    async def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return self._sync.get_fundamentals(symbol)
+
+    async def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return self._sync.get_news(symbol, limit=limit)
+
+    async def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return self._sync.resolve_isin(isin)
+
+    async def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return self._sync.resolve_by_name(name)
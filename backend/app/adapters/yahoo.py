@@ -1,46 +1,139 @@
 """Yahoo Finance adapter: yfinance + ISIN search. No API key; fallback for Alpha Vantage."""
+import asyncio
 import logging
 import os
+import time
+from threading import Lock
 from typing import Any, Optional
 
-import requests
-
 try:
     import yfinance as yf
 except ImportError:
     yf = None
 
-from app.adapters.base import DataSourceAdapter
+from app.adapters.base import AsyncDataSourceAdapter, DataSourceAdapter, format_change_percent, raise_if_transient
+from app.services.fetch_planner import remember_asset_type
+from app.services.http_client import get_async_http_client, get_http_client
 
 logger = logging.getLogger(__name__)
 
 YAHOO_SEARCH_URL = "https://query1.finance.yahoo.com/v1/finance/search"
+YAHOO_SEARCH_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; FinancialAssistant/1.0)"}
+
+
+def _parse_search(data: dict[str, Any]) -> Optional[dict[str, Any]]:
+    quotes = data.get("quotes") or []
+    for q in quotes:
+        sym = q.get("symbol")
+        if not sym or not isinstance(sym, str) or not sym.strip():
+            continue
+        longname = (q.get("longname") or "").strip() or None
+        shortname = (q.get("shortname") or "").strip() or None
+        return {"symbol": sym.strip(), "name": longname or shortname or sym.strip()}
+    return None
 
 
 def _yahoo_search(query: str, quotes_count: int = 10) -> Optional[dict[str, Any]]:
     """Search Yahoo Finance by query (ISIN or name). Returns {symbol, name} or None."""
     try:
-        r = requests.get(
+        r = get_http_client().get(
             YAHOO_SEARCH_URL,
             params={"q": query, "quotesCount": quotes_count},
-            headers={"User-Agent": "Mozilla/5.0 (compatible; FinancialAssistant/1.0)"},
-            timeout=10,
+            headers=YAHOO_SEARCH_HEADERS,
+            read_timeout=10,
         )
         r.raise_for_status()
-        data = r.json()
-        quotes = data.get("quotes") or []
-        for q in quotes:
-            sym = q.get("symbol")
-            if not sym or not isinstance(sym, str) or not sym.strip():
-                continue
-            longname = (q.get("longname") or "").strip() or None
-            shortname = (q.get("shortname") or "").strip() or None
-            return {"symbol": sym.strip(), "name": longname or shortname or sym.strip()}
+        return _parse_search(r.json())
+    except Exception as e:
+        raise_if_transient(e)
         return None
-    except Exception:
+
+
+async def _yahoo_search_async(query: str, quotes_count: int = 10) -> Optional[dict[str, Any]]:
+    try:
+        r = await get_async_http_client().get(
+            YAHOO_SEARCH_URL,
+            params={"q": query, "quotesCount": quotes_count},
+            headers=YAHOO_SEARCH_HEADERS,
+            read_timeout=10,
+        )
+        r.raise_for_status()
+        return _parse_search(r.json())
+    except Exception as e:
+        raise_if_transient(e)
         return None
 
 
+# yf.Ticker objects and their .info payload are reused for this long, so one scan (quote, fundamentals, news,
+# series — possibly on different worker threads) builds one Ticker and makes at most one quoteSummary call
+TICKER_MEMO_TTL_SECONDS = 30
+
+# yf.download groups for get_series_many, and how many chart requests run in parallel within a group
+YAHOO_BATCH_SIZE = 50
+YAHOO_DOWNLOAD_THREADS = 8
+
+
+class _TickerEntry:
+    __slots__ = ("ticker", "created", "info", "info_lock")
+
+    def __init__(self, ticker: Any):
+        self.ticker = ticker
+        self.created = time.monotonic()
+        self.info: Optional[dict[str, Any]] = None
+        self.info_lock = Lock()
+
+
+class _TickerMemo:
+    """Short-lived, thread-safe memo of yf.Ticker per symbol. .info is fetched once per entry under a
+    per-symbol lock: concurrent callers wait for the first fetch instead of repeating it."""
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl = ttl_seconds
+        self._lock = Lock()
+        self._entries: dict[str, _TickerEntry] = {}
+        self.info_fetches = 0
+        self.info_hits = 0
+
+    def _entry(self, symbol: str) -> _TickerEntry:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None or now - entry.created > self._ttl:
+                # Drop expired entries while holding the lock (the memo only ever holds symbols of recent scans)
+                for s in [s for s, e in self._entries.items() if now - e.created > self._ttl]:
+                    del self._entries[s]
+                entry = _TickerEntry(yf.Ticker(symbol))
+                self._entries[symbol] = entry
+            return entry
+
+    def ticker(self, symbol: str) -> Any:
+        return self._entry(symbol).ticker
+
+    def info(self, symbol: str) -> dict[str, Any]:
+        entry = self._entry(symbol)
+        with entry.info_lock:
+            if entry.info is None:
+                entry.info = entry.ticker.info or {}
+                with self._lock:
+                    self.info_fetches += 1
+                logger.debug("Yahoo info fetched symbol=%s", symbol)
+            else:
+                with self._lock:
+                    self.info_hits += 1
+            return entry.info
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "info_fetches": self.info_fetches, "info_hits": self.info_hits}
+
+
+_ticker_memo = _TickerMemo(TICKER_MEMO_TTL_SECONDS)
+
+
+def ticker_memo_stats() -> dict[str, Any]:
+    return _ticker_memo.stats()
+
+
 def _isin_search(isin: str) -> Optional[dict[str, Any]]:
     return _yahoo_search(isin, quotes_count=5)
 
@@ -50,6 +143,54 @@ def _search_by_name(name: str) -> Optional[dict[str, Any]]:
     return _yahoo_search(name, quotes_count=10)
 
 
+def _frame_to_bars(df: Any) -> list[dict[str, Any]]:
+    """yfinance OHLCV frame -> canonical bars sorted by time."""
+    out = []
+    for ts, row in df.iterrows():
+        volume = row["Volume"] if "Volume" in row else None
+        out.append({
+            "time": ts.strftime("%Y-%m-%d"),
+            "open": float(row["Open"]) if "Open" in row else None,
+            "high": float(row["High"]) if "High" in row else None,
+            "low": float(row["Low"]) if "Low" in row else None,
+            "close": float(row["Close"]) if "Close" in row else None,
+            "volume": int(volume) if volume is not None and volume == volume else None,
+        })
+    out.sort(key=lambda x: x["time"])
+    return out
+
+
+def _symbol_frame(df: Any, symbol: str) -> Any:
+    """One symbol's columns from a yf.download frame (ticker is the first column level with group_by="ticker")."""
+    if getattr(df.columns, "nlevels", 1) > 1:
+        if symbol not in df.columns.get_level_values(0):
+            return None
+        sub = df[symbol]
+    else:
+        sub = df
+    return sub if "Close" in sub.columns else None
+
+
+def _history_quote(symbol: str, ticker: Any) -> Optional[dict[str, Any]]:
+    """Quote from the last daily bars (one chart request, history(period="5d")) instead of the quoteSummary .info
+    payload. fast_info is not cheaper: its last_price, previous close and volume each load a year of daily
+    history, and the previous close can fall back to .info. During the session the last bar is today's, so its
+    close is the latest price. None when there are no bars."""
+    bars = _frame_to_bars(ticker.history(period="5d", interval="1d"))
+    if not bars or bars[-1]["close"] is None:
+        return None
+    last = bars[-1]
+    prev = bars[-2]["close"] if len(bars) > 1 else None
+    change = last["close"] - prev if prev else None
+    return {
+        "symbol": symbol,
+        "price": last["close"],
+        "volume": last["volume"],
+        "change": change,
+        "change_percent": format_change_percent(100.0 * change / prev) if change is not None else None,
+    }
+
+
 class YahooFinanceAdapter(DataSourceAdapter):
     def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
         return _isin_search(isin)
@@ -61,22 +202,29 @@ class YahooFinanceAdapter(DataSourceAdapter):
         if not yf:
             return None
         try:
-            t = yf.Ticker(symbol)
-            info = t.info
+            quote = _history_quote(symbol, _ticker_memo.ticker(symbol))
+            if quote:
+                return quote
+        except Exception as e:
+            logger.debug("Yahoo history quote failed symbol=%s: %s", symbol, e)
+        try:
+            info = _ticker_memo.info(symbol)
             return {
                 "symbol": symbol,
                 "price": info.get("currentPrice") or info.get("regularMarketPrice"),
                 "volume": info.get("volume") or info.get("regularMarketVolume"),
                 "change": info.get("regularMarketChange"),
-                "change_percent": info.get("regularMarketChangePercent"),
+                "change_percent": format_change_percent(info.get("regularMarketChangePercent")),
             }
-        except Exception:
+        except Exception as e:
+            raise_if_transient(e)
             return None
 
     def get_series(
         self,
         symbol: str,
         data_type: str,
+        since: Optional[str] = None,
     ) -> Optional[list[dict[str, Any]]]:
         if not yf:
             return None
@@ -84,33 +232,69 @@ class YahooFinanceAdapter(DataSourceAdapter):
         period_map = {"daily": "2y", "weekly": "1y", "monthly": "2y"}
         period = period_map.get(data_type, "2y")
         try:
-            t = yf.Ticker(symbol)
-            df = t.history(period=period, interval="1d" if data_type == "daily" else "1wk")
+            t = _ticker_memo.ticker(symbol)
+            interval = {"daily": "1d", "weekly": "1wk", "monthly": "1mo"}.get(data_type, "1d")
+            # Incremental refresh: only download bars from `since` instead of the full period
+            df = t.history(start=since, interval=interval) if since else t.history(period=period, interval=interval)
             if df is None or df.empty:
                 return None
-            out = []
-            for ts, row in df.iterrows():
-                out.append({
-                    "time": ts.strftime("%Y-%m-%d"),
-                    "open": float(row["Open"]) if "Open" in row else None,
-                    "high": float(row["High"]) if "High" in row else None,
-                    "low": float(row["Low"]) if "Low" in row else None,
-                    "close": float(row["Close"]) if "Close" in row else None,
-                    "volume": int(row["Volume"]) if "Volume" in row else None,
-                })
-            out.sort(key=lambda x: x["time"])
-            return out
-        except Exception:
+            return _frame_to_bars(df)
+        except Exception as e:
+            raise_if_transient(e)
             return None
 
+    supports_batch_series = True
+
+    def get_series_many(
+        self,
+        symbols: list[str],
+        data_type: str,
+        since: Optional[str] = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Series for many symbols via yf.download in groups of YAHOO_BATCH_SIZE; the combined frame is split per
+        symbol (rows where that symbol has no close are dropped). Symbols without data are left out."""
+        if not yf or not symbols:
+            return {}
+        interval = {"daily": "1d", "weekly": "1wk", "monthly": "1mo"}.get(data_type, "1d")
+        # Same windows as get_series: bars from `since`, else the full period
+        window = {"start": since} if since else {"period": {"daily": "2y", "weekly": "1y", "monthly": "2y"}.get(data_type, "2y")}
+        out: dict[str, list[dict[str, Any]]] = {}
+        for i in range(0, len(symbols), YAHOO_BATCH_SIZE):
+            group = symbols[i:i + YAHOO_BATCH_SIZE]
+            try:
+                df = yf.download(
+                    tickers=group,
+                    interval=interval,
+                    group_by="ticker",
+                    auto_adjust=True,  # same prices as Ticker.history
+                    actions=False,
+                    progress=False,
+                    threads=min(len(group), YAHOO_DOWNLOAD_THREADS),
+                    **window,
+                )
+            except Exception as e:
+                logger.warning("Yahoo batch download failed symbols=%s: %s", len(group), e)
+                continue
+            if df is None or df.empty:
+                continue
+            for symbol in group:
+                sub = _symbol_frame(df, symbol)
+                if sub is None:
+                    continue
+                bars = _frame_to_bars(sub.dropna(subset=["Close"]))
+                if bars:
+                    out[symbol] = bars
+            logger.info("Yahoo batch download data_type=%s symbols=%s with_data=%s", data_type, len(group), len(out))
+        return out
+
     def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
         if not yf:
             return None
         try:
-            t = yf.Ticker(symbol)
-            info = t.info
+            info = _ticker_memo.info(symbol)
             if not info or info.get("symbol") != symbol:
                 return None
+            remember_asset_type(symbol, info.get("quoteType"))
             return {
                 "Symbol": symbol,
                 "Name": info.get("longName"),
@@ -143,7 +327,8 @@ class YahooFinanceAdapter(DataSourceAdapter):
                 "QuarterlyEarningsGrowthYOY": info.get("earningsQuarterlyGrowth"),
                 "QuarterlyRevenueGrowthYOY": info.get("revenueGrowth"),
             }
-        except Exception:
+        except Exception as e:
+            raise_if_transient(e)
             return None
 
     def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
@@ -151,7 +336,7 @@ class YahooFinanceAdapter(DataSourceAdapter):
             return None
         raw: list[dict[str, Any]] = []
         try:
-            t = yf.Ticker(symbol)
+            t = _ticker_memo.ticker(symbol)
             # Prefer get_news(); fallback to .news (structure may differ by yfinance version)
             if hasattr(t, "get_news"):
                 raw = t.get_news(count=limit) or []
@@ -166,6 +351,7 @@ class YahooFinanceAdapter(DataSourceAdapter):
                     logger.debug("Yahoo Search news fallback failed symbol=%s: %s", symbol, e)
         except Exception as e:
             logger.warning("Yahoo get_news failed symbol=%s: %s", symbol, e)
+            raise_if_transient(e)
             return None
         def _str_url(v: Any) -> Optional[str]:
             if v is None:
@@ -216,3 +402,37 @@ class YahooFinanceAdapter(DataSourceAdapter):
             return None
         logger.info("Yahoo get_news symbol=%s items=%s", symbol, len(out))
         return out
+
+
+class AsyncYahooFinanceAdapter(AsyncDataSourceAdapter):
+    """Yahoo search (ISIN / name) over the async HTTP client. yfinance has no async API, so quote, series,
+    fundamentals and news run the sync adapter in a worker thread."""
+
+    # symbol_resolution.source stays the same as for the sync adapter
+    source_name = "YahooFinanceAdapter"
+
+    def __init__(self):
+        self._sync = YahooFinanceAdapter()
+
+    async def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        return await _yahoo_search_async(isin, quotes_count=5)
+
+    async def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        return await _yahoo_search_async(name, quotes_count=10)
+
+    async def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return await asyncio.to_thread(self._sync.get_quote, symbol)
+
+    async def get_series(
+        self,
+        symbol: str,
+        data_type: str,
+        since: Optional[str] = None,
+    ) -> Optional[list[dict[str, Any]]]:
+        return await asyncio.to_thread(self._sync.get_series, symbol, data_type, since)
+
+    async def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return await asyncio.to_thread(self._sync.get_fundamentals, symbol)
+
+    async def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return await asyncio.to_thread(self._sync.get_news, symbol, limit)
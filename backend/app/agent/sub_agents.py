@@ -1,5 +1,6 @@
 """Sub-agents: per-step and math/analysis. Summarize context into short advice snippets."""
 import logging
+import time
 from typing import Any, Generator, List, Optional
 
 from langchain_core.messages import BaseMessage, HumanMessage
@@ -11,11 +12,18 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 
 GROQ_MODEL = "qwen/qwen3-32b"
+# Below this many seconds left, the fallback model is not tried
+MIN_LLM_ATTEMPT_SECONDS = 1.0
 _llm_key_warned = False
 
 
-def _invoke_llm(messages: List[BaseMessage]) -> Optional[str]:
-    """Try primary GROQ; on exception try fallback key/model. Return content or None."""
+def _llm(model: str, api_key: str, timeout: float) -> ChatGroq:
+    return ChatGroq(model=model, api_key=api_key, temperature=0.3, timeout=timeout)
+
+
+def _invoke_llm(messages: List[BaseMessage], timeout: Optional[float] = None) -> Optional[str]:
+    """Try primary GROQ; on exception try fallback key/model. Return content or None.
+    timeout: seconds for both attempts together (default LLM_TIMEOUT_SECONDS)."""
     settings = get_settings()
     primary_key = settings.groq_api_key
     fallback_key = settings.groq_api_key_fallback
@@ -26,18 +34,19 @@ def _invoke_llm(messages: List[BaseMessage]) -> Optional[str]:
             _llm_key_warned = True
             logger.warning("No GROQ API key set; LLM calls will return fallback")
         return None
+    end = time.monotonic() + (timeout or settings.llm_timeout_seconds)
     # Primary
     if primary_key:
         try:
-            llm = ChatGroq(model=GROQ_MODEL, api_key=primary_key, temperature=0.3)
+            llm = _llm(GROQ_MODEL, primary_key, end - time.monotonic())
             out = llm.invoke(messages)
             return out.content if hasattr(out, "content") else str(out)
         except Exception as e:
             logger.debug("Primary LLM invoke failed: %s", e)
     # Fallback
-    if fallback_key:
+    if fallback_key and end - time.monotonic() >= MIN_LLM_ATTEMPT_SECONDS:
         try:
-            llm = ChatGroq(model=fallback_model, api_key=fallback_key, temperature=0.3)
+            llm = _llm(fallback_model, fallback_key, end - time.monotonic())
             out = llm.invoke(messages)
             return out.content if hasattr(out, "content") else str(out)
         except Exception as e:
@@ -45,8 +54,9 @@ def _invoke_llm(messages: List[BaseMessage]) -> Optional[str]:
     return None
 
 
-def _stream_llm(messages: List[BaseMessage]) -> Generator[str, None, None]:
-    """Stream LLM response token-by-token. Yields content chunks. Empty if no key or all fail."""
+def _stream_llm(messages: List[BaseMessage], timeout: Optional[float] = None) -> Generator[str, None, None]:
+    """Stream LLM response token-by-token. Yields content chunks. Empty if no key or all fail.
+    timeout: seconds without a response (per read) before an attempt fails (default LLM_TIMEOUT_SECONDS)."""
     settings = get_settings()
     primary_key = settings.groq_api_key
     fallback_key = settings.groq_api_key_fallback
@@ -57,11 +67,15 @@ def _stream_llm(messages: List[BaseMessage]) -> Generator[str, None, None]:
             _llm_key_warned = True
             logger.warning("No GROQ API key set; LLM stream will yield nothing")
         return
+    end = time.monotonic() + (timeout or settings.llm_timeout_seconds)
     for api_key, model in [(primary_key, GROQ_MODEL), (fallback_key, fallback_model)]:
         if not api_key:
             continue
+        if end - time.monotonic() < MIN_LLM_ATTEMPT_SECONDS:
+            logger.debug("LLM stream skipped %s: no time left", model)
+            return
         try:
-            llm = ChatGroq(model=model, api_key=api_key, temperature=0.3)
+            llm = _llm(model, api_key, end - time.monotonic())
             for chunk in llm.stream(messages):
                 if hasattr(chunk, "content") and chunk.content:
                     yield chunk.content
@@ -71,7 +85,7 @@ def _stream_llm(messages: List[BaseMessage]) -> Generator[str, None, None]:
     return
 
 
-def run_price_sub_agent(context: dict[str, Any]) -> Optional[str]:
+def run_price_sub_agent(context: dict[str, Any], timeout: Optional[float] = None) -> Optional[str]:
     """Summarize price/quote context: how stock behaves, what numbers suggest."""
     if get_settings().dev_mode:
         return "Mock summary for price (Dev mode)."
@@ -80,11 +94,11 @@ def run_price_sub_agent(context: dict[str, Any]) -> Optional[str]:
 Data:
 {context}
 """
-    result = _invoke_llm([HumanMessage(content=prompt)])
+    result = _invoke_llm([HumanMessage(content=prompt)], timeout=timeout)
     return result if result is not None else LLM_FALLBACK_MESSAGE
 
 
-def run_fundamentals_sub_agent(context: dict[str, Any]) -> Optional[str]:
+def run_fundamentals_sub_agent(context: dict[str, Any], timeout: Optional[float] = None) -> Optional[str]:
     """Summarize fundamentals: ratios, health, what analysis suggests."""
     if get_settings().dev_mode:
         return "Mock summary for fundamentals (Dev mode)."
@@ -93,11 +107,11 @@ def run_fundamentals_sub_agent(context: dict[str, Any]) -> Optional[str]:
 Data:
 {context}
 """
-    result = _invoke_llm([HumanMessage(content=prompt)])
+    result = _invoke_llm([HumanMessage(content=prompt)], timeout=timeout)
     return result if result is not None else LLM_FALLBACK_MESSAGE
 
 
-def run_news_sub_agent(context: list[dict[str, Any]]) -> Optional[str]:
+def run_news_sub_agent(context: list[dict[str, Any]], timeout: Optional[float] = None) -> Optional[str]:
     """Summarize news/sentiment: sentiment, key themes."""
     if get_settings().dev_mode:
         return "Mock summary for news (Dev mode)."
@@ -106,11 +120,11 @@ def run_news_sub_agent(context: list[dict[str, Any]]) -> Optional[str]:
 Data:
 {context}
 """
-    result = _invoke_llm([HumanMessage(content=prompt)])
+    result = _invoke_llm([HumanMessage(content=prompt)], timeout=timeout)
     return result if result is not None else LLM_FALLBACK_MESSAGE
 
 
-def run_math_sub_agent(context: dict[str, Any]) -> Optional[str]:
+def run_math_sub_agent(context: dict[str, Any], timeout: Optional[float] = None) -> Optional[str]:
     """Summarize mathematical/analytical context only: series summary, metrics, stats, and near-term forecast."""
     if get_settings().dev_mode:
         return "Mock summary for math/analysis (Dev mode)."
@@ -118,12 +132,18 @@ def run_math_sub_agent(context: dict[str, Any]) -> Optional[str]:
     forecast_note = ""
     if forecast.get("forecast") and forecast.get("stats"):
         forecast_note = f"\nNear-term prognosis (next 3 trading days, linear trend): {forecast.get('forecast')}. Stats: {forecast.get('stats')}."
+    rolling = context.get("rolling") or {}
+    windows = [w for w in rolling if w.isdigit()]
+    if windows:
+        forecast_note += "\nRolling-window trend (slope per trading day, std of closes): " + ", ".join(
+            f"{w}d slope={rolling[w]['slope']} std={rolling[w]['std']}" for w in windows
+        ) + "."
     prompt = f"""You are a financial analysis sub-agent. Summarize the following mathematical/analytical data (prices, series, metrics) in 2-4 short sentences. Focus on: trend, volatility, key numbers; what the math suggests.{forecast_note} No advice yet—pure analysis.
 
 Data:
 {context}
 """
-    result = _invoke_llm([HumanMessage(content=prompt)])
+    result = _invoke_llm([HumanMessage(content=prompt)], timeout=timeout)
     return result if result is not None else LLM_FALLBACK_MESSAGE
 
 
@@ -181,9 +201,9 @@ Sub-analyses:
 
 
 def run_main_agent_stream(
-    summaries: dict[str, Optional[str]], symbol: str
+    summaries: dict[str, Optional[str]], symbol: str, timeout: Optional[float] = None
 ) -> Generator[str, None, None]:
-    """Stream main agent response token-by-token. Yields content chunks."""
+    """Stream main agent response token-by-token. Yields content chunks. timeout as in _stream_llm."""
     if get_settings().dev_mode:
         for c in "Mock financial advice for Dev mode. No real LLM calls.":
             yield c
@@ -195,7 +215,7 @@ Sub-analyses:
 {combined}
 """
     yielded_any = False
-    for chunk in _stream_llm([HumanMessage(content=prompt)]):
+    for chunk in _stream_llm([HumanMessage(content=prompt)], timeout=timeout):
         yielded_any = True
         yield chunk
     if not yielded_any:
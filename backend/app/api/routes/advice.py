@@ -1,8 +1,12 @@
 """Advice pipeline: POST /api/stocks/{isin}/advice with SSE (progress + main advice stream)."""
 import json
 import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Optional
+from threading import Lock
+from typing import Any, Callable, Optional
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import StreamingResponse
@@ -15,9 +19,12 @@ from app.agent.sub_agents import (
     run_news_sub_agent,
     run_price_sub_agent,
 )
+from app.config import get_settings
 from app.db.session import get_db
 from app.models.base import Message, Session as ChatSession
+from app.services.deadline import Deadline
 from app.services.forecast_service import compute_forecast
+from app.services.rolling_stats import rolling_stats
 from app.services.scan_service import ScanService
 
 logger = logging.getLogger(__name__)
@@ -25,13 +32,59 @@ router = APIRouter()
 
 TOTAL_STEPS = 10  # resolve, scan steps, price_agent, fundamentals_agent, news_agent, math_agent, main
 
+# Shares of the advice deadline (ADVICE_DEADLINE_SECONDS): each stage gets its weight over the weights of the
+# stages still to run, applied to the time left when it starts
+STAGE_WEIGHTS = {"scan": 6.0, "price": 2.0, "fundamentals": 2.0, "news": 2.0, "math": 2.0, "main": 6.0}
+# A sub-agent with less time than this is skipped instead of started
+MIN_STAGE_SECONDS = 0.5
+# Main synthesis always gets this long, so an overrun earlier still ends in advice from the partial summaries
+MIN_SYNTHESIS_SECONDS = 3.0
+# Appended to advice cut short at the deadline, in the stream and in the stored message, so the reader and later
+# chat turns (which build on the stored advice) know it is incomplete
+TRUNCATION_NOTE = "\n\n_[Advice cut short at the request deadline; it is incomplete. Ask to continue or rerun.]_"
+
+# Sub-agent LLM calls run here so the stream can stop waiting at the stage budget; one stage runs at a time per
+# stream, so SCAN_CONCURRENCY workers serve as many streams as the scan pool
+_stage_executor: Optional[ThreadPoolExecutor] = None
+_stage_executor_lock = Lock()
+
+
+def _get_stage_executor() -> ThreadPoolExecutor:
+    global _stage_executor
+    with _stage_executor_lock:
+        if _stage_executor is None:
+            _stage_executor = ThreadPoolExecutor(max_workers=get_settings().scan_concurrency, thread_name_prefix="advice-stage")
+        return _stage_executor
+
 
 def _sse_event(event: str, data: dict) -> str:
     return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
-def _advice_stream(isin: str, db: Session):
+def _timeout(budget: float) -> Optional[float]:
+    """Stage budget as a call timeout (None without a deadline)."""
+    return None if math.isinf(budget) else budget
+
+
+def _run_stage(fn: Callable[..., Any], budget: float, *args: Any) -> Any:
+    """fn(*args, timeout=budget) within budget seconds. Raises TimeoutError when it overruns; the call then
+    finishes in the background (its LLM timeout is the same budget) and its result is dropped."""
+    if math.isinf(budget):
+        return fn(*args, timeout=None)
+    future = _get_stage_executor().submit(fn, *args, timeout=budget)
+    try:
+        return future.result(timeout=budget)
+    except TimeoutError:
+        raise TimeoutError(f"stage over budget ({budget:.1f}s)") from None
+
+
+async def _scan(isin: str, db: Session) -> tuple[dict[str, Any], list[dict], Deadline]:
+    """Start the advice deadline and scan on the event loop within its scan share.
+
+    Returns the scan context, its progress events and the deadline, the arguments _advice_stream takes after db.
+    """
     logger.info("advice request start isin=%s", isin)
+    deadline = Deadline(get_settings().advice_deadline_seconds, STAGE_WEIGHTS)
     progress_list = []
 
     def on_progress(step_name: str, current: int, total: int, error: Optional[str]):
@@ -44,11 +97,24 @@ def _advice_stream(isin: str, db: Session):
             "message": error,
         })
 
-    scan = ScanService(db)
-    ctx = scan.scan(identifier=isin, on_progress=on_progress)
+    ctx = await ScanService(db).scan_async(isin, on_progress=on_progress, timeout=_timeout(deadline.budget("scan")))
+    return ctx, progress_list, deadline
+
+
+def _advice_stream(isin: str, db: Session, ctx: dict[str, Any], progress_list: list[dict], deadline: Deadline):
+    skipped: list[str] = []
+    deadline.finish("scan", "partial" if ctx.get("timed_out") else "ok")
     logger.info("advice scan complete isin=%s symbol=%s", isin, ctx.get("symbol"))
     for p in progress_list:
         yield _sse_event("progress", p)
+    if ctx.get("timed_out"):
+        skipped.append("Scan")
+        yield _sse_event("stage_skipped", {
+            "step": "Scan",
+            "reason": "deadline",
+            "dataTypes": ctx["timed_out"],
+            "message": f"Not fetched in time: {', '.join(ctx['timed_out'])}",
+        })
 
     symbol = ctx.get("symbol")
     if not symbol:
@@ -60,57 +126,60 @@ def _advice_stream(isin: str, db: Session):
     step = len(progress_list)
     summaries = {}
 
-    if ctx.get("quote"):
-        yield _sse_event("progress", {"step": "Price sub-agent", "stepIndex": step, "totalSteps": TOTAL_STEPS, "percent": int(100 * step / TOTAL_STEPS), "status": "ok", "message": None})
+    def run_sub_agent(stage: str, label: str, step_name: str, fn: Callable[..., Any], arg: Any):
+        """Run one sub-agent within its share of the deadline; yields SSE events and fills summaries[label]."""
+        budget = deadline.budget(stage)
+        if budget < MIN_STAGE_SECONDS:
+            logger.warning("advice %s skipped: %.2fs left isin=%s", stage, deadline.remaining(), isin)
+            deadline.finish(stage, "skipped")
+            summaries[label] = None
+            skipped.append(step_name)
+            yield _sse_event("stage_skipped", {"step": step_name, "reason": "deadline", "message": "Skipped (no time left)"})
+            return
         try:
-            s = run_price_sub_agent(ctx["quote"])
-            summaries["Price"] = s
+            summaries[label] = _run_stage(fn, budget, arg)
+            deadline.finish(stage)
+        except TimeoutError:
+            logger.warning("advice %s over budget %.1fs isin=%s", stage, budget, isin)
+            deadline.finish(stage, "timeout")
+            summaries[label] = None
+            skipped.append(step_name)
+            yield _sse_event("stage_skipped", {"step": step_name, "reason": "deadline", "message": f"Cut off after {budget:.1f}s"})
         except Exception:
-            logger.exception("Price sub-agent failed isin=%s", isin)
-            summaries["Price"] = None
-            yield _sse_event("step_failed", {"step": "Price sub-agent", "message": "Summary failed"})
-        step += 1
+            logger.exception("%s failed isin=%s", step_name, isin)
+            deadline.finish(stage, "error")
+            summaries[label] = None
+            yield _sse_event("step_failed", {"step": step_name, "message": "Summary failed"})
 
-    if ctx.get("fundamentals"):
-        yield _sse_event("progress", {"step": "Fundamentals sub-agent", "stepIndex": step, "totalSteps": TOTAL_STEPS, "percent": int(100 * step / TOTAL_STEPS), "status": "ok", "message": None})
-        try:
-            s = run_fundamentals_sub_agent(ctx["fundamentals"])
-            summaries["Fundamentals"] = s
-        except Exception:
-            logger.exception("Fundamentals sub-agent failed isin=%s", isin)
-            summaries["Fundamentals"] = None
-            yield _sse_event("step_failed", {"step": "Fundamentals sub-agent", "message": "Summary failed"})
-        step += 1
-
-    if ctx.get("news"):
-        yield _sse_event("progress", {"step": "News sub-agent", "stepIndex": step, "totalSteps": TOTAL_STEPS, "percent": int(100 * step / TOTAL_STEPS), "status": "ok", "message": None})
-        try:
-            s = run_news_sub_agent(ctx["news"])
-            summaries["News"] = s
-        except Exception:
-            logger.exception("News sub-agent failed isin=%s", isin)
-            summaries["News"] = None
-            yield _sse_event("step_failed", {"step": "News sub-agent", "message": "Summary failed"})
+    sub_agents = []
+    for stage, label, ctx_key, step_name, fn in (
+        ("price", "Price", "quote", "Price sub-agent", run_price_sub_agent),
+        ("fundamentals", "Fundamentals", "fundamentals", "Fundamentals sub-agent", run_fundamentals_sub_agent),
+        ("news", "News", "news", "News sub-agent", run_news_sub_agent),
+    ):
+        if ctx.get(ctx_key):
+            sub_agents.append((stage, label, ctx_key, step_name, fn))
+        else:
+            # No data: the stage does not run and its share goes to the others
+            deadline.skip(stage)
+    for stage, label, ctx_key, step_name, fn in sub_agents:
+        yield _sse_event("progress", {"step": step_name, "stepIndex": step, "totalSteps": TOTAL_STEPS, "percent": int(100 * step / TOTAL_STEPS), "status": "ok", "message": None})
+        yield from run_sub_agent(stage, label, step_name, fn, ctx[ctx_key])
         step += 1
 
     yield _sse_event("progress", {"step": "Math/analysis sub-agent", "stepIndex": step, "totalSteps": TOTAL_STEPS, "percent": int(100 * step / TOTAL_STEPS), "status": "ok", "message": None})
     daily_series = ctx.get("daily") or []
     # Use up to 1 year (252 trading days) for mathematical analysis and forecast
     daily_sample = daily_series[-252:] if len(daily_series) > 252 else daily_series
-    forecast_data = compute_forecast(daily_series) if len(daily_series) >= 2 else {}
+    forecast_data = compute_forecast(daily_series, symbol=symbol) if len(daily_series) >= 2 else {}
     math_ctx = {
         "quote": ctx.get("quote"),
         "daily_sample": daily_sample,
         "fundamentals": ctx.get("fundamentals"),
         "forecast": forecast_data,
+        "rolling": rolling_stats(symbol, daily_series) if len(daily_series) >= 2 else {},
     }
-    try:
-        math_s = run_math_sub_agent(math_ctx)
-        summaries["Math/Analysis"] = math_s
-    except Exception:
-        logger.exception("Math sub-agent failed isin=%s", isin)
-        summaries["Math/Analysis"] = None
-        yield _sse_event("step_failed", {"step": "Math/analysis sub-agent", "message": "Summary failed"})
+    yield from run_sub_agent("math", "Math/Analysis", "Math/analysis sub-agent", run_math_sub_agent, math_ctx)
     step += 1
 
     # Add near-term forecast to context so main agent can use it in advice
@@ -126,21 +195,36 @@ def _advice_stream(isin: str, db: Session):
         logger.info("advice forecast added to context isin=%s", isin)
 
     yield _sse_event("progress", {"step": "Main synthesis", "stepIndex": step, "totalSteps": TOTAL_STEPS, "percent": 95, "status": "ok", "message": None})
+    budget = max(deadline.budget("main"), MIN_SYNTHESIS_SECONDS)
+    synthesis_end = time.monotonic() + budget
     advice_text = ""
+    cut_short = False
     try:
-        for chunk in run_main_agent_stream(summaries, symbol):
+        for chunk in run_main_agent_stream(summaries, symbol, timeout=_timeout(budget)):
             advice_text += chunk
             yield _sse_event("advice_chunk", {"text": chunk})
+            if time.monotonic() >= synthesis_end:
+                cut_short = True
+                break
     except Exception:
         logger.exception("Main agent failed isin=%s symbol=%s", isin, symbol)
         yield _sse_event("step_failed", {"step": "Main synthesis", "message": "LLM synthesis failed"})
-        yield _sse_event("done", {"success": False, "reason": "main_agent_error"})
+        yield _sse_event("done", {"success": False, "reason": "main_agent_error", "skipped": skipped})
         return
+    deadline.finish("main", "partial" if cut_short else "ok")
+    if cut_short:
+        logger.warning("advice synthesis cut short at the deadline isin=%s chars=%s", isin, len(advice_text))
+        skipped.append("Main synthesis")
+        yield _sse_event("stage_skipped", {"step": "Main synthesis", "reason": "deadline", "message": "Advice cut short at the deadline"})
+        if advice_text:
+            advice_text += TRUNCATION_NOTE
+            yield _sse_event("advice_chunk", {"text": TRUNCATION_NOTE})
+    logger.info("advice stages isin=%s %s", isin, deadline.stats())
 
     if not advice_text:
         logger.warning("Main agent returned empty isin=%s symbol=%s", isin, symbol)
         advice_text = "Unable to generate advice (LLM or summaries failed)."
-        yield _sse_event("done", {"success": False, "reason": "main_agent_empty"})
+        yield _sse_event("done", {"success": False, "reason": "main_agent_empty", "skipped": skipped})
         return
 
     # Create session and store advice as assistant message
@@ -159,14 +243,15 @@ def _advice_stream(isin: str, db: Session):
 
     logger.info("advice success isin=%s session_id=%s", isin, chat_session.id)
     yield _sse_event("advice_chunk", {"text": ""})
-    yield _sse_event("done", {"success": True, "sessionId": chat_session.id})
+    yield _sse_event("done", {"success": True, "sessionId": chat_session.id, "skipped": skipped})
 
 
 @router.post("/stocks/{isin}/advice")
 async def get_advice(isin: str, request: Request, db: Session = Depends(get_db)):
     """Run advice pipeline: scan + sub-agents + main agent. Stream progress and advice via SSE."""
+    ctx, progress_list, deadline = await _scan(isin, db)
     return StreamingResponse(
-        _advice_stream(isin, db),
+        _advice_stream(isin, db, ctx, progress_list, deadline),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
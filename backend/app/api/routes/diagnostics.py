@@ -0,0 +1,63 @@
+"""Diagnostics: in-process cache, scan and quota statistics for inspection."""
+from fastapi import APIRouter
+
+from app.adapters.yahoo import ticker_memo_stats
+from app.services.adapter_router import get_adapter_router
+from app.services.fetch_planner import get_fetch_planner
+from app.services.forecast_service import get_forecast_cache
+from app.services.hedging import get_hedger
+from app.services.http_client import get_http_stats
+from app.services.l1_cache import get_l1_cache
+from app.services.negative_cache import get_negative_cache
+from app.services.popularity import get_popularity
+from app.services.rate_limiter import get_alpha_vantage_limiter
+from app.services.rolling_stats import get_rolling_stats_registry
+from app.services.single_flight import get_single_flight
+from app.services.warmup import get_warmup_scheduler
+
+router = APIRouter()
+
+
+@router.get("/diagnostics/cache")
+def cache_stats():
+    """L1 (in-memory) scan cache: entries, bytes, hit/miss counters, evictions; negative cache of known misses;
+    Yahoo Ticker/info memo; memoized forecasts; per-symbol rolling trend statistics."""
+    return {
+        "l1": get_l1_cache().stats(),
+        "negative": get_negative_cache().stats(),
+        "yahoo_ticker_memo": ticker_memo_stats(),
+        "forecast": get_forecast_cache().stats(),
+        "rolling_stats": get_rolling_stats_registry().stats(),
+    }
+
+
+@router.get("/diagnostics/single-flight")
+def single_flight_stats():
+    """Upstream fetch coalescing: executions, coalesced callers (total and per data type), in-flight keys."""
+    return get_single_flight().stats()
+
+
+@router.get("/diagnostics/warmup")
+def warmup_stats():
+    """Cache warm-up scheduler state and the most requested symbols it prioritizes."""
+    return {"scheduler": get_warmup_scheduler().stats(), "popularity": get_popularity().stats()}
+
+
+@router.get("/diagnostics/http")
+def http_stats():
+    """Shared HTTP clients: per-host requests, errors, average latency and connection reuse (sync client)."""
+    return get_http_stats()
+
+
+@router.get("/diagnostics/quota")
+def quota_stats():
+    """Alpha Vantage budget: used/remaining today and next slot from the shared limiter store, plus this
+    worker's granted/rejected counters; planner decisions per data type and known asset types."""
+    return {"alpha_vantage": get_alpha_vantage_limiter().stats(), "planner": get_fetch_planner().stats()}
+
+
+@router.get("/diagnostics/adapters")
+def adapter_stats():
+    """Adapter routing: per adapter and data type breaker state, recent success rate and latency percentiles;
+    hedged fetch policies and how often the hedge won."""
+    return {**get_adapter_router().stats(), "hedging": get_hedger().stats()}
@@ -1,18 +1,22 @@
 """Stocks API: list, series, metrics, forecast."""
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 
 logger = logging.getLogger(__name__)
 from app.models.base import Stock, SymbolResolution
+from app.services.downsample import MIN_POINTS, downsample_series, filter_to_times, slice_by_date
 from app.services.forecast_service import compute_forecast
 from app.services.response_sanitizer import (
     DATA_UNAVAILABLE_MESSAGE,
     is_safe_metrics,
     is_safe_series,
 )
+from app.services.rolling_stats import rolling_stats
 from app.services.scan_service import ScanService
 
 router = APIRouter()
@@ -36,11 +40,16 @@ def list_stocks(db: Session = Depends(get_db)):
 @router.get("/stocks/{isin}/series")
 def get_series(
     isin: str,
+    response: Response,
     interval: str = "1d",
     include_forecast: bool = False,
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    max_points: Optional[int] = Query(None, ge=MIN_POINTS, le=10_000),
     db: Session = Depends(get_db),
 ):
-    """OHLCV series for graph. interval: 1d, 1w, 1m. include_forecast=true adds trend, std bands, next 3 days prognosis."""
+    """OHLCV series for graph. interval: 1d, 1w, 1m. include_forecast=true adds trend, std bands, next 3 days prognosis.
+    start/end (YYYY-MM-DD, inclusive) limit the range; max_points downsamples series and overlays (LTTB on close)."""
     scan = ScanService(db)
     series = scan.get_series(isin, interval)
     if series is None:
@@ -49,20 +58,34 @@ def get_series(
         raise HTTPException(status_code=404, detail=detail)
     if not is_safe_series(series):
         raise HTTPException(status_code=404, detail=DATA_UNAVAILABLE_MESSAGE)
-    out: dict = {"series": series}
-    if include_forecast and interval == "1d" and len(series) >= 2:
-        forecast_data = compute_forecast(series)
+    series = slice_by_date(series, start, end)
+    total_points = len(series)
+    # Forecast is fitted on the full requested range; only what is sent gets decimated
+    forecast_data = compute_forecast(series, symbol=isin) if include_forecast and interval == "1d" and len(series) >= 2 else None
+    # One streaming engine per requested range: keyed by the ISIN alone, switching ranges would rebuild it each time
+    stats_key = f"{isin}:{start or ''}:{end or ''}" if start or end else isin
+    trend_stats = rolling_stats(stats_key, series) if forecast_data is not None else None
+    if max_points and total_points > max_points:
+        series = downsample_series(series, max_points)
+        logger.info("series downsampled isin=%s points=%s -> %s", isin, total_points, len(series))
+    out: dict = {"series": series, "total_points": total_points, "stale": bool(scan.stale_data_types)}
+    if scan.stale_data_types:
+        response.headers["X-Data-Stale"] = ",".join(sorted(scan.stale_data_types))
+    if forecast_data is not None:
+        kept_times = {str(p.get("time"))[:10] for p in series} if len(series) < total_points else None
+        for key in ("trend_line", "upper_band", "lower_band"):
+            overlay = forecast_data.get(key, [])
+            out[key] = filter_to_times(overlay, kept_times) if kept_times is not None else overlay
         out["forecast"] = forecast_data.get("forecast", [])
-        out["trend_line"] = forecast_data.get("trend_line", [])
-        out["upper_band"] = forecast_data.get("upper_band", [])
-        out["lower_band"] = forecast_data.get("lower_band", [])
         out["forecast_stats"] = forecast_data.get("stats", {})
+        out["rolling_stats"] = trend_stats
     return out
 
 
 @router.get("/stocks/{isin}/metrics")
 def get_metrics(
     isin: str,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """Fundamentals/metrics for metrics panel. Returns 200 with {} when no metrics (e.g. ETF) so dashboard still works."""
@@ -75,4 +98,7 @@ def get_metrics(
     if not is_safe_metrics(metrics):
         logger.info("metrics unsafe for isin=%s (blocker content); returning empty", isin)
         return {}
+    if scan.stale_data_types:
+        # Flag via header: the body is a flat metrics dict rendered as-is by the dashboard
+        response.headers["X-Data-Stale"] = ",".join(sorted(scan.stale_data_types))
     return metrics
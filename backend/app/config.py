@@ -10,6 +10,27 @@ def _dev_mode() -> bool:
     return os.getenv("RUN_MODE", "").strip().lower() == "dev"
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    v = os.getenv(name, "").strip().lower()
+    if not v:
+        return default
+    return v in ("1", "true", "yes")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+
+
 class Settings(BaseSettings):
     groq_api_key: str = ""
     groq_api_key_fallback: str = ""
@@ -18,6 +39,53 @@ class Settings(BaseSettings):
     alpha_vantage_api_key: str = ""
     financial_news_api_key: str = ""  # Optional: e.g. NewsFilter.io for ticker-specific news
     dev_mode: bool = False
+    scan_concurrent: bool = True  # Fetch scan data types in parallel on a bounded worker pool
+    scan_max_workers: int = 4
+    scan_concurrency: int = 8  # Scans / advice streams served at once per process; sizes the scan and stage pools
+    l1_cache_max_entries: int = 2048  # In-process cache in front of scan_cache; 0 disables
+    l1_cache_max_mb: int = 64
+    forecast_cache_max_entries: int = 512  # Memoized forecasts by series fingerprint; 0 disables
+    scan_swr_enabled: bool = False  # Serve stale scan_cache rows within a grace window and refresh in background
+    scan_swr_grace_seconds: int = 0  # 0 = per-data-type defaults in scan_service
+    scan_swr_max_staleness_seconds: int = 0  # 0 = per-data-type defaults in scan_service
+    warmup_enabled: bool = False  # Background refresh of popular symbols' cache rows before they expire
+    warmup_interval_seconds: int = 60
+    warmup_top_symbols: int = 20
+    warmup_max_refreshes_per_cycle: int = 4
+    warmup_av_reserve: int = 10  # Alpha Vantage calls per day left for interactive requests
+    warmup_yahoo_per_hour: int = 120
+    negative_cache_max_entries: int = 10000  # Remembered misses (unresolved ISINs, empty fetches); 0 disables
+    negative_cache_ttl_seconds: int = 0  # 0 = per-kind defaults in negative_cache
+    http_pool_connections: int = 10  # Hosts with a kept-alive connection pool in the shared HTTP client
+    http_pool_maxsize: int = 10  # Kept-alive connections per host (>= concurrent scan workers)
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 20.0
+    http_max_retries: int = 1  # Retries on connection errors only
+    alpha_vantage_max_wait_seconds: float = 12.0  # Longest wait for a rate-limit slot before falling back (0 = never wait)
+    rate_limit_backend: str = "memory"  # memory (per process) | file (per host) | postgres (shared via the database)
+    rate_limit_file: str = ""  # State file for the file backend; empty = system temp dir
+    adapter_routing_enabled: bool = True  # Demote unhealthy adapters and skip open circuit breakers
+    adapter_breaker_failures: int = 3  # Consecutive failures (or slow calls) that open an adapter's breaker
+    adapter_breaker_open_seconds: float = 60.0  # How long an open breaker skips the adapter before one probe
+    adapter_slow_call_seconds: float = 10.0  # Calls slower than this count as failures
+    hedge_policies: str = ""  # Hedged fetches per data type, e.g. "quote:p90"; empty = off
+    hedge_default_delay_seconds: float = 1.0  # Hedge threshold while the primary has no latency history
+    hedge_min_delay_seconds: float = 0.2  # Never hedge sooner than this
+    planner_enabled: bool = True  # Route fetches to Yahoo first unless Alpha Vantage adds value and budget allows
+    planner_av_preferred: str = "fundamentals,news"  # Data types that go to Alpha Vantage first
+    planner_av_reserve: int = 5  # Calls kept for the preferred data types; other fetches skip Alpha Vantage below this
+    planner_pacing: bool = True  # Spread Alpha Vantage calls over the UTC day
+    data_source_mode: str = "live"  # live | record (save adapter answers to the corpus) | replay (serve the corpus) | synthetic
+    data_corpus_path: str = ""  # Record/replay corpus (gzip JSON lines); empty = backend/.corpus/market_data.jsonl.gz
+    replay_latency_ms: str = "0"  # Injected latency per replayed call, or "recorded"
+    replay_jitter_ms: float = 0.0  # Std deviation of the injected latency
+    replay_error_rate: float = 0.0  # Share of replayed calls that raise
+    replay_seed: int = 42
+    synthetic_seed: int = 42  # DATA_SOURCE_MODE=synthetic: seeded GBM prices, fundamentals and news
+    synthetic_years: float = 2.0  # Years of daily history per symbol
+    synthetic_end_date: str = ""  # YYYY-MM-DD of the last bar; empty = today (UTC)
+    advice_deadline_seconds: float = 20.0  # Whole advice request (scan, sub-agents, synthesis); 0 = no deadline
+    llm_timeout_seconds: float = 30.0  # Per LLM call (primary and fallback together) when no deadline is tighter
 
     class Config:
         env_file = ".env"
@@ -33,4 +101,51 @@ def get_settings() -> Settings:
         alpha_vantage_api_key=os.getenv("ALPHA_VANTAGE_API_KEY", ""),
         financial_news_api_key=os.getenv("FINANCIAL_NEWS_API_KEY", ""),
         dev_mode=_dev_mode(),
+        scan_concurrent=_env_bool("SCAN_CONCURRENT", True),
+        scan_max_workers=max(1, _env_int("SCAN_MAX_WORKERS", 4)),
+        scan_concurrency=max(1, _env_int("SCAN_CONCURRENCY", 8)),
+        l1_cache_max_entries=_env_int("L1_CACHE_MAX_ENTRIES", 2048),
+        l1_cache_max_mb=_env_int("L1_CACHE_MAX_MB", 64),
+        forecast_cache_max_entries=_env_int("FORECAST_CACHE_MAX_ENTRIES", 512),
+        scan_swr_enabled=_env_bool("SCAN_SWR_ENABLED", False),
+        scan_swr_grace_seconds=_env_int("SCAN_SWR_GRACE_SECONDS", 0),
+        scan_swr_max_staleness_seconds=_env_int("SCAN_SWR_MAX_STALENESS_SECONDS", 0),
+        warmup_enabled=_env_bool("WARMUP_ENABLED", False),
+        warmup_interval_seconds=max(5, _env_int("WARMUP_INTERVAL_SECONDS", 60)),
+        warmup_top_symbols=_env_int("WARMUP_TOP_SYMBOLS", 20),
+        warmup_max_refreshes_per_cycle=_env_int("WARMUP_MAX_REFRESHES_PER_CYCLE", 4),
+        warmup_av_reserve=_env_int("WARMUP_AV_RESERVE", 10),
+        warmup_yahoo_per_hour=_env_int("WARMUP_YAHOO_PER_HOUR", 120),
+        negative_cache_max_entries=_env_int("NEGATIVE_CACHE_MAX_ENTRIES", 10000),
+        negative_cache_ttl_seconds=_env_int("NEGATIVE_CACHE_TTL_SECONDS", 0),
+        http_pool_connections=max(1, _env_int("HTTP_POOL_CONNECTIONS", 10)),
+        http_pool_maxsize=max(1, _env_int("HTTP_POOL_MAXSIZE", 10)),
+        http_connect_timeout=_env_float("HTTP_CONNECT_TIMEOUT", 5.0),
+        http_read_timeout=_env_float("HTTP_READ_TIMEOUT", 20.0),
+        http_max_retries=max(0, _env_int("HTTP_MAX_RETRIES", 1)),
+        alpha_vantage_max_wait_seconds=max(0.0, _env_float("ALPHA_VANTAGE_MAX_WAIT_SECONDS", 12.0)),
+        rate_limit_backend=os.getenv("RATE_LIMIT_BACKEND", "memory").strip().lower(),
+        rate_limit_file=os.getenv("RATE_LIMIT_FILE", ""),
+        adapter_routing_enabled=_env_bool("ADAPTER_ROUTING_ENABLED", True),
+        adapter_breaker_failures=max(1, _env_int("ADAPTER_BREAKER_FAILURES", 3)),
+        adapter_breaker_open_seconds=max(1.0, _env_float("ADAPTER_BREAKER_OPEN_SECONDS", 60.0)),
+        adapter_slow_call_seconds=max(0.1, _env_float("ADAPTER_SLOW_CALL_SECONDS", 10.0)),
+        hedge_policies=os.getenv("HEDGE_POLICIES", ""),
+        hedge_default_delay_seconds=max(0.0, _env_float("HEDGE_DEFAULT_DELAY_SECONDS", 1.0)),
+        hedge_min_delay_seconds=max(0.0, _env_float("HEDGE_MIN_DELAY_SECONDS", 0.2)),
+        planner_enabled=_env_bool("PLANNER_ENABLED", True),
+        planner_av_preferred=os.getenv("PLANNER_AV_PREFERRED", "fundamentals,news"),
+        planner_av_reserve=max(0, _env_int("PLANNER_AV_RESERVE", 5)),
+        planner_pacing=_env_bool("PLANNER_PACING", True),
+        data_source_mode=os.getenv("DATA_SOURCE_MODE", "live").strip().lower(),
+        data_corpus_path=os.getenv("DATA_CORPUS_PATH", ""),
+        replay_latency_ms=os.getenv("REPLAY_LATENCY_MS", "0"),
+        replay_jitter_ms=max(0.0, _env_float("REPLAY_JITTER_MS", 0.0)),
+        replay_error_rate=min(1.0, max(0.0, _env_float("REPLAY_ERROR_RATE", 0.0))),
+        replay_seed=_env_int("REPLAY_SEED", 42),
+        synthetic_seed=_env_int("SYNTHETIC_SEED", 42),
+        synthetic_years=max(0.1, _env_float("SYNTHETIC_YEARS", 2.0)),
+        synthetic_end_date=os.getenv("SYNTHETIC_END_DATE", "").strip(),
+        advice_deadline_seconds=max(0.0, _env_float("ADVICE_DEADLINE_SECONDS", 20.0)),
+        llm_timeout_seconds=max(1.0, _env_float("LLM_TIMEOUT_SECONDS", 30.0)),
     )
@@ -1,9 +1,11 @@
-"""SQLAlchemy models for symbol_resolution, scan_cache, ohlcv, sessions, messages."""
+"""SQLAlchemy models for symbol_resolution, scan_cache, ohlcv, sessions, messages, rate_limit_state."""
 from datetime import datetime
 from sqlalchemy import (
     Column,
     String,
     BigInteger,
+    Integer,
+    Float,
     DateTime,
     Numeric,
     ForeignKey,
@@ -60,6 +62,8 @@ class OHLCV(Base):
     close = Column(Numeric(20, 4), nullable=True)
     volume = Column(BigInteger, nullable=True)
 
+    __table_args__ = (Index("ix_ohlcv_symbol_time", "symbol", "time"),)
+
 
 class Session(Base):
     """One chat/session per stock (one advice run + follow-up messages)."""
@@ -86,3 +90,15 @@ class Message(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
     session = relationship("Session", back_populates="messages")
+
+
+class RateLimitState(Base):
+    """Shared rate limiter counters (one row per limiter) so all workers and batch jobs draw from one budget."""
+    __tablename__ = "rate_limit_state"
+
+    name = Column(String(50), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    refilled_at = Column(Float, nullable=False)  # Unix time of the last refill
+    day = Column(String(10), nullable=False)  # UTC date the daily count belongs to
+    daily_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,270 @@
+"""Adapter routing: per-adapter, per-data-type health (success rate, latency) with a circuit breaker.
+
+The configured adapter order is a preference (Alpha Vantage before Yahoo). The router keeps it for healthy
+adapters, moves unhealthy ones (failing, or slower than the slow-call threshold) behind them, and skips adapters
+whose breaker is open so a rate-limited or hanging provider no longer costs every request its timeout.
+"""
+import logging
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from app.adapters.base import QuotaUnavailable
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+A = TypeVar("A")
+
+WINDOW = 50  # recent calls kept per (adapter, data type) for success rate and latency percentiles
+MIN_CALLS_FOR_RATE = 5  # success rate is not judged on fewer calls
+UNHEALTHY_SUCCESS_RATE = 0.5
+EWMA_ALPHA = 0.2
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _source(adapter: Any) -> str:
+    return getattr(adapter, "source_name", None) or type(adapter).__name__
+
+
+def _percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class AdapterHealth:
+    """Outcomes of one adapter for one data type. Not thread-safe on its own; the router holds its lock."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.empty = 0
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.state = CLOSED
+        self.open_until = 0.0  # monotonic; next probe allowed after this while open
+        self.retest_at = 0.0  # monotonic; next time an unhealthy (demoted) adapter is tried in its own place
+        self.ewma_seconds: Optional[float] = None
+        self.recent: deque[tuple[float, bool]] = deque(maxlen=WINDOW)  # (latency, ok)
+
+    def success_rate(self) -> Optional[float]:
+        if len(self.recent) < MIN_CALLS_FOR_RATE:
+            return None
+        return sum(1 for _, ok in self.recent if ok) / len(self.recent)
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        return _percentile(sorted(lat for lat, _ in self.recent), q)
+
+
+class AdapterRouter:
+    def __init__(self, enabled: bool, failure_threshold: int, open_seconds: float, slow_call_seconds: float):
+        self.enabled = enabled
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self._lock = Lock()
+        self._health: dict[tuple[str, str], AdapterHealth] = {}
+        self.skipped = 0
+
+    def _get(self, source: str, data_type: str) -> AdapterHealth:
+        key = (source, data_type)
+        h = self._health.get(key)
+        if h is None:
+            h = self._health[key] = AdapterHealth()
+        return h
+
+    def _unhealthy(self, h: AdapterHealth) -> bool:
+        rate = h.success_rate()
+        if rate is not None and rate < UNHEALTHY_SUCCESS_RATE:
+            return True
+        return h.ewma_seconds is not None and h.ewma_seconds > self.slow_call_seconds
+
+    def order(self, adapters: Sequence[A], data_type: str) -> list[A]:
+        """Adapters to try for data_type: healthy ones in configured order, then unhealthy ones. Open breakers are
+        left out; after open_seconds one caller gets the adapter back in its place as a half-open probe. When every
+        breaker is open the configured order is returned, so the breaker alone never turns a fetch into a miss."""
+        if not self.enabled:
+            return list(adapters)
+        now = time.monotonic()
+        healthy: list[A] = []
+        demoted: list[A] = []
+        with self._lock:
+            for adapter in adapters:
+                h = self._get(_source(adapter), data_type)
+                if h.state != CLOSED:
+                    if now < h.open_until:
+                        self.skipped += 1
+                        continue
+                    # The probe keeps its configured place, otherwise a healthy fallback would always answer first
+                    # and the breaker could never close. One probe per cooldown window.
+                    h.state = HALF_OPEN
+                    h.open_until = now + self.open_seconds
+                    healthy.append(adapter)
+                elif self._unhealthy(h):
+                    # Demoted adapters rarely run while the fallback answers, so once per cooldown one call tries
+                    # it in its own place again and fresh samples can restore it
+                    if now >= h.retest_at:
+                        h.retest_at = now + self.open_seconds
+                        healthy.append(adapter)
+                    else:
+                        demoted.append(adapter)
+                else:
+                    healthy.append(adapter)
+        routed = healthy + demoted
+        return routed if routed else list(adapters)
+
+    def record(self, adapter: Any, data_type: str, elapsed: float, ok: bool, empty: bool = False) -> None:
+        """Outcome of one call. ok=False for exceptions; calls slower than slow_call_seconds count as failures too."""
+        source = _source(adapter)
+        failed = not ok or elapsed > self.slow_call_seconds
+        with self._lock:
+            h = self._get(source, data_type)
+            h.calls += 1
+            if empty and ok:
+                h.empty += 1
+            h.recent.append((elapsed, not failed))
+            h.ewma_seconds = elapsed if h.ewma_seconds is None else EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * h.ewma_seconds
+            if not failed:
+                h.consecutive_failures = 0
+                if h.state != CLOSED:
+                    logger.info("adapter breaker closed adapter=%s data_type=%s", source, data_type)
+                h.state = CLOSED
+                return
+            h.failures += 1
+            h.consecutive_failures += 1
+            if h.state == HALF_OPEN or h.consecutive_failures >= self.failure_threshold:
+                if h.state != OPEN:
+                    h.times_opened += 1
+                h.state = OPEN
+                h.open_until = time.monotonic() + self.open_seconds
+                logger.warning(
+                    "adapter breaker open adapter=%s data_type=%s consecutive_failures=%s open_s=%s",
+                    source, data_type, h.consecutive_failures, self.open_seconds,
+                )
+
+    def timed_call(self, adapter: A, data_type: str, call: Callable[[A], Any]) -> Any:
+        """call(adapter), with its latency and outcome recorded. Exceptions are recorded (except QuotaUnavailable:
+        no call went out) and re-raised."""
+        start = time.perf_counter()
+        try:
+            out = call(adapter)
+        except QuotaUnavailable:
+            raise
+        except Exception:
+            self.record(adapter, data_type, time.perf_counter() - start, ok=False)
+            raise
+        self.record(adapter, data_type, time.perf_counter() - start, ok=True, empty=not out)
+        return out
+
+    async def timed_call_async(self, adapter: A, data_type: str, call: Callable[[A], Awaitable[Any]]) -> Any:
+        """Async timed_call. A cancelled call (e.g. the losing side of a hedge) is not recorded."""
+        start = time.perf_counter()
+        try:
+            out = await call(adapter)
+        except QuotaUnavailable:
+            raise
+        except Exception:
+            self.record(adapter, data_type, time.perf_counter() - start, ok=False)
+            raise
+        self.record(adapter, data_type, time.perf_counter() - start, ok=True, empty=not out)
+        return out
+
+    def first_result(
+        self, adapters: Sequence[A], data_type: str, call: Callable[[A], Any], errors: Optional[list[BaseException]] = None,
+    ) -> Any:
+        """First non-empty call(adapter) over adapters in the given order; failures are logged and skipped, and
+        appended to errors when given (an empty result with no errors means every adapter answered "no data")."""
+        for adapter in adapters:
+            try:
+                out = self.timed_call(adapter, data_type, call)
+            except Exception as e:
+                logger.debug("%s fetch failed adapter=%s: %s", data_type, type(adapter).__name__, e)
+                if errors is not None:
+                    errors.append(e)
+                continue
+            if out:
+                return out
+        return None
+
+    async def first_result_async(
+        self,
+        adapters: Sequence[A],
+        data_type: str,
+        call: Callable[[A], Awaitable[Any]],
+        errors: Optional[list[BaseException]] = None,
+    ) -> Any:
+        for adapter in adapters:
+            try:
+                out = await self.timed_call_async(adapter, data_type, call)
+            except Exception as e:
+                logger.debug("%s fetch failed adapter=%s: %s", data_type, type(adapter).__name__, e)
+                if errors is not None:
+                    errors.append(e)
+                continue
+            if out:
+                return out
+        return None
+
+    def latency_percentile(self, adapter: Any, data_type: str, q: float) -> Optional[float]:
+        """Recent latency percentile (seconds) of adapter for data_type, or None without history."""
+        with self._lock:
+            h = self._health.get((_source(adapter), data_type))
+            return h.latency_percentile(q) if h else None
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            adapters: dict[str, dict[str, Any]] = {}
+            for (source, data_type), h in sorted(self._health.items()):
+                rate = h.success_rate()
+                adapters.setdefault(source, {})[data_type] = {
+                    "state": h.state,
+                    "healthy": h.state == CLOSED and not self._unhealthy(h),
+                    "calls": h.calls,
+                    "failures": h.failures,
+                    "empty": h.empty,
+                    "consecutive_failures": h.consecutive_failures,
+                    "times_opened": h.times_opened,
+                    "open_for_seconds": round(h.open_until - now, 1) if h.state != CLOSED and h.open_until > now else 0,
+                    "recent_success_rate": round(rate, 3) if rate is not None else None,
+                    "ewma_ms": round(1000 * h.ewma_seconds, 1) if h.ewma_seconds is not None else None,
+                    "p50_ms": _ms(h.latency_percentile(0.5)),
+                    "p95_ms": _ms(h.latency_percentile(0.95)),
+                }
+            return {
+                "enabled": self.enabled,
+                "failure_threshold": self.failure_threshold,
+                "open_seconds": self.open_seconds,
+                "slow_call_seconds": self.slow_call_seconds,
+                "skipped_open": self.skipped,
+                "adapters": adapters,
+            }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(1000 * seconds, 1) if seconds is not None else None
+
+
+# Singleton: health is shared by all ScanService instances (sync and async adapters report under the same name)
+_router: AdapterRouter | None = None
+_router_lock = Lock()
+
+
+def get_adapter_router() -> AdapterRouter:
+    global _router
+    with _router_lock:
+        if _router is None:
+            settings = get_settings()
+            _router = AdapterRouter(
+                enabled=settings.adapter_routing_enabled,
+                failure_threshold=settings.adapter_breaker_failures,
+                open_seconds=settings.adapter_breaker_open_seconds,
+                slow_call_seconds=settings.adapter_slow_call_seconds,
+            )
+        return _router
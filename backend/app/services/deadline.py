@@ -0,0 +1,71 @@
+"""Request deadline shared out over the stages of a pipeline (the advice stream).
+
+Each stage gets a weighted share of the time that is left when it starts: its weight over the weights of the
+stages that have not started yet. A stage that finishes early leaves its unused time to the later ones; a stage
+that is skipped (no data) gives its weight back. A deadline of 0 / None never expires.
+"""
+import logging
+import math
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Deadline:
+    def __init__(self, seconds: Optional[float], weights: Optional[dict[str, float]] = None):
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self._start = time.monotonic()
+        self._pending = dict(weights or {})
+        self._stages: dict[str, dict[str, Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.seconds is not None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def remaining(self) -> float:
+        """Seconds left (inf without a deadline, never negative)."""
+        if self.seconds is None:
+            return math.inf
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, stage: str) -> float:
+        """Seconds for stage (inf without a deadline), from its weight over the stages not started yet."""
+        weight = self._pending.pop(stage, 1.0)
+        remaining = self.remaining()
+        if math.isinf(remaining):
+            budget = remaining
+        else:
+            budget = remaining * weight / (weight + sum(self._pending.values()))
+        self._stages[stage] = {"budget": budget, "started": self.elapsed()}
+        return budget
+
+    def skip(self, stage: str) -> None:
+        """Stage will not run; its weight goes to the remaining stages."""
+        self._pending.pop(stage, None)
+
+    def finish(self, stage: str, outcome: str = "ok") -> None:
+        info = self._stages.get(stage)
+        if info is not None:
+            info["elapsed"] = self.elapsed() - info["started"]
+            info["outcome"] = outcome
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "deadline_seconds": self.seconds,
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "stages": {
+                name: {
+                    "budget_seconds": None if math.isinf(s["budget"]) else round(s["budget"], 3),
+                    "elapsed_seconds": round(s["elapsed"], 3) if "elapsed" in s else None,
+                    "outcome": s.get("outcome"),
+                }
+                for name, s in self._stages.items()
+            },
+        }
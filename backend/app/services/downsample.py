@@ -0,0 +1,75 @@
+"""Series range filtering and downsampling for charts (largest-triangle-three-buckets on close)."""
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# LTTB needs first, last and at least one bucket in between
+MIN_POINTS = 3
+
+
+def slice_by_date(series: list[dict[str, Any]], start: Optional[str] = None, end: Optional[str] = None) -> list[dict[str, Any]]:
+    """Points with start <= time <= end (YYYY-MM-DD, inclusive, both optional). Series must be sorted by time."""
+    if not start and not end:
+        return series
+    times = [str(p.get("time"))[:10] for p in series]
+    lo = bisect_left(times, start) if start else 0
+    hi = bisect_right(times, end) if end else len(series)
+    return series[lo:hi]
+
+
+def _close(p: dict[str, Any]) -> Optional[float]:
+    try:
+        return float(p["close"]) if p.get("close") is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def lttb_indices(values: list[float], threshold: int) -> list[int]:
+    """Indices of the points kept by largest-triangle-three-buckets (x = position). Always keeps first and last."""
+    n = len(values)
+    if threshold >= n or threshold < MIN_POINTS:
+        return list(range(n))
+    kept = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        # Average of the next bucket (or the last point for the final bucket)
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = float(n - 1), values[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = (next_start + next_end - 1) / 2.0
+            avg_y = sum(values[next_start:next_end]) / count
+        ax, ay = float(a), values[a]
+        best, best_area = start, -1.0
+        for j in range(start, min(end, n - 1)):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def downsample_series(series: list[dict[str, Any]], max_points: int) -> list[dict[str, Any]]:
+    """At most max_points points chosen by LTTB on close; points without a close are dropped when downsampling."""
+    if len(series) <= max_points:
+        return series
+    points = [p for p in series if _close(p) is not None]
+    if len(points) <= max_points:
+        return points
+    indices = lttb_indices([_close(p) for p in points], max_points)
+    logger.debug("downsample series points=%s max_points=%s kept=%s", len(series), max_points, len(indices))
+    return [points[i] for i in indices]
+
+
+def filter_to_times(points: list[dict[str, Any]], times: set[str]) -> list[dict[str, Any]]:
+    """Keep overlay points (trend line, bands) whose time is in the downsampled series, so they decimate consistently."""
+    return [p for p in points if str(p.get("time"))[:10] in times]
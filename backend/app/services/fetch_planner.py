@@ -0,0 +1,205 @@
+"""Alpha Vantage budget planner: which provider a fetch goes to first, given the day's remaining calls.
+
+Alpha Vantage has 25 calls a day. The planner keeps them for the data types where it adds something Yahoo lacks
+(fundamentals from OVERVIEW / ETF_PROFILE, news with sentiment scores) and sends everything else to Yahoo first,
+with Alpha Vantage only as a fallback while more than a reserve is left. Spending is paced over the UTC day (the
+limiter's reset), so a busy morning cannot use up the afternoon's budget.
+
+The remaining budget is read from the limiter at most once per BUDGET_CACHE_SECONDS. Planning a fetch therefore
+does not read the limiter store (a database or file) each time. The limiter still enforces the budget when a
+call takes a slot.
+
+The asset type memo remembers which symbols are ETFs, so fundamentals do not spend a call on the endpoint that
+cannot answer for them.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Optional, Sequence, TypeVar
+
+from app.config import get_settings
+from app.services.rate_limiter import get_alpha_vantage_limiter
+
+logger = logging.getLogger(__name__)
+
+A = TypeVar("A")
+
+BUDGETED_SOURCE = "AlphaVantageAdapter"
+# Calls that may be spent ahead of an even spread over the day
+PACING_BURST = 5
+# How long plan() reuses the limiter's remaining budget
+BUDGET_CACHE_SECONDS = 1.0
+ASSET_TYPE_MEMO_MAX_ENTRIES = 10000
+
+
+def _source(adapter: Any) -> str:
+    return getattr(adapter, "source_name", None) or type(adapter).__name__
+
+
+class AssetTypeMemo:
+    """symbol -> "etf" | "fund" | "equity", learned from OVERVIEW AssetType, ETF_PROFILE and Yahoo quoteType."""
+
+    def __init__(self, max_entries: int = ASSET_TYPE_MEMO_MAX_ENTRIES):
+        self._lock = Lock()
+        self._types: "OrderedDict[str, str]" = OrderedDict()
+        self._max_entries = max_entries
+
+    @staticmethod
+    def normalize(asset_type: Optional[str]) -> Optional[str]:
+        if not asset_type or not isinstance(asset_type, str):
+            return None
+        t = asset_type.strip().upper()
+        if t == "ETF":
+            return "etf"
+        if t in ("MUTUALFUND", "MUTUAL FUND"):
+            return "fund"
+        return "equity"
+
+    def remember(self, symbol: str, asset_type: Optional[str]) -> None:
+        kind = self.normalize(asset_type)
+        if not kind:
+            return
+        with self._lock:
+            if self._types.get(symbol) != kind:
+                logger.debug("asset type symbol=%s type=%s", symbol, kind)
+            self._types.pop(symbol, None)
+            self._types[symbol] = kind
+            while len(self._types) > self._max_entries:
+                self._types.popitem(last=False)
+
+    def get(self, symbol: str) -> Optional[str]:
+        with self._lock:
+            return self._types.get(symbol)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            by_type: dict[str, int] = {}
+            for kind in self._types.values():
+                by_type[kind] = by_type.get(kind, 0) + 1
+            return {"entries": len(self._types), "by_type": by_type}
+
+
+_asset_types = AssetTypeMemo()
+
+
+def remember_asset_type(symbol: str, asset_type: Optional[str]) -> None:
+    _asset_types.remember(symbol, asset_type)
+
+
+def is_known_etf(symbol: str) -> bool:
+    return _asset_types.get(symbol) == "etf"
+
+
+class FetchPlanner:
+    def __init__(self, enabled: bool, preferred: set[str], reserve: int, pacing: bool):
+        self.enabled = enabled
+        self.preferred = preferred
+        self.reserve = reserve
+        self.pacing = pacing
+        self._lock = Lock()
+        self._decisions: dict[str, dict[str, int]] = {}
+        self._remaining: Optional[int] = None
+        self._remaining_read_at = 0.0
+        self.budget_reads = 0
+
+    def paced_allowance(self, daily_limit: int, now: Optional[datetime] = None) -> int:
+        """Calls that may have been used by now: the limit spread evenly over the UTC day, plus PACING_BURST."""
+        if not self.pacing:
+            return daily_limit
+        now = now or datetime.now(timezone.utc)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        fraction = (now - midnight).total_seconds() / 86400
+        return min(daily_limit, math.ceil(daily_limit * fraction) + PACING_BURST)
+
+    def _count(self, data_type: str, decision: str) -> None:
+        with self._lock:
+            c = self._decisions.setdefault(data_type, {"av_first": 0, "av_fallback": 0, "av_skipped": 0})
+            c[decision] += 1
+
+    def _budget_fresh(self, now: float) -> bool:
+        with self._lock:
+            return self._remaining is not None and now - self._remaining_read_at < BUDGET_CACHE_SECONDS
+
+    def _remaining_today(self, limiter) -> int:
+        """limiter.remaining_today(), reused for BUDGET_CACHE_SECONDS."""
+        now = time.monotonic()
+        with self._lock:
+            if self._remaining is not None and now - self._remaining_read_at < BUDGET_CACHE_SECONDS:
+                return self._remaining
+        remaining = limiter.remaining_today()
+        with self._lock:
+            self._remaining = remaining
+            self._remaining_read_at = now
+            self.budget_reads += 1
+        return remaining
+
+    def av_role(self, data_type: str) -> str:
+        """"first", "fallback" or "skip" for the budgeted provider on this fetch."""
+        limiter = get_alpha_vantage_limiter()
+        remaining = self._remaining_today(limiter)
+        used = limiter.daily_limit - remaining
+        if remaining <= 0 or used >= self.paced_allowance(limiter.daily_limit):
+            return "skip"
+        if data_type in self.preferred:
+            return "first"
+        return "fallback" if remaining > self.reserve else "skip"
+
+    def plan(self, adapters: Sequence[A], data_type: str) -> list[A]:
+        """Adapters for data_type with the budgeted provider moved first, moved last, or left out."""
+        if not self.enabled or not any(_source(a) == BUDGETED_SOURCE for a in adapters):
+            return list(adapters)
+        role = self.av_role(data_type)
+        budgeted = [a for a in adapters if _source(a) == BUDGETED_SOURCE]
+        others = [a for a in adapters if _source(a) != BUDGETED_SOURCE]
+        self._count(data_type, {"first": "av_first", "fallback": "av_fallback", "skip": "av_skipped"}[role])
+        if role == "first":
+            return budgeted + others
+        if role == "fallback":
+            return others + budgeted
+        return others
+
+    async def plan_async(self, adapters: Sequence[A], data_type: str) -> list[A]:
+        """plan() for coroutines: a stale budget is re-read in a worker thread, not on the event loop."""
+        if self.enabled and not self._budget_fresh(time.monotonic()):
+            if any(_source(a) == BUDGETED_SOURCE for a in adapters):
+                await asyncio.to_thread(self._remaining_today, get_alpha_vantage_limiter())
+        return self.plan(adapters, data_type)
+
+    def stats(self) -> dict[str, Any]:
+        limiter = get_alpha_vantage_limiter()
+        with self._lock:
+            decisions = {dt: dict(c) for dt, c in self._decisions.items()}
+            budget_reads = self.budget_reads
+        return {
+            "enabled": self.enabled,
+            "alpha_vantage_preferred": sorted(self.preferred),
+            "reserve": self.reserve,
+            "pacing": self.pacing,
+            "paced_allowance_now": self.paced_allowance(limiter.daily_limit),
+            "decisions": decisions,
+            "budget_reads": budget_reads,
+            "asset_types": _asset_types.stats(),
+        }
+
+
+# Singleton shared by all ScanService instances in this process
+_planner: FetchPlanner | None = None
+_planner_lock = Lock()
+
+
+def get_fetch_planner() -> FetchPlanner:
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            settings = get_settings()
+            _planner = FetchPlanner(
+                enabled=settings.planner_enabled,
+                preferred={t.strip() for t in settings.planner_av_preferred.split(",") if t.strip()},
+                reserve=settings.planner_av_reserve,
+                pacing=settings.planner_pacing,
+            )
+        return _planner
@@ -1,7 +1,20 @@
-"""Time series analysis: trend line, standard deviation bands, and short-term prognosis (next 3 days)."""
+"""Time series analysis: trend line, standard deviation bands, and short-term prognosis (next 3 days).
+
+compute_forecast fits on NumPy arrays; compute_forecast_reference is the original pure-Python implementation,
+kept as the reference the NumPy path is checked against (scripts/benchmark_forecast.py). Both use the same
+formulas and round the same Python floats, so their outputs match.
+
+Forecasts of a known symbol are memoized by series fingerprint (ForecastCache) until a new bar arrives.
+"""
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -57,25 +70,49 @@ def _sample_std(values: list[float]) -> float:
     return variance ** 0.5
 
 
-def compute_forecast(series: list[dict[str, Any]]) -> dict[str, Any]:
-    """
-    Compute trend line, standard deviation bands, and next 3 days forecast from daily OHLCV series.
-    series: list of { time, open, high, low, close, volume } sorted by time ascending.
-    Returns:
-      trend_line: list of { time, value }
-      upper_band, lower_band: list of { time, value } (trend ± k*std)
-      forecast: list of { time, close } for next 3 trading days
-      stats: { slope, intercept, std, last_date }
-    """
-    if not series or len(series) < 2:
-        return {
-            "trend_line": [],
-            "upper_band": [],
-            "lower_band": [],
-            "forecast": [],
-            "stats": {},
-        }
+def _fit_reference(closes: list[float]) -> tuple[float, float, float, list[float]]:
+    """(slope, intercept, std, trend values) with pure-Python sums."""
+    n = len(closes)
+    x = list(range(n))
+    slope, intercept = _linear_regression(x, closes)
+    std = _sample_std(closes)
+    return slope, intercept, std, [intercept + slope * i for i in range(n)]
 
+
+def _fit_numpy(closes: list[float]) -> tuple[float, float, float, np.ndarray]:
+    """_fit_reference on arrays. Elementwise work is vectorized; the x sums are exact integers (closed form, as
+    the reference sums ints) and the float sums use built-in sum() over the array values, so every sum is added
+    in the reference's order and the results are the same floats."""
+    y = np.asarray(closes, dtype=float)
+    n = len(y)
+    x = np.arange(n, dtype=float)
+    sum_x = n * (n - 1) // 2
+    sum_xx = (n - 1) * n * (2 * n - 1) // 6
+    sum_y = sum(closes)
+    sum_xy = sum((x * y).tolist())
+    denom = n * sum_xx - sum_x * sum_x
+    if abs(denom) < 1e-20:
+        slope, intercept = 0.0, sum_y / n
+    else:
+        slope = (n * sum_xy - sum_x * sum_y) / denom
+        intercept = (sum_y - slope * sum_x) / n
+    mean = sum_y / n
+    std = (sum(((y - mean) ** 2).tolist()) / (n - 1)) ** 0.5
+    return slope, intercept, std, intercept + slope * x
+
+
+def _empty_forecast() -> dict[str, Any]:
+    return {
+        "trend_line": [],
+        "upper_band": [],
+        "lower_band": [],
+        "forecast": [],
+        "stats": {},
+    }
+
+
+def _closes(series: list[dict[str, Any]]) -> tuple[list[str], list[float]]:
+    """(times YYYY-MM-DD, closes) of the bars that have both."""
     closes = []
     times = []
     for p in series:
@@ -87,25 +124,49 @@ def compute_forecast(series: list[dict[str, Any]]) -> dict[str, Any]:
             except (TypeError, ValueError):
                 continue
             times.append(str(t)[:10])
+    return times, closes
+
+
+def _round4(values: np.ndarray) -> list[float]:
+    """[round(v, 4) for v in values] without a Python call per value. rint(v * 1e4) / 1e4 picks the same 4-decimal
+    value as round() unless v * 1e4 is within float error of a half; those values, and values above ~2e5 where
+    that error can reach the tolerance, go through round()."""
+    scaled = values * 1e4
+    out = np.rint(scaled) / 1e4
+    with np.errstate(invalid="ignore"):
+        ambiguous = (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6) | ~(np.abs(scaled) < 2.0 ** 31)
+    rounded = out.tolist()
+    for i in np.flatnonzero(ambiguous).tolist():
+        rounded[i] = round(float(values[i]), 4)
+    return rounded
+
+
+def _band(times: list[str], values: list[float]) -> list[dict[str, Any]]:
+    return [{"time": t, "value": v} for t, v in zip(times, values)]
+
 
+def _forecast(series: list[dict[str, Any]], fit: Callable[[list[float]], tuple[float, float, float, Any]], vectorized: bool) -> dict[str, Any]:
+    if not series or len(series) < 2:
+        return _empty_forecast()
+    times, closes = _closes(series)
     if len(closes) < 2:
-        return {
-            "trend_line": [],
-            "upper_band": [],
-            "lower_band": [],
-            "forecast": [],
-            "stats": {},
-        }
+        return _empty_forecast()
 
     n = len(closes)
-    x = list(range(n))
-    slope, intercept = _linear_regression(x, closes)
-    std = _sample_std(closes)
-    trend_values = [intercept + slope * i for i in range(n)]
+    slope, intercept, std, trend = fit(closes)
+    if vectorized:
+        # Same elementwise float operations as the list comprehensions below
+        trend_values = _round4(trend)
+        upper_values = _round4(trend + STD_BANDS_K * std)
+        lower_values = _round4(trend - STD_BANDS_K * std)
+    else:
+        trend_values = [round(v, 4) for v in trend]
+        upper_values = [round(v + STD_BANDS_K * std, 4) for v in trend]
+        lower_values = [round(v - STD_BANDS_K * std, 4) for v in trend]
 
-    trend_line = [{"time": t, "value": round(v, 4)} for t, v in zip(times, trend_values)]
-    upper_band = [{"time": t, "value": round(v + STD_BANDS_K * std, 4)} for t, v in zip(times, trend_values)]
-    lower_band = [{"time": t, "value": round(v - STD_BANDS_K * std, 4)} for t, v in zip(times, trend_values)]
+    trend_line = _band(times, trend_values)
+    upper_band = _band(times, upper_values)
+    lower_band = _band(times, lower_values)
 
     last_date = _parse_date(times[-1]) if times else None
     if not last_date:
@@ -139,3 +200,114 @@ def compute_forecast(series: list[dict[str, Any]]) -> dict[str, Any]:
             "last_date": times[-1],
         },
     }
+
+
+def _fingerprint(symbol: str, series: list[dict[str, Any]]) -> tuple:
+    """Cache key: symbol, first/last bar time, bar count, last close (today's bar changes intraday), a hash of
+    all closes (a full refetch after a split or dividend adjustment revises history without changing the
+    others) and the forecast parameters."""
+    first, last = series[0], series[-1]
+    return (
+        symbol,
+        str(first.get("time"))[:10],
+        str(last.get("time"))[:10],
+        len(series),
+        last.get("close"),
+        hash(tuple(p.get("close") for p in series)),
+        FORECAST_DAYS,
+        STD_BANDS_K,
+    )
+
+
+class ForecastCache:
+    """Thread-safe LRU of compute_forecast results by series fingerprint. Results are shared between callers;
+    treat them as read-only."""
+
+    def __init__(self, max_entries: int):
+        self._lock = Lock()
+        self._entries: "OrderedDict[Hashable, dict[str, Any]]" = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def set(self, key: Hashable, result: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+
+# Singleton shared by the series and advice routes in this process
+_forecast_cache: ForecastCache | None = None
+_forecast_cache_lock = Lock()
+
+
+def get_forecast_cache() -> ForecastCache:
+    global _forecast_cache
+    with _forecast_cache_lock:
+        if _forecast_cache is None:
+            _forecast_cache = ForecastCache(get_settings().forecast_cache_max_entries)
+        return _forecast_cache
+
+
+def compute_forecast(series: list[dict[str, Any]], symbol: Optional[str] = None) -> dict[str, Any]:
+    """
+    Compute trend line, standard deviation bands, and next 3 days forecast from daily OHLCV series.
+    series: list of { time, open, high, low, close, volume } sorted by time ascending.
+    symbol: identifier the series belongs to; when given, the result is memoized (see ForecastCache) and shared
+      between callers, so treat it as read-only.
+    Returns:
+      trend_line: list of { time, value }
+      upper_band, lower_band: list of { time, value } (trend ± k*std)
+      forecast: list of { time, close } for next 3 trading days
+      stats: { slope, intercept, std, last_date }
+    """
+    cache = get_forecast_cache()
+    if not symbol or not cache.enabled or not series:
+        return _forecast(series, _fit_numpy, vectorized=True)
+    key = _fingerprint(symbol, series)
+    result = cache.get(key)
+    if result is None:
+        result = _forecast(series, _fit_numpy, vectorized=True)
+        cache.set(key, result)
+    return result
+
+
+def compute_forecast_reference(series: list[dict[str, Any]]) -> dict[str, Any]:
+    """compute_forecast with pure-Python sums and lists (the reference implementation)."""
+    return _forecast(series, _fit_reference, vectorized=False)
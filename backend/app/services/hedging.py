@@ -0,0 +1,201 @@
+"""Hedged upstream fetches (opt-in per data type): if the first adapter has not answered by its recent latency
+percentile, the next adapter is started too and the first non-empty result wins.
+
+Policies come from HEDGE_POLICIES, e.g. "quote:p90,fundamentals:p95". Data types not listed are fetched one
+adapter at a time as before. A hedge costs an extra upstream call, so it is meant for reads where latency matters
+more than quota (the dashboard quote).
+"""
+import asyncio
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from app.config import get_settings
+from app.services.adapter_router import AdapterRouter, get_adapter_router
+
+logger = logging.getLogger(__name__)
+
+A = TypeVar("A")
+
+DEFAULT_PERCENTILE = 0.95
+HEDGE_MAX_WORKERS = 8
+
+
+def parse_hedge_policies(spec: str) -> dict[str, float]:
+    """'quote:p90,news' -> {'quote': 0.9, 'news': 0.95}. Malformed entries are logged and skipped."""
+    policies: dict[str, float] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        data_type, _, pct = part.partition(":")
+        try:
+            q = float(pct.strip().lower().lstrip("p")) / 100 if pct else DEFAULT_PERCENTILE
+        except ValueError:
+            logger.warning("ignoring hedge policy %r (expected data_type:pNN)", part)
+            continue
+        if not 0 < q <= 1:
+            logger.warning("ignoring hedge policy %r (percentile must be in 1..100)", part)
+            continue
+        policies[data_type.strip()] = q
+    return policies
+
+
+class HedgeStats:
+    """Per data type: fetches under a policy, hedges started, and which side won once a hedge was started."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._by_type: dict[str, dict[str, int]] = {}
+
+    def incr(self, data_type: str, counter: str) -> None:
+        with self._lock:
+            c = self._by_type.setdefault(data_type, {"fetches": 0, "hedged": 0, "hedge_won": 0, "primary_won": 0})
+            c[counter] += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            out = {dt: dict(c) for dt, c in self._by_type.items()}
+        for c in out.values():
+            c["hedge_win_rate"] = round(c["hedge_won"] / c["hedged"], 3) if c["hedged"] else None
+        return out
+
+
+class Hedger:
+    def __init__(self, router: AdapterRouter, policies: dict[str, float], default_delay: float, min_delay: float):
+        self.router = router
+        self.policies = policies
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self._stats = HedgeStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+
+    def enabled_for(self, data_type: str) -> bool:
+        return data_type in self.policies
+
+    def delay(self, adapter: Any, data_type: str) -> float:
+        """Seconds to give the primary before hedging: its recent latency percentile, default_delay without history."""
+        observed = self.router.latency_percentile(adapter, data_type, self.policies[data_type])
+        return max(self.min_delay, observed if observed is not None else self.default_delay)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Own pool: hedges are started from scan workers, so sharing their pool could deadlock it
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="hedge")
+            return self._executor
+
+    def first_result(
+        self, adapters: Sequence[A], data_type: str, call: Callable[[A], Any], errors: Optional[list[BaseException]] = None,
+    ) -> Any:
+        """First non-empty result of the first two adapters (the second started once the first is past its
+        threshold), then the remaining adapters in order. A losing call runs to completion in the background;
+        only its outcome is recorded. Failed calls that were waited for are appended to errors, as in
+        AdapterRouter.first_result."""
+        if len(adapters) < 2:
+            return self.router.first_result(adapters, data_type, call, errors)
+        primary, secondary = adapters[0], adapters[1]
+        self._stats.incr(data_type, "fetches")
+        pool = self._pool()
+        first = pool.submit(self.router.timed_call, primary, data_type, call)
+        futures: dict[Future, A] = {first: primary}
+        done, _ = wait([first], timeout=self.delay(primary, data_type))
+        if not done:
+            self._stats.incr(data_type, "hedged")
+            logger.debug("hedge started data_type=%s primary=%s", data_type, type(primary).__name__)
+            futures[pool.submit(self.router.timed_call, secondary, data_type, call)] = secondary
+        else:
+            out = _result(first, errors)
+            if out:
+                return out
+            futures = {pool.submit(self.router.timed_call, secondary, data_type, call): secondary}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                out = _result(fut, errors)
+                if out:
+                    if len(futures) == 2:
+                        self._stats.incr(data_type, "hedge_won" if futures[fut] is secondary else "primary_won")
+                    return out
+        return self.router.first_result(adapters[2:], data_type, call, errors)
+
+    async def first_result_async(
+        self,
+        adapters: Sequence[A],
+        data_type: str,
+        call: Callable[[A], Awaitable[Any]],
+        errors: Optional[list[BaseException]] = None,
+    ) -> Any:
+        """Async first_result; the losing call is cancelled."""
+        if len(adapters) < 2:
+            return await self.router.first_result_async(adapters, data_type, call, errors)
+        primary, secondary = adapters[0], adapters[1]
+        self._stats.incr(data_type, "fetches")
+        first = asyncio.ensure_future(self.router.timed_call_async(primary, data_type, call))
+        tasks: dict[asyncio.Future, A] = {first: primary}
+        done, _ = await asyncio.wait({first}, timeout=self.delay(primary, data_type))
+        if not done:
+            self._stats.incr(data_type, "hedged")
+            tasks[asyncio.ensure_future(self.router.timed_call_async(secondary, data_type, call))] = secondary
+        else:
+            out = _result(first, errors)
+            if out:
+                return out
+            tasks = {asyncio.ensure_future(self.router.timed_call_async(secondary, data_type, call)): secondary}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    out = _result(task, errors)
+                    if out:
+                        if len(tasks) == 2:
+                            self._stats.incr(data_type, "hedge_won" if tasks[task] is secondary else "primary_won")
+                        return out
+        finally:
+            for task in pending:
+                task.cancel()
+        return await self.router.first_result_async(adapters[2:], data_type, call, errors)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "policies": {dt: f"p{round(q * 100)}" for dt, q in self.policies.items()},
+            "default_delay_seconds": self.default_delay,
+            "min_delay_seconds": self.min_delay,
+            "by_data_type": self._stats.snapshot(),
+        }
+
+
+def _result(fut: Any, errors: Optional[list[BaseException]] = None) -> Any:
+    """Result of a finished future, None when it raised (already recorded by the router; appended to errors)."""
+    try:
+        return fut.result()
+    except Exception as e:
+        logger.debug("hedged fetch failed: %s", e)
+        if errors is not None:
+            errors.append(e)
+        return None
+
+
+# Singleton sharing the adapter router's health data
+_hedger: Hedger | None = None
+_hedger_lock = Lock()
+
+
+def get_hedger() -> Hedger:
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            settings = get_settings()
+            _hedger = Hedger(
+                get_adapter_router(),
+                parse_hedge_policies(settings.hedge_policies),
+                default_delay=settings.hedge_default_delay_seconds,
+                min_delay=settings.hedge_min_delay_seconds,
+            )
+            if _hedger.policies:
+                logger.info("hedged fetches enabled policies=%s", _hedger.stats()["policies"])
+        return _hedger
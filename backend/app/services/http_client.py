@@ -0,0 +1,259 @@
+"""Shared pooled HTTP client for outbound requests (adapters, web search): keep-alive per host, consistent timeouts."""
+import asyncio
+import logging
+import time
+import weakref
+from threading import Lock
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# TCP (and TLS) connects per host. Counted on the connection itself: urllib3 reconnects a pooled connection object
+# in place when the server closed it, which its pool-level num_connections does not see.
+_connects: dict[str, int] = {}
+_connects_lock = Lock()
+
+
+def _host_label(host: str, port: Optional[int]) -> str:
+    return host if port in (None, 80, 443) else f"{host}:{port}"
+
+
+def _count_connect(host: str, port: Optional[int]) -> None:
+    label = _host_label(host, port)
+    with _connects_lock:
+        _connects[label] = _connects.get(label, 0) + 1
+    logger.debug("http new connection host=%s", label)
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        super().connect()
+        _count_connect(self.host, self.port)
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        super().connect()
+        _count_connect(self.host, self.port)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _HostStats:
+    """Per-host request count, errors and cumulative latency."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._hosts: dict[str, dict[str, float]] = {}
+
+    def record(self, host: str, elapsed: float, ok: bool) -> None:
+        with self._lock:
+            h = self._hosts.setdefault(host, {"requests": 0, "errors": 0, "total_seconds": 0.0})
+            h["requests"] += 1
+            h["total_seconds"] += elapsed
+            if not ok:
+                h["errors"] += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            hosts = {host: dict(h) for host, h in self._hosts.items()}
+        return {
+            host: {
+                "requests": int(h["requests"]),
+                "errors": int(h["errors"]),
+                "avg_ms": round(1000 * h["total_seconds"] / h["requests"], 1) if h["requests"] else None,
+            }
+            for host, h in hosts.items()
+        }
+
+
+class PooledHTTPClient:
+    """
+    One requests.Session for the process: a urllib3 connection pool per host (pool_connections hosts,
+    pool_maxsize kept-alive connections each), so repeated calls to the same API skip the TCP/TLS handshake.
+    Connect errors are retried; read timeouts and HTTP errors are returned to the caller as before.
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int, connect_timeout: float, read_timeout: float, max_retries: int):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=max_retries, connect=max_retries, read=0, status=0, backoff_factor=0.2),
+        )
+        self._adapter.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self._stats = _HostStats()
+
+    def get(
+        self,
+        url: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+        read_timeout: Optional[float] = None,
+    ) -> requests.Response:
+        """GET through the shared pool. read_timeout overrides the default for slow endpoints."""
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        ok = False
+        try:
+            r = self.session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=(self.connect_timeout, read_timeout or self.read_timeout),
+            )
+            ok = True
+            return r
+        finally:
+            self._stats.record(host, time.perf_counter() - start, ok)
+
+    def stats(self) -> dict[str, Any]:
+        with _connects_lock:
+            connects = dict(_connects)
+        out = self._stats.snapshot()
+        for host, h in out.items():
+            sent = h["requests"]
+            opened = connects.get(host, 0)
+            h["connections_opened"] = opened
+            h["reuse_rate"] = round(max(0, sent - opened) / sent, 4) if sent else None
+        return {
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "hosts": out,
+        }
+
+
+# Singleton shared by adapters and web search in this process
+_http_client: PooledHTTPClient | None = None
+_http_client_lock = Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            settings = get_settings()
+            _http_client = PooledHTTPClient(
+                pool_connections=settings.http_pool_connections,
+                pool_maxsize=settings.http_pool_maxsize,
+                connect_timeout=settings.http_connect_timeout,
+                read_timeout=settings.http_read_timeout,
+                max_retries=settings.http_max_retries,
+            )
+            logger.info(
+                "http client created pool_connections=%s pool_maxsize=%s timeouts=(%s, %s)",
+                settings.http_pool_connections, settings.http_pool_maxsize,
+                settings.http_connect_timeout, settings.http_read_timeout,
+            )
+        return _http_client
+
+
+class AsyncPooledHTTPClient:
+    """httpx.AsyncClient with the same pool and timeout settings, for async adapters. httpx pools are bound to
+    the event loop that opened their connections, so there is one client per loop (see get_async_http_client)."""
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive: int,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        stats: _HostStats,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            # httpx retries connection failures only, matching the sync client
+            transport=httpx.AsyncHTTPTransport(retries=max_retries),
+        )
+        self._stats = stats
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+        read_timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        ok = False
+        try:
+            r = await self.client.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=httpx.Timeout(read_timeout or self.read_timeout, connect=self.connect_timeout),
+            )
+            ok = True
+            return r
+        finally:
+            self._stats.record(host, time.perf_counter() - start, ok)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPooledHTTPClient]" = weakref.WeakKeyDictionary()
+_async_stats = _HostStats()
+
+
+def get_async_http_client() -> AsyncPooledHTTPClient:
+    """Client for the running event loop (created on first use in that loop)."""
+    loop = asyncio.get_running_loop()
+    with _http_client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            settings = get_settings()
+            client = AsyncPooledHTTPClient(
+                max_connections=settings.http_pool_connections * settings.http_pool_maxsize,
+                max_keepalive=settings.http_pool_connections * settings.http_pool_maxsize,
+                connect_timeout=settings.http_connect_timeout,
+                read_timeout=settings.http_read_timeout,
+                max_retries=settings.http_max_retries,
+                stats=_async_stats,
+            )
+            _async_clients[loop] = client
+            logger.info("async http client created for event loop")
+        return client
+
+
+async def close_async_http_client() -> None:
+    """Close the running loop's client (app shutdown)."""
+    with _http_client_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_http_stats() -> dict[str, Any]:
+    """Sync client stats (with connection reuse) plus per-host counters of the async clients."""
+    return {**get_http_client().stats(), "async_hosts": _async_stats.snapshot()}
@@ -0,0 +1,220 @@
+"""Bulk ISIN -> symbol resolution for the stocks universe: bounded concurrency, per-provider budgets, resumable."""
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.adapters.base import DataSourceAdapter
+from app.models.base import Stock, SymbolResolution
+from app.services.scan_service import TTL_ISIN, _now, adapter_source, resolve_with_adapters
+
+logger = logging.getLogger(__name__)
+
+# Runs an ISIN that failed is retried in before it is left alone until the checkpoint is reset; a failure may be
+# transient (timeouts and 429s raise UpstreamUnavailable, which resolve_with_adapters skips)
+MAX_RESOLVE_ATTEMPTS = 3
+
+
+class BudgetExhausted(Exception):
+    """A provider's request budget for this run is used up."""
+
+
+class ProviderBudget:
+    """Max requests per run plus a request rate; the wait for a slot happens outside the lock."""
+
+    def __init__(self, name: str, max_requests: int, per_second: float):
+        self.name = name
+        self.max_requests = max_requests
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self.used = 0
+        self._next_slot = 0.0
+        self._lock = Lock()
+
+    def take(self) -> None:
+        with self._lock:
+            if self.used >= self.max_requests:
+                raise BudgetExhausted(self.name)
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            self.used += 1
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BudgetedResolver(DataSourceAdapter):
+    """Charges an adapter's ISIN/name lookups to a ProviderBudget. Only resolution is used by the bulk job."""
+
+    def __init__(self, inner: DataSourceAdapter, budget: ProviderBudget):
+        self.inner = inner
+        self.budget = budget
+        self.source_name = adapter_source(inner)
+
+    def get_quote(self, symbol: str) -> Optional[dict[str, Any]]:
+        return None
+
+    def get_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        return None
+
+    def get_fundamentals(self, symbol: str) -> Optional[dict[str, Any]]:
+        return None
+
+    def get_news(self, symbol: str, limit: int = 10) -> Optional[list[dict[str, Any]]]:
+        return None
+
+    def resolve_isin(self, isin: str) -> Optional[dict[str, Any]]:
+        if type(self.inner).resolve_isin is DataSourceAdapter.resolve_isin:
+            return None
+        self.budget.take()
+        return self.inner.resolve_isin(isin)
+
+    def resolve_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        if type(self.inner).resolve_by_name is DataSourceAdapter.resolve_by_name:
+            return None
+        self.budget.take()
+        return self.inner.resolve_by_name(name)
+
+
+class BulkIsinResolver:
+    """
+    Walks the stocks table in ISIN order and resolves ISINs that have no symbol_resolution row, or an expired one.
+    Work runs in chunks: a chunk is resolved concurrently, written to symbol_resolution in one upsert, then
+    the checkpoint file records the last ISIN done and the ISINs that failed (with their attempt count). A rerun
+    continues after the last ISIN and retries the failed ones, up to MAX_RESOLVE_ATTEMPTS runs each.
+    """
+
+    def __init__(
+        self,
+        db: DBSession,
+        adapters: list[BudgetedResolver],
+        *,
+        concurrency: int = 4,
+        batch_size: int = 200,
+        checkpoint_path: Optional[Path] = None,
+        include_expired: bool = True,
+        limit: Optional[int] = None,
+    ):
+        self.db = db
+        self.adapters = adapters
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.checkpoint_path = checkpoint_path
+        self.include_expired = include_expired
+        self.limit = limit
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> dict[str, Any]:
+        if self.checkpoint_path and self.checkpoint_path.exists():
+            data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+            data.setdefault("failed_isins", {})
+            logger.info(
+                "bulk resolve resuming after isin=%s failed_isins=%s", data.get("last_isin"), len(data["failed_isins"]),
+            )
+            return data
+        return {"last_isin": None, "resolved": 0, "failed": 0, "failed_isins": {}}
+
+    def _retry_isins(self) -> list[str]:
+        return [isin for isin, attempts in self.checkpoint["failed_isins"].items() if attempts < MAX_RESOLVE_ATTEMPTS]
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_path:
+            self.checkpoint_path.write_text(json.dumps(self.checkpoint), encoding="utf-8")
+
+    def pending(self) -> list[tuple[str, str]]:
+        """(isin, name) still to resolve, in ISIN order: after the checkpoint, plus earlier failures to retry."""
+        q = self.db.query(Stock.isin, Stock.name).outerjoin(SymbolResolution, SymbolResolution.isin == Stock.isin)
+        if self.include_expired:
+            cutoff = _now() - timedelta(seconds=TTL_ISIN)
+            q = q.filter(or_(SymbolResolution.isin.is_(None), SymbolResolution.updated_at < cutoff))
+        else:
+            q = q.filter(SymbolResolution.isin.is_(None))
+        if self.checkpoint.get("last_isin"):
+            retry = self._retry_isins()
+            after = Stock.isin > self.checkpoint["last_isin"]
+            q = q.filter(or_(after, Stock.isin.in_(retry)) if retry else after)
+        q = q.order_by(Stock.isin)
+        if self.limit:
+            q = q.limit(self.limit)
+        return [(isin, name) for isin, name in q.all()]
+
+    def _resolve_one(self, isin: str, name: str) -> tuple[str, Optional[tuple[dict, DataSourceAdapter]], bool]:
+        """(isin, resolution or None, budget_exhausted)."""
+        try:
+            return isin, resolve_with_adapters(self.adapters, isin, lambda: name), False
+        except BudgetExhausted as e:
+            logger.info("bulk resolve budget exhausted provider=%s isin=%s", e, isin)
+            return isin, None, True
+        except Exception:
+            logger.exception("bulk resolve error isin=%s", isin)
+            return isin, None, False
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        stmt = pg_insert(SymbolResolution).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SymbolResolution.isin],
+            set_={c: stmt.excluded[c] for c in ("symbol", "name", "source", "updated_at")},
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def run(self) -> dict[str, Any]:
+        pending = self.pending()
+        logger.info("bulk resolve start pending=%s concurrency=%s batch_size=%s", len(pending), self.concurrency, self.batch_size)
+        stopped = False
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="isin-resolve") as pool:
+            for i in range(0, len(pending), self.batch_size):
+                chunk = pending[i:i + self.batch_size]
+                results = list(pool.map(lambda item: self._resolve_one(*item), chunk))
+                now = _now()
+                rows = []
+                done_until = None
+                failed_isins = self.checkpoint["failed_isins"]
+                for isin, resolved, exhausted in results:
+                    if exhausted:
+                        stopped = True
+                    if not stopped:
+                        # Retried ISINs sort before last_isin; the checkpoint only moves forward
+                        done_until = max(done_until or isin, isin)
+                        if not resolved:
+                            failed_isins[isin] = failed_isins.get(isin, 0) + 1
+                    if resolved:
+                        failed_isins.pop(isin, None)
+                        result, adapter = resolved
+                        rows.append({
+                            "isin": isin,
+                            "symbol": result["symbol"],
+                            "name": result.get("name"),
+                            "source": adapter_source(adapter),
+                            "updated_at": now,
+                        })
+                self._write(rows)
+                self.checkpoint["resolved"] += len(rows)
+                self.checkpoint["failed"] = len(failed_isins)
+                if done_until and (not self.checkpoint["last_isin"] or done_until > self.checkpoint["last_isin"]):
+                    self.checkpoint["last_isin"] = done_until
+                self._save_checkpoint()
+                logger.info(
+                    "bulk resolve chunk done=%s/%s resolved=%s last_isin=%s",
+                    min(i + self.batch_size, len(pending)), len(pending), len(rows), self.checkpoint["last_isin"],
+                )
+                if stopped:
+                    break
+        summary = {
+            **{k: v for k, v in self.checkpoint.items() if k != "failed_isins"},
+            "retryable": len(self._retry_isins()),
+            "pending": len(pending),
+            "stopped_on_budget": stopped,
+            "requests": {a.budget.name: a.budget.used for a in self.adapters},
+        }
+        logger.info("bulk resolve finished %s", summary)
+        return summary
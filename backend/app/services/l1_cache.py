@@ -0,0 +1,128 @@
+"""In-process L1 cache in front of scan_cache: TTL expiry plus LRU eviction bounded by entry count and approximate bytes."""
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, str, str]  # (symbol, data_type, interval) — same shape as scan_cache
+
+
+def _approx_size(payload: Any) -> int:
+    """Approximate in-memory cost of a payload by its JSON length (payloads come from JSONB, so they serialize)."""
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class L1Cache:
+    """Thread-safe LRU of (payload, fetched_at) per cache key. Payloads are shared between callers; treat them as read-only."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self._lock = Lock()
+        self._entries: "OrderedDict[CacheKey, tuple[Any, datetime, float, int]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._max_bytes > 0
+
+    def get(self, key: CacheKey) -> Optional[tuple[Any, datetime]]:
+        """Return (payload, fetched_at) if present and not expired, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, fetched_at, expires_at, size = entry
+            if time.time() > expires_at:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload, fetched_at
+
+    def set(self, key: CacheKey, payload: Any, fetched_at: datetime, ttl_seconds: int) -> None:
+        """Store payload; it expires ttl_seconds after fetched_at (not after insertion), matching scan_cache TTLs."""
+        if not self.enabled:
+            return
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        expires_at = fetched_at.timestamp() + ttl_seconds
+        if time.time() > expires_at:
+            return
+        size = _approx_size(payload)
+        if size > self._max_bytes:
+            logger.debug("l1 cache skip oversized key=%s bytes=%s", key, size)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+            self._entries[key] = (payload, fetched_at, expires_at, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self._max_entries or self._bytes > self._max_bytes):
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+                logger.debug("l1 cache evicted key=%s", evicted_key)
+
+    def invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Singleton shared by all ScanService instances in this process
+_l1_cache: L1Cache | None = None
+_l1_cache_lock = Lock()
+
+
+def get_l1_cache() -> L1Cache:
+    global _l1_cache
+    with _l1_cache_lock:
+        if _l1_cache is None:
+            settings = get_settings()
+            _l1_cache = L1Cache(settings.l1_cache_max_entries, settings.l1_cache_max_mb * 1024 * 1024)
+            logger.info(
+                "l1 cache created max_entries=%s max_mb=%s",
+                settings.l1_cache_max_entries, settings.l1_cache_max_mb,
+            )
+        return _l1_cache
@@ -0,0 +1,120 @@
+"""In-process negative cache: remembers unresolved ISINs and empty upstream fetches for a short TTL."""
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+NegativeKey = tuple[str, str]  # (kind, identifier): ("isin", isin) or (data_type, symbol)
+
+# How long a miss is remembered, per kind. Much shorter than the positive TTLs in scan.md: a miss may be
+# transient (rate limit, provider outage), but retrying it on every request costs the full adapter chain.
+NEGATIVE_TTL_ISIN = 6 * 3600
+NEGATIVE_TTL_QUOTE = 5 * 60
+NEGATIVE_TTL_SERIES = 3600
+NEGATIVE_TTL_FUNDAMENTALS = 6 * 3600
+NEGATIVE_TTL_NEWS = 30 * 60
+# A miss where an adapter failed (timeout, 429, connection error) rather than answered "no data": long enough to
+# spare the adapter chain during a burst, short enough that an outage does not hide data that exists
+NEGATIVE_TTL_TRANSIENT = 30
+
+
+def negative_ttl_seconds(kind: str) -> int:
+    override = get_settings().negative_cache_ttl_seconds
+    if override > 0:
+        return override
+    return {
+        "isin": NEGATIVE_TTL_ISIN,
+        "quote": NEGATIVE_TTL_QUOTE,
+        "daily": NEGATIVE_TTL_SERIES,
+        "weekly": NEGATIVE_TTL_SERIES,
+        "monthly": NEGATIVE_TTL_SERIES,
+        "fundamentals": NEGATIVE_TTL_FUNDAMENTALS,
+        "news": NEGATIVE_TTL_NEWS,
+    }.get(kind, NEGATIVE_TTL_QUOTE)
+
+
+class NegativeCache:
+    """Thread-safe set of known misses with per-entry expiry; oldest entries are dropped beyond max_entries."""
+
+    def __init__(self, max_entries: int):
+        self._lock = Lock()
+        self._entries: "OrderedDict[NegativeKey, float]" = OrderedDict()  # key -> expires_at (monotonic)
+        self._max_entries = max_entries
+        self.hits = 0
+        self.recorded = 0
+        self.cleared = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def is_negative(self, key: NegativeKey) -> bool:
+        """True if key is a remembered miss that has not expired."""
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return False
+            self.hits += 1
+            return True
+
+    def record(self, key: NegativeKey, ttl_seconds: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        ttl = ttl_seconds if ttl_seconds is not None else negative_ttl_seconds(key[0])
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = time.monotonic() + ttl
+            self.recorded += 1
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        logger.info("negative cache recorded kind=%s id=%s ttl_s=%s", key[0], key[1], ttl)
+
+    def clear(self, key: NegativeKey) -> None:
+        """Forget a miss, e.g. once the identifier has been resolved or fetched successfully."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.cleared += 1
+
+    def reset(self) -> None:
+        """Forget every miss (benchmarks that need a cold start)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            by_kind: dict[str, int] = {}
+            for (kind, _), expires_at in self._entries.items():
+                if expires_at >= now:
+                    by_kind[kind] = by_kind.get(kind, 0) + 1
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "by_kind": by_kind,
+                "hits": self.hits,
+                "recorded": self.recorded,
+                "cleared": self.cleared,
+            }
+
+
+# Singleton shared by all ScanService instances in this process
+_negative_cache: NegativeCache | None = None
+_negative_cache_lock = Lock()
+
+
+def get_negative_cache() -> NegativeCache:
+    global _negative_cache
+    with _negative_cache_lock:
+        if _negative_cache is None:
+            max_entries = get_settings().negative_cache_max_entries
+            _negative_cache = NegativeCache(max_entries)
+            logger.info("negative cache created max_entries=%s", max_entries)
+        return _negative_cache
@@ -0,0 +1,121 @@
+"""Row-wise OHLCV storage in the ohlcv table: incremental upserts and indexed range reads."""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.base import OHLCV
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement when appending bars
+UPSERT_BATCH_SIZE = 1000
+
+
+def _bar_time(time_str: str) -> Optional[datetime]:
+    """YYYY-MM-DD (canonical series time) -> UTC midnight, the ohlcv.time value for a daily bar."""
+    try:
+        return datetime.strptime(str(time_str)[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(val: Any) -> Optional[float]:
+    return float(val) if val is not None else None
+
+
+class OHLCVStore:
+    """Daily bars per symbol. Reads return the canonical series shape from scan.md (sorted ascending by time)."""
+
+    def __init__(self, db: DBSession):
+        self.db = db
+
+    def latest_time(self, symbol: str) -> Optional[str]:
+        """Time (YYYY-MM-DD) of the newest stored bar, or None when the symbol has no rows."""
+        latest = self.db.query(func.max(OHLCV.time)).filter(OHLCV.symbol == symbol).scalar()
+        return latest.strftime("%Y-%m-%d") if latest else None
+
+    def refetch_anchor(self, symbol: str) -> Optional[dict[str, Any]]:
+        """Second-newest stored bar (the newest when only one is stored), or None. It is a completed day, so an
+        incremental fetch from it can check the stored basis (splits, dividends, provider) against the upstream one."""
+        rows = self.db.query(OHLCV).filter(OHLCV.symbol == symbol).order_by(OHLCV.time.desc()).limit(2).all()
+        if not rows:
+            return None
+        r = rows[-1]
+        return {"time": r.time.strftime("%Y-%m-%d"), "close": _to_float(r.close)}
+
+    def read(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> list[dict[str, Any]]:
+        """Bars for symbol with start <= time <= end (YYYY-MM-DD, both optional). Served by ix_ohlcv_symbol_time."""
+        q = self.db.query(OHLCV).filter(OHLCV.symbol == symbol)
+        start_dt = _bar_time(start) if start else None
+        end_dt = _bar_time(end) if end else None
+        if start_dt:
+            q = q.filter(OHLCV.time >= start_dt)
+        if end_dt:
+            q = q.filter(OHLCV.time <= end_dt)
+        return [
+            {
+                "time": r.time.strftime("%Y-%m-%d"),
+                "open": _to_float(r.open),
+                "high": _to_float(r.high),
+                "low": _to_float(r.low),
+                "close": _to_float(r.close),
+                "volume": int(r.volume) if r.volume is not None else None,
+            }
+            for r in q.order_by(OHLCV.time).all()
+        ]
+
+    @staticmethod
+    def _rows(symbol: str, bars: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = []
+        for b in bars:
+            t = _bar_time(b.get("time"))
+            if t is None:
+                continue
+            rows.append({
+                "time": t,
+                "symbol": symbol,
+                "open": b.get("open"),
+                "high": b.get("high"),
+                "low": b.get("low"),
+                "close": b.get("close"),
+                "volume": b.get("volume"),
+            })
+        return rows
+
+    def _upsert(self, rows: list[dict[str, Any]]) -> None:
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = pg_insert(OHLCV).values(rows[i:i + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[OHLCV.time, OHLCV.symbol],
+                set_={c: stmt.excluded[c] for c in ("open", "high", "low", "close", "volume")},
+            )
+            self.db.execute(stmt)
+
+    def append(self, symbol: str, bars: list[dict[str, Any]]) -> int:
+        """Upsert bars (an existing bar for the same day is overwritten, e.g. a revised last bar). Returns rows written."""
+        rows = self._rows(symbol, bars)
+        self._upsert(rows)
+        self.db.commit()
+        logger.debug("ohlcv upsert symbol=%s rows=%s", symbol, len(rows))
+        return len(rows)
+
+    def replace(self, symbol: str, bars: list[dict[str, Any]]) -> int:
+        """Delete symbol's stored bars and write bars in one transaction (full refetch after a basis change)."""
+        rows = self._rows(symbol, bars)
+        self.db.query(OHLCV).filter(OHLCV.symbol == symbol).delete(synchronize_session=False)
+        self._upsert(rows)
+        self.db.commit()
+        logger.info("ohlcv replaced symbol=%s rows=%s", symbol, len(rows))
+        return len(rows)
+
+    def append_many(self, bars_by_symbol: dict[str, list[dict[str, Any]]]) -> int:
+        """append for several symbols in one transaction (bulk loads). Returns rows written."""
+        rows = [r for symbol, bars in bars_by_symbol.items() for r in self._rows(symbol, bars)]
+        self._upsert(rows)
+        self.db.commit()
+        logger.debug("ohlcv upsert symbols=%s rows=%s", len(bars_by_symbol), len(rows))
+        return len(rows)
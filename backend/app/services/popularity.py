@@ -0,0 +1,66 @@
+"""Per-symbol request popularity with exponential decay, used to prioritize cache warm-up."""
+import math
+import time
+from threading import Lock
+from typing import Any
+
+# A request counts half as much after this long
+POPULARITY_HALF_LIFE_SECONDS = 3600
+# Drop symbols whose decayed score falls below this (keeps the table bounded)
+POPULARITY_MIN_SCORE = 0.05
+
+
+class SymbolPopularity:
+    """Thread-safe decayed request counter per symbol."""
+
+    def __init__(self, half_life_seconds: float = POPULARITY_HALF_LIFE_SECONDS):
+        self._lock = Lock()
+        self._decay = math.log(2) / half_life_seconds
+        self._scores: dict[str, tuple[float, float]] = {}  # symbol -> (score, last_update monotonic)
+        self.requests = 0
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * math.exp(-self._decay * (now - updated))
+
+    def record(self, symbol: str) -> None:
+        if not symbol:
+            return
+        now = time.monotonic()
+        with self._lock:
+            score, updated = self._scores.get(symbol, (0.0, now))
+            self._scores[symbol] = (self._decayed(score, updated, now) + 1.0, now)
+            self.requests += 1
+
+    def top(self, n: int) -> list[tuple[str, float]]:
+        """Most requested symbols by decayed score, highest first. Prunes cold symbols."""
+        now = time.monotonic()
+        with self._lock:
+            current = {s: self._decayed(score, updated, now) for s, (score, updated) in self._scores.items()}
+            for s, score in current.items():
+                if score < POPULARITY_MIN_SCORE:
+                    del self._scores[s]
+        ranked = sorted(((s, v) for s, v in current.items() if v >= POPULARITY_MIN_SCORE), key=lambda x: -x[1])
+        return ranked[:n]
+
+    def stats(self, n: int = 20) -> dict[str, Any]:
+        top = self.top(n)
+        with self._lock:
+            tracked = len(self._scores)
+        return {
+            "requests": self.requests,
+            "tracked_symbols": tracked,
+            "top": [{"symbol": s, "score": round(v, 3)} for s, v in top],
+        }
+
+
+# Singleton shared by all ScanService instances in this process
+_popularity: SymbolPopularity | None = None
+_popularity_lock = Lock()
+
+
+def get_popularity() -> SymbolPopularity:
+    global _popularity
+    with _popularity_lock:
+        if _popularity is None:
+            _popularity = SymbolPopularity()
+        return _popularity
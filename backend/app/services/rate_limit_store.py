@@ -0,0 +1,181 @@
+"""Where rate limiter counters live: process memory, a locked local file, or a Postgres row.
+
+The file and Postgres stores let several uvicorn workers and the batch scripts draw from one Alpha Vantage budget.
+Each store hands out the limiter state inside an exclusive transaction; changes made to the dict are saved when
+the block exits without an exception. peek() reads the last saved state without locking or writing, for budget
+checks and diagnostics.
+"""
+import json
+import logging
+import os
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, ContextManager, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+LimiterState = dict[str, Any]  # tokens, refilled_at (Unix time), day (UTC date), daily_count
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class LimiterStore(ABC):
+    backend: str = ""
+
+    @abstractmethod
+    def transaction(self, name: str, initial: LimiterState) -> ContextManager[LimiterState]:
+        """Exclusive access to the named limiter's state (initial when there is none yet)."""
+
+    @abstractmethod
+    def peek(self, name: str, initial: LimiterState) -> LimiterState:
+        """Copy of the named limiter's last saved state (initial when there is none yet); takes no lock."""
+
+
+class MemoryLimiterStore(LimiterStore):
+    """Per-process state (the default): each worker has its own budget."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._lock = Lock()
+        self._states: dict[str, LimiterState] = {}
+
+    @contextmanager
+    def transaction(self, name: str, initial: LimiterState) -> Iterator[LimiterState]:
+        with self._lock:
+            state = dict(self._states.get(name) or initial)
+            yield state
+            self._states[name] = state
+
+    def peek(self, name: str, initial: LimiterState) -> LimiterState:
+        # dict.get and dict() of a state that is only ever replaced whole are safe without the lock
+        return dict(self._states.get(name) or initial)
+
+
+class FileLimiterStore(LimiterStore):
+    """JSON file guarded by an OS file lock: shared by all processes on one host (workers, scripts)."""
+
+    backend = "file"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = Lock()  # the OS lock is per process, so threads queue here first
+
+    def _file(self, name: str) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{name}{self.path.suffix}")
+
+    @contextmanager
+    def transaction(self, name: str, initial: LimiterState) -> Iterator[LimiterState]:
+        path = self._file(name)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path.with_suffix(path.suffix + ".lock"), "a+b") as lock_file:
+                _lock_file(lock_file)
+                try:
+                    try:
+                        state = {**initial, **json.loads(path.read_text(encoding="utf-8"))}
+                    except (FileNotFoundError, ValueError):
+                        state = dict(initial)
+                    yield state
+                    tmp = path.with_suffix(path.suffix + ".tmp")
+                    tmp.write_text(json.dumps(state), encoding="utf-8")
+                    os.replace(tmp, path)
+                finally:
+                    _unlock_file(lock_file)
+
+    def peek(self, name: str, initial: LimiterState) -> LimiterState:
+        # transaction() replaces the file atomically, so a reader never sees a partial write
+        try:
+            return {**initial, **json.loads(self._file(name).read_text(encoding="utf-8"))}
+        except (FileNotFoundError, ValueError):
+            return dict(initial)
+
+
+class PostgresLimiterStore(LimiterStore):
+    """rate_limit_state row per limiter, serialized with a transaction-scoped advisory lock: shared by every
+    process that uses the same database, across hosts."""
+
+    backend = "postgres"
+
+    def __init__(self, engine):
+        self._engine = engine
+
+    @staticmethod
+    def _lock_key(name: str) -> int:
+        return zlib.crc32(f"rate_limit_state:{name}".encode())
+
+    @contextmanager
+    def transaction(self, name: str, initial: LimiterState) -> Iterator[LimiterState]:
+        from app.models.base import RateLimitState
+
+        with self._engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": self._lock_key(name)})
+            row = conn.execute(
+                text("SELECT tokens, refilled_at, day, daily_count FROM rate_limit_state WHERE name = :name"),
+                {"name": name},
+            ).mappings().first()
+            state = dict(row) if row else dict(initial)
+            yield state
+            values = {**state, "name": name, "updated_at": datetime.utcnow()}
+            stmt = pg_insert(RateLimitState).values(values)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=[RateLimitState.name],
+                set_={c: stmt.excluded[c] for c in ("tokens", "refilled_at", "day", "daily_count", "updated_at")},
+            ))
+
+    def peek(self, name: str, initial: LimiterState) -> LimiterState:
+        with self._engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT tokens, refilled_at, day, daily_count FROM rate_limit_state WHERE name = :name"),
+                {"name": name},
+            ).mappings().first()
+        return dict(row) if row else dict(initial)
+
+
+def default_limiter_file() -> Path:
+    return Path(tempfile.gettempdir()) / "analyse_stocks_rate_limit.json"
+
+
+def create_limiter_store() -> LimiterStore:
+    """Store named by RATE_LIMIT_BACKEND (memory | file | postgres)."""
+    settings = get_settings()
+    backend = settings.rate_limit_backend
+    if backend == "file":
+        store: LimiterStore = FileLimiterStore(Path(settings.rate_limit_file) if settings.rate_limit_file else default_limiter_file())
+    elif backend == "postgres":
+        from app.db.session import engine
+
+        store = PostgresLimiterStore(engine)
+    else:
+        if backend != "memory":
+            logger.warning("unknown RATE_LIMIT_BACKEND=%s, using memory", backend)
+        store = MemoryLimiterStore()
+    logger.info("rate limit store backend=%s", store.backend)
+    return store
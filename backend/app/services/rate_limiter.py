@@ -1,50 +1,193 @@
-"""Alpha Vantage rate limiter: 5/min, 25/day. Fallback to Yahoo when capped."""
+"""Alpha Vantage rate limiter: 5/min, 25/day. Fallback to Yahoo when capped.
+
+Token bucket: a caller reserves a slot in a short store transaction (that is only arithmetic) and then waits for it
+outside it. Checks such as can_call, remaining_today and stats only read the store (LimiterStore.peek), so they
+never take its lock or write. The bucket and the daily count live in a LimiterStore (RATE_LIMIT_BACKEND), so
+workers and batch jobs can share one budget.
+"""
+import asyncio
+import logging
 import time
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import datetime
 from threading import Lock
+from typing import Any, Iterator, Optional
+
+from app.services.rate_limit_store import LimiterState, LimiterStore, MemoryLimiterStore, create_limiter_store
+
+logger = logging.getLogger(__name__)
 
 # Free tier: 25 requests per day, 5 per minute
 MIN_INTERVAL_SECONDS = 12  # ~5 per minute
 DAILY_LIMIT = 25
+# Calls that may go out back to back before spacing applies (1 = strict 12 s spacing)
+BURST = 1
+
+
+def _today() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d")
 
 
 class AlphaVantageRateLimiter:
-    def __init__(self):
-        self._lock = Lock()
-        self._last_call_time: float = 0.0
-        self._daily_count = 0
-        self._daily_reset_date: str = datetime.utcnow().strftime("%Y-%m-%d")
-
-    def _maybe_reset_daily(self) -> None:
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        if today != self._daily_reset_date:
-            self._daily_reset_date = today
-            self._daily_count = 0
+    def __init__(
+        self,
+        interval_seconds: float = MIN_INTERVAL_SECONDS,
+        burst: int = BURST,
+        daily_limit: int = DAILY_LIMIT,
+        store: Optional[LimiterStore] = None,
+        name: str = "alpha_vantage",
+    ):
+        self._lock = Lock()  # local counters only; the bucket and daily count live in the store
+        self._store = store or MemoryLimiterStore()
+        self._name = name
+        self._rate = 1.0 / interval_seconds  # tokens per second
+        self._capacity = float(burst)
+        self._daily_limit = daily_limit
+        self.granted = 0
+        self.rejected = 0
+        self.store_errors = 0
+        self.waited_seconds = 0.0
+
+    @property
+    def daily_limit(self) -> int:
+        return self._daily_limit
+
+    def _initial_state(self) -> LimiterState:
+        # tokens goes negative while slots are reserved ahead of time; refilled_at is wall-clock time so that
+        # processes sharing the store agree on it
+        return {"tokens": self._capacity, "refilled_at": time.time(), "day": _today(), "daily_count": 0}
+
+    def _advance(self, state: LimiterState) -> LimiterState:
+        """Roll the day over and refill tokens up to now (in place)."""
+        today = _today()
+        if state["day"] != today:
+            state["day"] = today
+            state["daily_count"] = 0
+        now = time.time()
+        elapsed = max(0.0, now - state["refilled_at"])
+        state["tokens"] = min(self._capacity, state["tokens"] + elapsed * self._rate)
+        state["refilled_at"] = now
+        return state
+
+    @contextmanager
+    def _state(self) -> Iterator[LimiterState]:
+        """Shared state, advanced to now, for a change that is saved when the block exits."""
+        with self._store.transaction(self._name, self._initial_state()) as state:
+            yield self._advance(state)
+
+    def _peek(self) -> Optional[LimiterState]:
+        """Shared state advanced to now without locking or saving it; None when the store fails."""
+        try:
+            return self._advance(self._store.peek(self._name, self._initial_state()))
+        except Exception:
+            self._store_failed()
+            return None
+
+    def _store_failed(self) -> None:
+        with self._lock:
+            self.store_errors += 1
+        logger.exception("rate limit store backend=%s failed; treating the budget as used up", self._store.backend)
+
+    def _reserve(self, max_wait: Optional[float], enforce_daily: bool = True) -> Optional[float]:
+        """Take the next slot and return how long to wait for it, or None (no slot taken) when the daily budget
+        is used up or the wait would exceed max_wait. A failing store also yields None: better to fall back to
+        another adapter than to overrun a budget other workers may be using."""
+        try:
+            with self._state() as state:
+                wait = None
+                if not enforce_daily or state["daily_count"] < self._daily_limit:
+                    wait = max(0.0, (1.0 - state["tokens"]) / self._rate)
+                    if max_wait is not None and wait > max_wait:
+                        wait = None
+                    else:
+                        state["tokens"] -= 1.0
+                        state["daily_count"] += 1
+        except Exception:
+            self._store_failed()
+            wait = None
+        with self._lock:
+            if wait is None:
+                self.rejected += 1
+            else:
+                self.granted += 1
+                self.waited_seconds += wait
+        return wait
+
+    def _daily_count(self) -> Optional[int]:
+        state = self._peek()
+        return None if state is None else state["daily_count"]
 
     def can_call(self) -> bool:
         """Return True if we can make an Alpha Vantage call (under daily limit)."""
-        with self._lock:
-            self._maybe_reset_daily()
-            return self._daily_count < DAILY_LIMIT
+        used = self._daily_count()
+        return used is not None and used < self._daily_limit
+
+    def remaining_today(self) -> int:
+        """Alpha Vantage calls left in today's budget."""
+        used = self._daily_count()
+        return 0 if used is None else max(0, self._daily_limit - used)
+
+    def acquire(self) -> bool:
+        """Wait for the next slot. False (without waiting) when today's budget is used up."""
+        return self.try_acquire(timeout=None)
+
+    def try_acquire(self, timeout: Optional[float] = 0.0) -> bool:
+        """Take a slot if one is free within timeout seconds (None = wait as long as needed) and wait for it.
+        False immediately when it is not, so the caller can fall back to another adapter."""
+        wait = self._reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            logger.debug("Alpha Vantage slot reserved wait_s=%.1f", wait)
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """try_acquire for coroutines: the reservation (a store transaction, possibly a file lock or a database
+        round trip) runs in a worker thread and the wait is asyncio.sleep, so the event loop keeps running."""
+        wait = await asyncio.to_thread(self._reserve, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
 
     def record_call(self) -> None:
-        """Record that we made a call; enforce min interval."""
+        """Record that we made a call; enforce min interval. Counts against the daily budget even past the limit."""
+        wait = self._reserve(None, enforce_daily=False)
+        if wait:
+            time.sleep(wait)
+
+    def stats(self) -> dict[str, Any]:
+        """Shared budget (as seen by the store) plus this process's own counters."""
+        shared: dict[str, Any] = {"used_today": None, "remaining_today": None, "next_slot_in_seconds": None}
+        state = self._peek()
+        if state is not None:
+            shared = {
+                "used_today": state["daily_count"],
+                "remaining_today": max(0, self._daily_limit - state["daily_count"]),
+                "next_slot_in_seconds": round(max(0.0, (1.0 - state["tokens"]) / self._rate), 1),
+            }
         with self._lock:
-            self._maybe_reset_daily()
-            now = time.monotonic()
-            elapsed = now - self._last_call_time
-            if elapsed < MIN_INTERVAL_SECONDS:
-                time.sleep(MIN_INTERVAL_SECONDS - elapsed)
-            self._last_call_time = time.monotonic()
-            self._daily_count += 1
+            return {
+                "backend": self._store.backend,
+                "daily_limit": self._daily_limit,
+                **shared,
+                "granted": self.granted,
+                "rejected": self.rejected,
+                "store_errors": self.store_errors,
+                "waited_seconds": round(self.waited_seconds, 1),
+            }
 
 
 # Singleton for use by scan service and Alpha Vantage adapter
 _limiter: AlphaVantageRateLimiter | None = None
+_limiter_lock = Lock()
 
 
 def get_alpha_vantage_limiter() -> AlphaVantageRateLimiter:
     global _limiter
-    if _limiter is None:
-        _limiter = AlphaVantageRateLimiter()
-    return _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AlphaVantageRateLimiter(store=create_limiter_store())
+        return _limiter
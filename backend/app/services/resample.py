@@ -0,0 +1,72 @@
+"""Resample daily OHLCV bars to weekly or monthly bars locally (vectorized with NumPy)."""
+import logging
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RESAMPLED_DATA_TYPES = ("weekly", "monthly")
+
+
+def _column(rows: list[dict[str, Any]], name: str) -> np.ndarray:
+    return np.array([np.nan if r.get(name) is None else float(r[name]) for r in rows], dtype=float)
+
+
+def _period_keys(dates: np.ndarray, data_type: str) -> np.ndarray:
+    days = dates.astype(np.int64)
+    if data_type == "weekly":
+        # Monday-based weeks: 1970-01-01 (day 0) was a Thursday
+        return (days + 3) // 7
+    return dates.astype("datetime64[M]").astype(np.int64)
+
+
+def _nullable(values: np.ndarray) -> list[Optional[float]]:
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def resample_ohlcv(series: list[dict[str, Any]], data_type: str) -> list[dict[str, Any]]:
+    """
+    Aggregate daily bars (sorted ascending) into weekly (Mon–Sun) or monthly bars.
+    open = first available open, high = max, low = min, close = last available close, volume = sum.
+    Each bar is labelled with the last trading day in its period (Alpha Vantage convention); the current
+    period is included as a partial bar.
+    """
+    if data_type not in RESAMPLED_DATA_TYPES:
+        raise ValueError(f"cannot resample to {data_type!r}")
+    rows = [r for r in series if r.get("time")]
+    if not rows:
+        return []
+    dates = np.array([str(r["time"])[:10] for r in rows], dtype="datetime64[D]")
+    keys = _period_keys(dates, data_type)
+    n = len(rows)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    positions = np.arange(n)
+
+    opens = _column(rows, "open")
+    closes = _column(rows, "close")
+    highs = _column(rows, "high")
+    lows = _column(rows, "low")
+    volumes = _column(rows, "volume")
+
+    # First valid open / last valid close per period (NaN-aware)
+    first_open = np.minimum.reduceat(np.where(np.isnan(opens), n, positions), starts)
+    last_close = np.maximum.reduceat(np.where(np.isnan(closes), -1, positions), starts)
+    open_ = np.where(first_open <= ends, opens[np.minimum(first_open, n - 1)], np.nan)
+    close = np.where(last_close >= starts, closes[np.maximum(last_close, 0)], np.nan)
+    high = np.fmax.reduceat(highs, starts)
+    low = np.fmin.reduceat(lows, starts)
+    volume_valid = np.add.reduceat((~np.isnan(volumes)).astype(np.int64), starts)
+    volume = np.add.reduceat(np.nan_to_num(volumes, nan=0.0), starts)
+
+    times = dates[ends].astype(str).tolist()
+    out = [
+        {"time": t, "open": o, "high": h, "low": lo, "close": c, "volume": int(v) if cnt else None}
+        for t, o, h, lo, c, v, cnt in zip(
+            times, _nullable(open_), _nullable(high), _nullable(low), _nullable(close),
+            volume.tolist(), volume_valid.tolist(),
+        )
+    ]
+    logger.debug("resampled daily=%s -> %s=%s", n, data_type, len(out))
+    return out
@@ -0,0 +1,261 @@
+"""Streaming regression and volatility of daily closes: O(1) per appended bar.
+
+RollingRegression keeps running sums (n, Σx, Σx², Σy, Σxy, Σy²) over the last `window` closes, adding the new bar
+and dropping the oldest. It reports the OLS slope, the trend level at the last bar and the sample std of the
+closes. Closes are shifted by the first close seen (less cancellation in Σy² - (Σy)²/n), and the sums are rebuilt
+from the window every `window` appends (amortized O(1)) so add/subtract rounding does not drift.
+
+StreamingStats holds one RollingRegression per window (20/60/252 days plus the full history). rolling_stats()
+keeps one per symbol and only feeds it the bars that are new since the last call, so a daily refresh costs
+O(new bars) instead of a refit over the whole history. The global fit in compute_forecast is unchanged.
+"""
+import logging
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows in trading days (~1 month, ~1 quarter, ~1 year)
+ROLLING_WINDOWS = (20, 60, 252)
+# Sums are rebuilt from the window at least this often when there is no window (full history)
+FULL_RESUM_EVERY = 4096
+
+
+class RollingRegression:
+    """OLS of close on bar index and sample std of the last `window` closes (window=None: all of them)."""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self._values: deque[float] = deque()
+        self._shift: Optional[float] = None
+        self._first_x = 0  # bar index of the oldest value in the window
+        self._since_resum = 0
+        self._n = 0
+        self._sx = self._sxx = self._sy = self._sxy = self._syy = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._n
+
+    def append(self, close: float) -> None:
+        if self._shift is None:
+            self._shift = close
+        y = close - self._shift
+        x = float(self._first_x + self._n)
+        self._values.append(y)
+        self._n += 1
+        self._sx += x
+        self._sxx += x * x
+        self._sy += y
+        self._sxy += x * y
+        self._syy += y * y
+        if self.window is not None and self._n > self.window:
+            old_x = float(self._first_x)
+            old_y = self._values.popleft()
+            self._n -= 1
+            self._first_x += 1
+            self._sx -= old_x
+            self._sxx -= old_x * old_x
+            self._sy -= old_y
+            self._sxy -= old_x * old_y
+            self._syy -= old_y * old_y
+        self._since_resum += 1
+        if self._since_resum >= (self.window or FULL_RESUM_EVERY):
+            self._resum()
+
+    def extend(self, closes: Iterable[float]) -> None:
+        for close in closes:
+            self.append(close)
+
+    def _resum(self) -> None:
+        xs = range(self._first_x, self._first_x + self._n)
+        self._sx = float(sum(xs))
+        self._sxx = float(sum(x * x for x in xs))
+        self._sy = sum(self._values)
+        self._sxy = sum(x * y for x, y in zip(xs, self._values))
+        self._syy = sum(y * y for y in self._values)
+        self._since_resum = 0
+
+    def slope(self) -> float:
+        """Trend per bar (price units)."""
+        n = self._n
+        denom = n * self._sxx - self._sx * self._sx
+        if n < 2 or abs(denom) < 1e-20:
+            return 0.0
+        return (n * self._sxy - self._sx * self._sy) / denom
+
+    def level(self) -> Optional[float]:
+        """Trend value at the last bar."""
+        if not self._n:
+            return None
+        slope = self.slope()
+        last_x = self._first_x + self._n - 1
+        mean_x = self._sx / self._n
+        return self._shift + self._sy / self._n + slope * (last_x - mean_x)
+
+    def std(self) -> float:
+        """Sample standard deviation of the closes (Bessel correction)."""
+        n = self._n
+        if n < 2:
+            return 0.0
+        variance = (self._syy - self._sy * self._sy / n) / (n - 1)
+        return max(variance, 0.0) ** 0.5
+
+    def stats(self) -> dict[str, Any]:
+        level = self.level()
+        return {
+            "bars": self._n,
+            "slope": round(self.slope(), 6),
+            "level": round(level, 4) if level is not None else None,
+            "std": round(self.std(), 4),
+        }
+
+
+class StreamingStats:
+    """RollingRegression per window in ROLLING_WINDOWS plus the full history, fed bar by bar."""
+
+    def __init__(self, windows: Iterable[int] = ROLLING_WINDOWS):
+        self.windows = tuple(windows)
+        self._full = RollingRegression()
+        self._rolling = {w: RollingRegression(w) for w in self.windows}
+        self.last_time: Optional[str] = None
+        self.last_close: Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        return self._full.count
+
+    def append(self, time: str, close: float) -> None:
+        self._full.append(close)
+        for reg in self._rolling.values():
+            reg.append(close)
+        self.last_time = time
+        self.last_close = close
+
+    def stats(self) -> dict[str, Any]:
+        """{"full": {...}, "20": {...}, ...}; a window is left out until it has filled."""
+        out = {"full": self._full.stats(), "last_date": self.last_time}
+        for w, reg in self._rolling.items():
+            if reg.count >= w:
+                out[str(w)] = reg.stats()
+        return out
+
+
+def _bars(series: list[dict[str, Any]]) -> list[tuple[str, float]]:
+    """(time YYYY-MM-DD, close) of the bars that have both, as compute_forecast reads them."""
+    bars = []
+    for p in series:
+        t = p.get("time")
+        c = p.get("close")
+        if t is None or c is None:
+            continue
+        try:
+            bars.append((str(t)[:10], float(c)))
+        except (TypeError, ValueError):
+            continue
+    return bars
+
+
+def _compute(bars: list[tuple[str, float]]) -> dict[str, Any]:
+    engine = StreamingStats()
+    for t, c in bars:
+        engine.append(t, c)
+    return engine.stats()
+
+
+class RollingStatsRegistry:
+    """StreamingStats per symbol (LRU-bounded). A series that extends the one seen last time only appends the
+    new bars; anything else (different start, revised last bar, gaps) rebuilds that symbol's stats."""
+
+    def __init__(self, max_symbols: int):
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, tuple[StreamingStats, Lock]]" = OrderedDict()
+        self._max_symbols = max_symbols
+        self.appended_bars = 0
+        self.rebuilds = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_symbols > 0
+
+    def _entry(self, symbol: str) -> tuple[StreamingStats, Lock]:
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                entry = (StreamingStats(), Lock())
+                self._entries[symbol] = entry
+                while len(self._entries) > self._max_symbols:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            self._entries.move_to_end(symbol)
+            return entry
+
+    def update(self, symbol: str, series: list[dict[str, Any]]) -> dict[str, Any]:
+        bars = _bars(series)
+        if not self.enabled:
+            return _compute(bars)
+        engine, engine_lock = self._entry(symbol)
+        with engine_lock:
+            new = self._new_bars(engine, bars)
+            if new is None:
+                engine = StreamingStats()
+                new = bars
+                with self._lock:
+                    self.rebuilds += 1
+                    if symbol in self._entries:
+                        self._entries[symbol] = (engine, engine_lock)
+                logger.debug("rolling stats rebuilt symbol=%s bars=%s", symbol, len(bars))
+            for t, c in new:
+                engine.append(t, c)
+            with self._lock:
+                self.appended_bars += len(new)
+            return engine.stats()
+
+    @staticmethod
+    def _new_bars(engine: StreamingStats, bars: list[tuple[str, float]]) -> Optional[list[tuple[str, float]]]:
+        """Bars after engine.last_time if bars continue what the engine has seen, else None (rebuild)."""
+        if engine.last_time is None:
+            return None if engine.count else bars
+        i = len(bars) - 1
+        while i >= 0 and bars[i][0] > engine.last_time:
+            i -= 1
+        if i < 0 or bars[i] != (engine.last_time, engine.last_close) or i + 1 != engine.count:
+            return None
+        return bars[i + 1:]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "symbols": len(self._entries),
+                "max_symbols": self._max_symbols,
+                "appended_bars": self.appended_bars,
+                "rebuilds": self.rebuilds,
+                "evictions": self.evictions,
+            }
+
+
+# Singleton shared by the series and advice routes in this process
+_registry: RollingStatsRegistry | None = None
+_registry_lock = Lock()
+
+
+def get_rolling_stats_registry() -> RollingStatsRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            # Same bound as the forecast cache: one entry per charted symbol
+            _registry = RollingStatsRegistry(get_settings().forecast_cache_max_entries)
+        return _registry
+
+
+def rolling_stats(symbol: Optional[str], series: list[dict[str, Any]]) -> dict[str, Any]:
+    """Full-history and rolling-window (ROLLING_WINDOWS) slope, trend level and std of the daily closes in series
+    (sorted by time ascending). With a symbol, only the bars new since the last call for it are processed; callers
+    that pass differently sliced series for one symbol use one key per slice (e.g. the series route's date range)."""
+    if not symbol:
+        return _compute(_bars(series))
+    return get_rolling_stats_registry().update(symbol, series)
@@ -1,18 +1,31 @@
 """Scan service: resolve ISIN -> symbol; fetch/cache quote, series, fundamentals, news per scan.md."""
+import asyncio
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Optional
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional
 
 from sqlalchemy.orm import Session as DBSession
 
 logger = logging.getLogger(__name__)
 
-from app.adapters.alpha_vantage import AlphaVantageAdapter
-from app.adapters.base import DataSourceAdapter
-from app.adapters.yahoo import YahooFinanceAdapter
+from app.adapters.base import AsyncDataSourceAdapter, DataSourceAdapter, UpstreamUnavailable
+from app.adapters.factory import create_adapters, create_async_adapters
 from app.config import get_settings
+from app.db.session import SessionLocal
 from app.models.base import OHLCV, ScanCache, Stock, SymbolResolution
+from app.services.adapter_router import get_adapter_router
+from app.services.fetch_planner import get_fetch_planner
+from app.services.hedging import get_hedger
+from app.services.l1_cache import get_l1_cache
+from app.services.negative_cache import NEGATIVE_TTL_TRANSIENT, get_negative_cache
+from app.services.ohlcv_store import OHLCVStore
+from app.services.popularity import get_popularity
+from app.services.resample import RESAMPLED_DATA_TYPES, resample_ohlcv
+from app.services.single_flight import get_single_flight
 
 
 def _mock_quote(symbol: str = "MOCK") -> dict:
@@ -67,6 +80,100 @@ TTL_ISIN = 30 * 24 * 3600
 
 DATA_TYPES = ["quote", "daily", "weekly", "monthly", "fundamentals", "news"]
 
+# Stale-while-revalidate (SCAN_SWR_ENABLED): how long past TTL a stale row is served while a background
+# refresh runs, and the hard age after which a synchronous fetch is forced. Overridable via env for all types.
+SWR_GRACE_QUOTE = 45 * 60
+SWR_GRACE_SERIES = 7 * 24 * 3600
+SWR_GRACE_FUNDAMENTALS = 7 * 24 * 3600
+SWR_GRACE_NEWS = 6 * 3600
+SWR_MAX_STALENESS_QUOTE = 3600
+SWR_MAX_STALENESS_SERIES = 14 * 24 * 3600
+SWR_MAX_STALENESS_FUNDAMENTALS = 30 * 24 * 3600
+SWR_MAX_STALENESS_NEWS = 24 * 3600
+
+# Daily bars live row-wise in the ohlcv table; scan_cache keeps a small marker row (fetched_at drives the TTL)
+OHLCV_STORAGE = "ohlcv"
+# Relative close difference on the refetched anchor bar that means the stored daily bars are on another basis
+# (a split/dividend adjustment since they were stored, or a different provider)
+BASIS_TOLERANCE = 1e-4
+# Decimals of the stored ohlcv prices (Numeric(20, 4)). The fetched close is rounded the same way before the
+# comparison, and a difference must be at least one tick: below ~$1 the relative tolerance is under a tick,
+# and storage rounding alone would count as a basis change on every refresh.
+CLOSE_DECIMALS = 4
+# L1 interval tag for the materialized daily series read from ohlcv
+OHLCV_ROWS_INTERVAL = "rows"
+
+# Scan steps after symbol resolution: (data_type, progress step name, failure message)
+SCAN_STEPS = [
+    ("quote", "Fetching price data", "Quote fetch failed"),
+    ("daily", "Fetching daily series", "Daily series fetch failed"),
+    ("fundamentals", "Fetching fundamentals", "Fundamentals fetch failed"),
+    ("news", "Fetching news", "News fetch failed"),
+]
+SCAN_TIMEOUT_MESSAGE = "Timed out (request deadline)"
+
+# Shared, bounded pool for concurrent scans: SCAN_MAX_WORKERS per scan times SCAN_CONCURRENCY scans, so parallel
+# requests (and workers still finishing after a scan timeout) do not queue every scan behind one small pool
+_scan_executor: Optional[ThreadPoolExecutor] = None
+_scan_executor_lock = Lock()
+
+
+def _get_scan_executor() -> ThreadPoolExecutor:
+    global _scan_executor
+    with _scan_executor_lock:
+        if _scan_executor is None:
+            settings = get_settings()
+            workers = settings.scan_max_workers * settings.scan_concurrency
+            _scan_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan")
+            logger.info(
+                "scan worker pool created max_workers=%s (per scan=%s, concurrency=%s)",
+                workers, settings.scan_max_workers, settings.scan_concurrency,
+            )
+        return _scan_executor
+
+
+# dev_mode and stale-while-revalidate flags for the warm cache path, read once like the pool above: building
+# Settings costs milliseconds, more than an L1 hit
+_scan_flags: Optional[tuple[bool, bool]] = None
+_scan_flags_lock = Lock()
+
+
+def _get_scan_flags() -> tuple[bool, bool]:
+    """(dev_mode, swr_enabled)."""
+    global _scan_flags
+    with _scan_flags_lock:
+        if _scan_flags is None:
+            settings = get_settings()
+            _scan_flags = (settings.dev_mode, settings.scan_swr_enabled and not settings.dev_mode)
+        return _scan_flags
+
+
+def _isin_l1_key(isin: str) -> tuple[str, str, str]:
+    """L1 key of an ISIN -> symbol resolution (scan_cache keys are (symbol, data_type, interval))."""
+    return (isin, "isin", "")
+
+
+def _flight_key(symbol: str, data_type: str, since: Optional[str] = None) -> tuple[str, str, str]:
+    """Single-flight key of a fetch. An incremental fetch (since) and a full one are different calls: a full
+    refetch that joined an incremental flight would get only the newest bars back and replace history with them."""
+    return (symbol, data_type, since or "full")
+
+
+def _basis_changed(anchor: dict, bars: list[dict]) -> bool:
+    """True when the fetched bar for the anchor's day, rounded like the stored one, has a close that differs from
+    it by more than BASIS_TOLERANCE (relative) and by at least one CLOSE_DECIMALS tick. A fetch without that day
+    cannot be checked and counts as unchanged."""
+    stored = anchor.get("close")
+    for b in bars:
+        if str(b.get("time"))[:10] == anchor["time"]:
+            fetched = b.get("close")
+            if stored is None or fetched is None:
+                return False
+            tick = 10.0 ** -CLOSE_DECIMALS
+            diff = abs(round(float(fetched), CLOSE_DECIMALS) - stored)
+            return diff > max(BASIS_TOLERANCE * abs(stored), tick / 2)
+    return False
+
 
 def _ttl_seconds(data_type: str) -> int:
     return {
@@ -79,6 +186,40 @@ def _ttl_seconds(data_type: str) -> int:
     }.get(data_type, TTL_DAILY)
 
 
+def _swr_grace_seconds(data_type: str) -> int:
+    override = get_settings().scan_swr_grace_seconds
+    if override > 0:
+        return override
+    return {
+        "quote": SWR_GRACE_QUOTE,
+        "fundamentals": SWR_GRACE_FUNDAMENTALS,
+        "news": SWR_GRACE_NEWS,
+    }.get(data_type, SWR_GRACE_SERIES)
+
+
+def _swr_max_staleness_seconds(data_type: str) -> int:
+    override = get_settings().scan_swr_max_staleness_seconds
+    if override > 0:
+        return override
+    return {
+        "quote": SWR_MAX_STALENESS_QUOTE,
+        "fundamentals": SWR_MAX_STALENESS_FUNDAMENTALS,
+        "news": SWR_MAX_STALENESS_NEWS,
+    }.get(data_type, SWR_MAX_STALENESS_SERIES)
+
+
+def _swr_serve_window_seconds(data_type: str) -> int:
+    """Max age at which a row may still be served (stale) under stale-while-revalidate."""
+    ttl = _ttl_seconds(data_type)
+    return max(ttl, min(ttl + _swr_grace_seconds(data_type), _swr_max_staleness_seconds(data_type)))
+
+
+# Background refreshes for stale rows: small dedicated pool so they never starve interactive scans
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_pending: set[tuple[str, str]] = set()
+_refresh_lock = Lock()
+
+
 def _now() -> datetime:
     """UTC now, timezone-aware so it can be compared with DB timestamps (TIMESTAMPTZ)."""
     return datetime.now(timezone.utc)
@@ -104,58 +245,170 @@ def _name_search_variants(name: str) -> list[str]:
     return variants
 
 
+def adapter_source(adapter: DataSourceAdapter) -> str:
+    """Provider name stored in symbol_resolution.source (wrappers can set source_name to report the wrapped adapter)."""
+    return getattr(adapter, "source_name", None) or getattr(adapter.__class__, "__name__", None) or "unknown"
+
+
+def _routed(planned: list[Any], data_type: str, errors: Optional[list[BaseException]]) -> list[Any]:
+    """AdapterRouter.order of the planned adapters. An adapter left out for an open breaker has not answered, so
+    that is noted in errors: an empty result then is not a genuine miss."""
+    adapters = get_adapter_router().order(planned, data_type)
+    if errors is not None and len(adapters) < len(planned):
+        errors.append(UpstreamUnavailable(f"{len(planned) - len(adapters)} adapter(s) skipped, breaker open"))
+    return adapters
+
+
+def _search(method: Callable[[str], Any], query: str, errors: Optional[list[BaseException]]) -> Any:
+    """method(query); an UpstreamUnavailable is logged and appended to errors instead of ending the resolution.
+    Anything else (e.g. the bulk resolver's BudgetExhausted) propagates to the caller."""
+    try:
+        return method(query)
+    except UpstreamUnavailable as e:
+        logger.debug("resolve search failed query=%s: %s", query, e)
+        if errors is not None:
+            errors.append(e)
+        return None
+
+
+async def _search_async(method: Callable[[str], Awaitable[Any]], query: str, errors: Optional[list[BaseException]]) -> Any:
+    try:
+        return await method(query)
+    except UpstreamUnavailable as e:
+        logger.debug("resolve search failed query=%s: %s", query, e)
+        if errors is not None:
+            errors.append(e)
+        return None
+
+
+def resolve_with_adapters(
+    adapters: list[DataSourceAdapter],
+    isin: str,
+    name_loader: Callable[[], Optional[str]],
+    errors: Optional[list[BaseException]] = None,
+) -> Optional[tuple[dict, DataSourceAdapter]]:
+    """Try adapters by ISIN, then by stock name variants (name loaded lazily). Returns (result, adapter) or None.
+    Failed searches are skipped and appended to errors."""
+    for adapter in adapters:
+        if hasattr(adapter, "resolve_isin") and adapter.resolve_isin:
+            result = _search(adapter.resolve_isin, isin, errors)
+            if result and result.get("symbol"):
+                logger.info("resolve_isin resolved by ISIN isin=%s symbol=%s", isin, result["symbol"])
+                return result, adapter
+    # Fallback: resolve by stock name (try full name and shorter variants)
+    stock_name = name_loader()
+    if stock_name:
+        name_variants = _name_search_variants(stock_name)
+        for adapter in adapters:
+            if not hasattr(adapter, "resolve_by_name") or not adapter.resolve_by_name:
+                continue
+            for name in name_variants:
+                result = _search(adapter.resolve_by_name, name, errors)
+                if result and result.get("symbol"):
+                    logger.info("resolve_isin resolved by name isin=%s name=%s symbol=%s", isin, name, result["symbol"])
+                    return result, adapter
+    return None
+
+
+async def resolve_with_adapters_async(
+    adapters: list[AsyncDataSourceAdapter],
+    isin: str,
+    name_loader: Callable[[], Awaitable[Optional[str]]],
+    errors: Optional[list[BaseException]] = None,
+) -> Optional[tuple[dict, AsyncDataSourceAdapter]]:
+    """Async resolve_with_adapters: same order (ISIN search, then name variants)."""
+    for adapter in adapters:
+        result = await _search_async(adapter.resolve_isin, isin, errors)
+        if result and result.get("symbol"):
+            logger.info("resolve_isin resolved by ISIN isin=%s symbol=%s", isin, result["symbol"])
+            return result, adapter
+    stock_name = await name_loader()
+    if stock_name:
+        name_variants = _name_search_variants(stock_name)
+        for adapter in adapters:
+            for name in name_variants:
+                result = await _search_async(adapter.resolve_by_name, name, errors)
+                if result and result.get("symbol"):
+                    logger.info("resolve_isin resolved by name isin=%s name=%s symbol=%s", isin, name, result["symbol"])
+                    return result, adapter
+    return None
+
+
 class ScanService:
-    def __init__(self, db: DBSession):
+    def __init__(
+        self,
+        db: DBSession,
+        adapters: Optional[list[DataSourceAdapter]] = None,
+        async_adapters: Optional[list[AsyncDataSourceAdapter]] = None,
+    ):
         self.db = db
-        self._adapters: list[DataSourceAdapter] = [
-            AlphaVantageAdapter(),
-            YahooFinanceAdapter(),
-        ]
+        # Live adapters by default; recorded or replayed ones per DATA_SOURCE_MODE (adapters/factory.py)
+        self._adapters: list[DataSourceAdapter] = adapters if adapters is not None else create_adapters()
+        # Used by scan_async / resolve_isin_async only
+        self._async_adapters: list[AsyncDataSourceAdapter] = (
+            async_adapters if async_adapters is not None else create_async_adapters()
+        )
+        # Data types served from stale cache during this service's lifetime (one request)
+        self.stale_data_types: set[str] = set()
+        self._dev_mode, self._swr = _get_scan_flags()
 
     def resolve_isin(self, isin: str) -> Optional[str]:
         """Resolve ISIN to symbol. Uses DB cache, then adapters (ISIN search, then name fallback). Returns symbol or None."""
+        answered, symbol = self._resolve_isin_cached(isin)
+        if answered:
+            return symbol
+        adapters = get_fetch_planner().plan(self._adapters, "resolve")
+        errors: list[BaseException] = []
+        resolved = resolve_with_adapters(adapters, isin, lambda: self._stock_name(isin), errors)
+        return self._finish_resolution(isin, resolved, bool(errors))
+
+    def _resolve_isin_cached(self, isin: str) -> tuple[bool, Optional[str]]:
+        """(answered, symbol) from L1, symbol_resolution, the dev-mode mock or the negative cache.
+        answered=False means the adapters have to be asked."""
+        l1 = get_l1_cache()
+        hit = l1.get(_isin_l1_key(isin))
+        if hit is not None:
+            logger.debug("resolve_isin l1 hit isin=%s symbol=%s", isin, hit[0])
+            return True, hit[0]
         # In dev_mode still use DB first so that previously fetched data is shown from local DB
         row = self.db.query(SymbolResolution).filter(SymbolResolution.isin == isin).first()
         if row:
-            if get_settings().dev_mode:
+            if self._dev_mode:
                 logger.debug("dev_mode: resolve_isin from DB isin=%s symbol=%s", isin, row.symbol)
-                return row.symbol
+                return True, row.symbol
             cutoff = _now() - timedelta(seconds=TTL_ISIN)
             if row.updated_at and row.updated_at >= cutoff:
                 logger.info("resolve_isin cache hit isin=%s symbol=%s", isin, row.symbol)
-                return row.symbol
-        elif get_settings().dev_mode:
+                l1.set(_isin_l1_key(isin), row.symbol, row.updated_at, TTL_ISIN)
+                return True, row.symbol
+        elif self._dev_mode:
             mock_symbol = "MOCK" if len(isin) > 6 or " " in isin else (isin[:4].upper() if isin else "MOCK")
             logger.info("dev_mode: resolve_isin mock symbol=%s (no DB resolution)", mock_symbol)
-            return mock_symbol
+            return True, mock_symbol
+        if get_negative_cache().is_negative(("isin", isin)):
+            logger.debug("resolve_isin negative cache hit isin=%s", isin)
+            return True, None
         logger.debug("resolve_isin cache miss or expired isin=%s", isin)
-        # Try adapters: first by ISIN
-        for adapter in self._adapters:
-            if hasattr(adapter, "resolve_isin") and adapter.resolve_isin:
-                result = adapter.resolve_isin(isin)
-                if result and result.get("symbol"):
-                    logger.info("resolve_isin resolved by ISIN isin=%s symbol=%s", isin, result["symbol"])
-                    return self._persist_resolution(isin, result, adapter)
-        # Fallback: resolve by stock name from DB (try full name and shorter variants)
-        stock = self.db.query(Stock).filter(Stock.isin == isin).first()
-        if stock and stock.name:
-            name_variants = _name_search_variants(stock.name)
-            for adapter in self._adapters:
-                if not hasattr(adapter, "resolve_by_name") or not adapter.resolve_by_name:
-                    continue
-                for name in name_variants:
-                    result = adapter.resolve_by_name(name)
-                    if result and result.get("symbol"):
-                        logger.info("resolve_isin resolved by name isin=%s name=%s symbol=%s", isin, name, result["symbol"])
-                        return self._persist_resolution(isin, result, adapter)
-        logger.warning("resolve_isin failed isin=%s", isin)
+        return False, None
+
+    def _finish_resolution(self, isin: str, resolved: Optional[tuple[dict, Any]], errored: bool = False) -> Optional[str]:
+        """Persist an adapter resolution, or remember the miss in the negative cache (only briefly when a search
+        failed rather than found nothing)."""
+        if resolved:
+            return self._persist_resolution(isin, *resolved)
+        logger.warning("resolve_isin failed isin=%s errored=%s", isin, errored)
+        get_negative_cache().record(("isin", isin), NEGATIVE_TTL_TRANSIENT if errored else None)
         return None
 
-    def _persist_resolution(self, isin: str, result: dict, adapter: DataSourceAdapter) -> str:
+    def _stock_name(self, isin: str) -> Optional[str]:
+        stock = self.db.query(Stock).filter(Stock.isin == isin).first()
+        return stock.name if stock else None
+
+    def _persist_resolution(self, isin: str, result: dict, adapter: Any) -> str:
         """Persist symbol resolution and return symbol."""
         symbol = result["symbol"]
         name = result.get("name")
-        source = getattr(adapter.__class__, "__name__", None) or "unknown"
+        source = adapter_source(adapter)
         existing = self.db.query(SymbolResolution).filter(SymbolResolution.isin == isin).first()
         if existing:
             existing.symbol = symbol
@@ -170,117 +423,434 @@ class ScanService:
                 source=source,
             ))
         self.db.commit()
+        get_negative_cache().clear(("isin", isin))
+        get_l1_cache().set(_isin_l1_key(isin), symbol, _now(), TTL_ISIN)
         return symbol
 
     def _get_cached(self, symbol: str, data_type: str, interval: str = "") -> Optional[dict]:
-        row = self.db.query(ScanCache).filter(
-            ScanCache.symbol == symbol,
-            ScanCache.data_type == data_type,
-            ScanCache.interval == (interval or ""),
-        ).first()
-        if not row:
-            return None
-        ttl = _ttl_seconds(data_type)
-        fetched = row.fetched_at
-        if fetched.tzinfo is None:
-            fetched = fetched.replace(tzinfo=timezone.utc)
-        if (_now() - fetched).total_seconds() > ttl:
-            return None
-        logger.debug("scan_cache hit symbol=%s data_type=%s", symbol, data_type)
-        return row.payload
+        entry = self._lookup_cached(symbol, data_type, interval)
+        return entry[0] if entry else None
+
+    def _lookup_cached(self, symbol: str, data_type: str, interval: str = "") -> Optional[tuple[Any, datetime]]:
+        """(payload, fetched_at) if fresh, or stale within the stale-while-revalidate window (then a refresh is scheduled)."""
+        key = (symbol, data_type, interval or "")
+        swr = self._swr
+        l1 = get_l1_cache()
+        hit = l1.get(key)
+        if hit is not None:
+            payload, fetched = hit
+            logger.debug("l1 cache hit symbol=%s data_type=%s", symbol, data_type)
+        else:
+            row = self.db.query(ScanCache).filter(
+                ScanCache.symbol == symbol,
+                ScanCache.data_type == data_type,
+                ScanCache.interval == (interval or ""),
+            ).first()
+            if not row:
+                return None
+            payload = row.payload
+            fetched = row.fetched_at
+            if fetched.tzinfo is None:
+                fetched = fetched.replace(tzinfo=timezone.utc)
+            l1.set(key, payload, fetched, self._l1_retention_seconds(data_type))
+        age = (_now() - fetched).total_seconds()
+        if age <= _ttl_seconds(data_type):
+            if hit is None:
+                logger.debug("scan_cache hit symbol=%s data_type=%s", symbol, data_type)
+            return payload, fetched
+        if swr and age <= _swr_serve_window_seconds(data_type):
+            logger.info("scan_cache serving stale symbol=%s data_type=%s age_s=%d", symbol, data_type, age)
+            self.stale_data_types.add(data_type)
+            self._schedule_refresh(symbol, data_type)
+            return payload, fetched
+        return None
+
+    def _l1_retention_seconds(self, data_type: str) -> int:
+        """How long after fetched_at L1 may hold a row: TTL, or the whole stale-serving window when SWR is on."""
+        return _swr_serve_window_seconds(data_type) if self._swr else _ttl_seconds(data_type)
+
+    def _swr_enabled(self) -> bool:
+        return self._swr
+
+    def _schedule_refresh(self, symbol: str, data_type: str) -> None:
+        """Queue a background re-fetch for a stale row; at most one pending refresh per (symbol, data_type)."""
+        global _refresh_executor
+        key = (symbol, data_type)
+        with _refresh_lock:
+            if key in _refresh_pending:
+                return
+            _refresh_pending.add(key)
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scan-refresh")
+        logger.info("scan background refresh scheduled symbol=%s data_type=%s", symbol, data_type)
+        _refresh_executor.submit(self._refresh_in_background, symbol, data_type)
+
+    def _refresh_in_background(self, symbol: str, data_type: str) -> None:
+        db = SessionLocal()
+        try:
+            out = ScanService(db, adapters=self._adapters)._fetch_and_store(symbol, data_type)
+            logger.info("scan background refresh %s symbol=%s data_type=%s", "done" if out else "failed", symbol, data_type)
+        except Exception:
+            logger.exception("scan background refresh error symbol=%s data_type=%s", symbol, data_type)
+        finally:
+            db.close()
+            with _refresh_lock:
+                _refresh_pending.discard((symbol, data_type))
 
-    def _set_cached(self, symbol: str, data_type: str, payload: dict, interval: str = "") -> None:
+    def _set_cached(self, symbol: str, data_type: str, payload: dict, interval: str = "") -> datetime:
         from sqlalchemy import update
         existing = self.db.query(ScanCache).filter(
             ScanCache.symbol == symbol,
             ScanCache.data_type == data_type,
             ScanCache.interval == (interval or ""),
         ).first()
+        fetched_at = _now()
         if existing:
             existing.payload = payload
-            existing.fetched_at = _now()
+            existing.fetched_at = fetched_at
         else:
             self.db.add(ScanCache(
                 symbol=symbol,
                 data_type=data_type,
                 interval=interval or "",
                 payload=payload,
-                fetched_at=_now(),
+                fetched_at=fetched_at,
             ))
         self.db.commit()
+        get_l1_cache().set((symbol, data_type, interval or ""), payload, fetched_at, self._l1_retention_seconds(data_type))
+        return fetched_at
 
     def _get_ohlcv_cached(self, symbol: str, data_type: str) -> Optional[list[dict]]:
-        row = self.db.query(ScanCache).filter(
-            ScanCache.symbol == symbol,
-            ScanCache.data_type == data_type,
-            ScanCache.interval == "",
-        ).first()
-        if not row:
+        entry = self._lookup_cached(symbol, data_type, "")
+        if entry is None:
             return None
-        ttl = _ttl_seconds(data_type)
-        fetched = row.fetched_at
-        if fetched.tzinfo is None:
-            fetched = fetched.replace(tzinfo=timezone.utc)
-        if (_now() - fetched).total_seconds() > ttl:
-            return None
-        logger.debug("scan_cache hit OHLCV symbol=%s data_type=%s", symbol, data_type)
-        return row.payload.get("series") if isinstance(row.payload, dict) else row.payload
+        payload, fetched = entry
+        if isinstance(payload, dict) and payload.get("storage") == OHLCV_STORAGE:
+            return self._read_ohlcv_rows(symbol, fetched)
+        # Legacy rows (and weekly/monthly) hold the whole series as a JSONB blob
+        return payload.get("series") if isinstance(payload, dict) else payload
 
     def _set_ohlcv_cached(self, symbol: str, data_type: str, series: list[dict]) -> None:
+        if data_type == "daily":
+            self._store_daily(symbol, series)
+            return
         payload = {"series": series}
         self._set_cached(symbol, data_type, payload, "")
 
-    def _fetch_quote(self, symbol: str) -> Optional[dict]:
-        for adapter in self._adapters:
-            try:
-                out = adapter.get_quote(symbol)
-                if out:
-                    return out
-            except Exception:
-                continue
-        return None
+    def _read_ohlcv_rows(self, symbol: str, fetched: datetime) -> list[dict]:
+        """Full daily series from the ohlcv table, memoized in L1 until the marker row is rewritten."""
+        key = (symbol, "daily", OHLCV_ROWS_INTERVAL)
+        l1 = get_l1_cache()
+        hit = l1.get(key)
+        if hit is not None and hit[1] >= fetched:
+            return hit[0]
+        series = OHLCVStore(self.db).read(symbol)
+        l1.set(key, series, fetched, self._l1_retention_seconds("daily"))
+        return series
+
+    def _store_daily(self, symbol: str, bars: list[dict], replace: bool = False) -> list[dict]:
+        """Upsert bars into ohlcv (replace: drop the stored ones first), rewrite the scan_cache marker and return
+        the full stored series."""
+        store = OHLCVStore(self.db)
+        if replace:
+            store.replace(symbol, bars)
+        else:
+            store.append(symbol, bars)
+        series = store.read(symbol)
+        marker = {"storage": OHLCV_STORAGE, "bars": len(series), "last_time": series[-1]["time"] if series else None}
+        fetched = self._set_cached(symbol, "daily", marker, "")
+        get_l1_cache().set((symbol, "daily", OHLCV_ROWS_INTERVAL), series, fetched, self._l1_retention_seconds("daily"))
+        return series
+
+    def _refresh_daily(self, symbol: str) -> Optional[list[dict]]:
+        """Fetch only bars since the refetch anchor (full history when none stored) and append them."""
+        anchor = self._daily_anchor(symbol)
+        since = anchor["time"] if anchor else None
+        return self._apply_daily_fetch(symbol, anchor, self._fetch_series(symbol, "daily", since=since))
+
+    def refresh_daily_many(self, symbols: list[str], *, fallback: bool = True) -> dict[str, Optional[list[dict]]]:
+        """
+        Incremental daily refresh for many symbols in a few grouped requests (adapters with supports_batch_series).
+        Symbols with stored bars are fetched from the oldest of their refetch anchors, the rest with full history;
+        each symbol then keeps only bars from its own anchor. Symbols the batch missed go through
+        _refresh_daily one by one when fallback is set. Returns {symbol: full stored series or None}.
+        """
+        store = OHLCVStore(self.db)
+        anchors = {s: store.refetch_anchor(s) for s in dict.fromkeys(symbols)}
+        since_by_symbol = {s: anchor["time"] if anchor else None for s, anchor in anchors.items()}
+        fetched = self._fetch_series_many(since_by_symbol, "daily")
+        out: dict[str, Optional[list[dict]]] = {}
+        for symbol, anchor in anchors.items():
+            if symbol in fetched:
+                out[symbol] = self._apply_daily_fetch(symbol, anchor, fetched[symbol])
+            elif fallback:
+                out[symbol] = self._refresh_daily(symbol)
+            else:
+                out[symbol] = None
+        logger.info(
+            "ohlcv batch refresh symbols=%s batched=%s refreshed=%s",
+            len(since_by_symbol), len(fetched), sum(1 for v in out.values() if v),
+        )
+        return out
 
-    def _fetch_series(self, symbol: str, data_type: str) -> Optional[list[dict]]:
+    def _fetch_series_many(self, since_by_symbol: dict[str, Optional[str]], data_type: str) -> dict[str, list[dict]]:
+        """{symbol: bars} from batch-capable adapters: one grouped call for symbols without stored bars and one for
+        the incremental ones. A batch miss is not remembered (a failed group and a symbol without data look the
+        same here); the one-by-one fallback records genuine misses."""
+        negative = get_negative_cache()
+        full = [s for s, since in since_by_symbol.items() if not since and not negative.is_negative((data_type, s))]
+        incremental = {s: since for s, since in since_by_symbol.items() if since}
+        out: dict[str, list[dict]] = {}
         for adapter in self._adapters:
-            try:
-                out = adapter.get_series(symbol, data_type)
-                if out:
-                    return out
-            except Exception:
+            if not adapter.supports_batch_series:
                 continue
-        return None
+            try:
+                pending = [s for s in full if s not in out]
+                if pending:
+                    out.update(adapter.get_series_many(pending, data_type))
+                pending = [s for s in incremental if s not in out]
+                if pending:
+                    start = min(incremental[s] for s in pending)
+                    for symbol, bars in adapter.get_series_many(pending, data_type, since=start).items():
+                        out[symbol] = [b for b in bars if b["time"] >= incremental[symbol]]
+            except Exception as e:
+                logger.warning("batch series fetch failed adapter=%s: %s", type(adapter).__name__, e)
+        return {s: bars for s, bars in out.items() if bars}
+
+    def _daily_anchor(self, symbol: str) -> Optional[dict]:
+        return OHLCVStore(self.db).refetch_anchor(symbol)
+
+    def _apply_daily_fetch(self, symbol: str, anchor: Optional[dict], bars: Optional[list[dict]]) -> Optional[list[dict]]:
+        """Store bars fetched since the anchor bar and return the full series (stored bars when the fetch failed).
+        When the refetched anchor bar's close differs from the stored one, the stored history is on another basis
+        (split/dividend adjustment, or another provider): the full history is refetched and replaces it."""
+        since = anchor["time"] if anchor else None
+        if not bars:
+            if since:
+                logger.warning("ohlcv incremental fetch failed symbol=%s since=%s; serving stored bars", symbol, since)
+                return OHLCVStore(self.db).read(symbol) or None
+            return None
+        if anchor and _basis_changed(anchor, bars):
+            logger.info("ohlcv basis changed symbol=%s at=%s; refetching full history", symbol, since)
+            full = self._fetch_series(symbol, "daily")
+            if full:
+                series = self._store_daily(symbol, full, replace=True)
+                logger.info("ohlcv full refresh (replace) symbol=%s bars=%s", symbol, len(series))
+                return series
+            logger.warning("ohlcv full refetch failed symbol=%s; appending incremental bars", symbol)
+        series = self._store_daily(symbol, bars)
+        logger.info(
+            "ohlcv %s refresh symbol=%s fetched_bars=%s total_bars=%s",
+            "incremental" if since else "full", symbol, len(bars), len(series),
+        )
+        return series
+
+    # Public fetch entry points: concurrent requests for the same (symbol, data_type, since) share one upstream call,
+    # and a fetch that every adapter answered with "no data" is not retried until its negative TTL passes (one
+    # that failed upstream only for NEGATIVE_TTL_TRANSIENT)
+    def _fetch_quote(self, symbol: str) -> Optional[dict]:
+        return self._fetch_remembering_misses(symbol, "quote", lambda errors: self._fetch_quote_upstream(symbol, errors))
+
+    def _fetch_series(self, symbol: str, data_type: str, since: Optional[str] = None) -> Optional[list[dict]]:
+        if since:
+            # No new bars since the last stored one is a normal outcome, not a miss
+            return get_single_flight().do(
+                _flight_key(symbol, data_type, since), lambda: self._fetch_series_upstream(symbol, data_type, since),
+            )
+        return self._fetch_remembering_misses(
+            symbol, data_type, lambda errors: self._fetch_series_upstream(symbol, data_type, errors=errors),
+        )
 
     def _fetch_fundamentals(self, symbol: str) -> Optional[dict]:
-        for adapter in self._adapters:
-            try:
-                out = adapter.get_fundamentals(symbol)
-                if out:
-                    return out
-            except Exception:
-                continue
-        return None
+        return self._fetch_remembering_misses(symbol, "fundamentals", lambda errors: self._fetch_fundamentals_upstream(symbol, errors))
 
     def _fetch_news(self, symbol: str, limit: int = 10) -> Optional[list]:
-        for adapter in self._adapters:
-            try:
-                out = adapter.get_news(symbol, limit=limit)
-                if out:
-                    return out
-            except Exception as e:
-                logger.debug("news fetch failed adapter=%s symbol=%s: %s", type(adapter).__name__, symbol, e)
-                continue
-        return None
+        return self._fetch_remembering_misses(symbol, "news", lambda errors: self._fetch_news_upstream(symbol, limit, errors))
+
+    def _fetch_remembering_misses(self, symbol: str, data_type: str, fetch: Callable[[list[BaseException]], Any]) -> Any:
+        """fetch(errors) through single-flight. Only the caller that ran it records an empty result: for the full
+        negative TTL when every adapter answered, for NEGATIVE_TTL_TRANSIENT when one failed (timeout, 429, ...)."""
+        negative = get_negative_cache()
+        if negative.is_negative((data_type, symbol)):
+            logger.debug("scan %s negative cache hit symbol=%s", data_type, symbol)
+            return None
+        errors: list[BaseException] = []
+        ran = []
+
+        def run() -> Any:
+            ran.append(True)
+            return fetch(errors)
+
+        out = get_single_flight().do(_flight_key(symbol, data_type), run)
+        if not out and ran:
+            negative.record((data_type, symbol), NEGATIVE_TTL_TRANSIENT if errors else None)
+        return out
+
+    def _first_result(
+        self, data_type: str, call: Callable[[DataSourceAdapter], Any], errors: Optional[list[BaseException]] = None,
+    ) -> Any:
+        """First non-empty result from the adapters in planned (Alpha Vantage budget, see fetch_planner) and routed
+        order (health and circuit breakers, see adapter_router), hedged across the first two when HEDGE_POLICIES
+        lists the data type."""
+        adapters = _routed(get_fetch_planner().plan(self._adapters, data_type), data_type, errors)
+        router = get_adapter_router()
+        hedger = get_hedger()
+        if hedger.enabled_for(data_type):
+            return hedger.first_result(adapters, data_type, call, errors)
+        return router.first_result(adapters, data_type, call, errors)
+
+    def _fetch_quote_upstream(self, symbol: str, errors: Optional[list[BaseException]] = None) -> Optional[dict]:
+        return self._first_result("quote", lambda a: a.get_quote(symbol), errors)
+
+    def _fetch_series_upstream(
+        self, symbol: str, data_type: str, since: Optional[str] = None, errors: Optional[list[BaseException]] = None,
+    ) -> Optional[list[dict]]:
+        return self._first_result(data_type, lambda a: a.get_series(symbol, data_type, since=since), errors)
+
+    def _fetch_fundamentals_upstream(self, symbol: str, errors: Optional[list[BaseException]] = None) -> Optional[dict]:
+        return self._first_result("fundamentals", lambda a: a.get_fundamentals(symbol), errors)
+
+    def _fetch_news_upstream(self, symbol: str, limit: int = 10, errors: Optional[list[BaseException]] = None) -> Optional[list]:
+        return self._first_result("news", lambda a: a.get_news(symbol, limit=limit), errors)
+
+    def _fetch_and_store(self, symbol: str, data_type: str) -> Any:
+        """Fetch one data type from adapters and write it to the cache. Returns the fetched value or None."""
+        if data_type == "daily":
+            return self._refresh_daily(symbol)
+        if data_type in RESAMPLED_DATA_TYPES:
+            return self._get_resampled(symbol, data_type)
+        if data_type == "news":
+            return self._store_fetched(symbol, "news", self._fetch_news(symbol, limit=10))
+        fetch = {"quote": self._fetch_quote, "fundamentals": self._fetch_fundamentals}[data_type]
+        return self._store_fetched(symbol, data_type, fetch(symbol))
+
+    def _store_fetched(self, symbol: str, data_type: str, value: Any) -> Any:
+        """Write a fetched quote / fundamentals / news value to the cache (news as {items}). Returns value."""
+        if not value:
+            return value
+        if data_type == "news":
+            self._set_cached(symbol, "news", {"items": value})
+            logger.info("scan news fetched symbol=%s items=%s", symbol, len(value))
+        else:
+            self._set_cached(symbol, data_type, value)
+            logger.info("scan %s fetched symbol=%s", data_type, symbol)
+        return value
+
+    def _get_resampled(self, symbol: str, data_type: str) -> Optional[list[dict]]:
+        """Weekly/monthly bars derived from the stored daily series (no upstream call of their own)."""
+        daily = self._get_ohlcv_cached(symbol, "daily") or self._refresh_daily(symbol)
+        if not daily:
+            return None
+        series = resample_ohlcv(daily, data_type)
+        logger.debug("scan %s derived from daily symbol=%s points=%s", data_type, symbol, len(series))
+        return series
+
+    def _scan_data_type(self, symbol: str, data_type: str) -> Any:
+        """Cache lookup for one scan data type; on miss fetch from adapters and write the cache. Returns None on failure."""
+        if data_type in RESAMPLED_DATA_TYPES:
+            return self._get_resampled(symbol, data_type)
+        cached = self._cached_value(symbol, data_type)
+        if cached:
+            logger.info("scan %s cache hit symbol=%s", data_type, symbol)
+            return cached
+        return self._fetch_and_store(symbol, data_type)
+
+    def _cached_value(self, symbol: str, data_type: str) -> Any:
+        """Cached value of a scan data type (daily as the full series, news as the item list), or None on miss."""
+        if data_type == "daily":
+            return self._get_ohlcv_cached(symbol, data_type)
+        cached = self._get_cached(symbol, data_type)
+        if cached and data_type == "news":
+            cached = cached.get("items") if isinstance(cached, dict) else cached
+        return cached
+
+    def _isolated(self, method: str, *args: Any) -> tuple[Any, set[str]]:
+        """Run a ScanService method on its own DB session, for worker threads (SQLAlchemy sessions are not
+        thread-safe). Returns (value, data types served stale)."""
+        db = SessionLocal()
+        try:
+            worker = ScanService(db, adapters=self._adapters, async_adapters=self._async_adapters)
+            value = getattr(worker, method)(*args)
+            return value, worker.stale_data_types
+        finally:
+            db.close()
+
+    def _scan_data_type_isolated(self, symbol: str, data_type: str) -> tuple[Any, set[str]]:
+        return self._isolated("_scan_data_type", symbol, data_type)
+
+    def _call_within(self, timeout: Optional[float], method: str, *args: Any) -> Any:
+        """getattr(self, method)(*args), or with a timeout the isolated call on the scan pool, waited for at most
+        timeout seconds (TimeoutError past it; the worker finishes in the background and still writes the cache)."""
+        if timeout is None:
+            return getattr(self, method)(*args)
+        value, stale = _get_scan_executor().submit(self._isolated, method, *args).result(timeout=max(0.0, timeout))
+        self.stale_data_types |= stale
+        return value
+
+    def _scan_steps_concurrent(
+        self,
+        symbol: str,
+        steps: list[tuple[int, str, str, str]],
+        result: dict[str, Any],
+        total_steps: int,
+        on_progress: Optional[Callable[[str, int, int, Optional[str]], None]],
+        timeout: Optional[float] = None,
+    ) -> list[str]:
+        """Fan out cache lookup + fetch per data type on the shared pool. Progress callbacks stay on the calling thread.
+        Alpha Vantage calls still go through the global rate limiter, so they are spaced even when submitted together.
+        Data types not done within timeout are left None and returned; their workers finish in the background and
+        still write the cache."""
+        executor = _get_scan_executor()
+        futures = {}
+        for step_index, data_type, name, failure in steps:
+            if on_progress:
+                on_progress(name, step_index, total_steps, None)
+            futures[executor.submit(self._scan_data_type_isolated, symbol, data_type)] = (step_index, data_type, name, failure)
+        logger.info("scan concurrent fan-out symbol=%s data_types=%s", symbol, [s[1] for s in steps])
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                pending.discard(future)
+                step_index, data_type, name, failure = futures[future]
+                try:
+                    result[data_type], stale = future.result()
+                    self.stale_data_types |= stale
+                except Exception:
+                    logger.exception("scan %s worker failed symbol=%s", data_type, symbol)
+                    result[data_type] = None
+                if result[data_type] is None:
+                    logger.warning("scan %s fetch failed symbol=%s", data_type, symbol)
+                    if on_progress:
+                        on_progress(name, step_index, total_steps, failure)
+        except TimeoutError:
+            pass
+        timed_out = []
+        for future in sorted(pending, key=lambda f: futures[f][0]):
+            step_index, data_type, name, _ = futures[future]
+            timed_out.append(data_type)
+            logger.warning("scan %s timed out symbol=%s timeout=%.1fs", data_type, symbol, timeout)
+            if on_progress:
+                on_progress(name, step_index, total_steps, SCAN_TIMEOUT_MESSAGE)
+        return timed_out
 
     def scan(
         self,
         identifier: str,
         *,
         on_progress: Optional[Callable[[str, int, int, Optional[str]], None]] = None,
+        concurrent: Optional[bool] = None,
+        timeout: Optional[float] = None,
     ) -> dict[str, Any]:
         """
         Scan all data for identifier (ISIN or symbol). Resolves ISIN -> symbol.
         on_progress(step_name, step_index, total_steps, error_message).
-        Returns aggregated context: { symbol, quote, daily, weekly, monthly, fundamentals, news }.
+        concurrent: fetch data types in parallel (default from SCAN_CONCURRENT); step indices are the same in both modes.
+        timeout: seconds for the whole scan, ISIN resolution included; data types not fetched by then are returned
+        as None. With a timeout, resolution and sequential steps run on the scan pool and are waited for only until
+        the deadline (an unresolved identifier then comes back with timed_out ["symbol"]).
+        Returns aggregated context: { symbol, quote, daily, weekly, monthly, fundamentals, news, stale, timed_out }
+        where stale lists data types served from expired cache under stale-while-revalidate and timed_out the
+        data types cut off by timeout.
         """
         if get_settings().dev_mode:
             symbol = identifier if (identifier.isupper() and len(identifier) <= 6 and " " not in identifier) else self.resolve_isin(identifier)
@@ -290,8 +860,8 @@ class ScanService:
             result_dev: dict[str, Any] = {"symbol": symbol, "quote": None, "daily": None, "weekly": None, "monthly": None, "fundamentals": None, "news": None}
             result_dev["quote"] = self._get_cached(symbol, "quote") or _mock_quote(symbol)
             result_dev["daily"] = self._get_ohlcv_cached(symbol, "daily") or _mock_series(252)
-            result_dev["weekly"] = self._get_ohlcv_cached(symbol, "weekly") or _mock_series(52)
-            result_dev["monthly"] = self._get_ohlcv_cached(symbol, "monthly") or _mock_series(12)
+            result_dev["weekly"] = resample_ohlcv(result_dev["daily"], "weekly") or _mock_series(52)
+            result_dev["monthly"] = resample_ohlcv(result_dev["daily"], "monthly") or _mock_series(12)
             result_dev["fundamentals"] = self._get_cached(symbol, "fundamentals") or _mock_fundamentals(symbol)
             news_cached = self._get_cached(symbol, "news")
             result_dev["news"] = (news_cached.get("items") if isinstance(news_cached, dict) else news_cached) if news_cached else _mock_news()
@@ -301,6 +871,7 @@ class ScanService:
                     on_progress("Mock step", s, total_steps, None)
             logger.info("dev_mode: scan returning context symbol=%s (from DB when available)", symbol)
             return result_dev
+        started = time.monotonic()
         total_steps = 7
         step = 0
         symbol: Optional[str] = None
@@ -310,125 +881,241 @@ class ScanService:
             step += 1
             if on_progress:
                 on_progress("Resolving symbol", step, total_steps, None)
-            symbol = self.resolve_isin(identifier)
+            try:
+                symbol = self._call_within(timeout, "resolve_isin", identifier)
+            except TimeoutError:
+                logger.warning("scan resolve timed out identifier=%s timeout=%.1fs", identifier, timeout)
+                if on_progress:
+                    on_progress("Resolving symbol", step, total_steps, SCAN_TIMEOUT_MESSAGE)
+                return {"symbol": None, "error": "Could not resolve identifier to symbol in time", "timed_out": ["symbol"]}
             if not symbol:
                 if on_progress:
                     on_progress("Resolving symbol", step, total_steps, "Could not resolve ISIN to symbol")
                 return {"symbol": None, "error": "Could not resolve identifier to symbol"}
 
+        get_popularity().record(symbol)
         result: dict[str, Any] = {"symbol": symbol, "quote": None, "daily": None, "weekly": None, "monthly": None, "fundamentals": None, "news": None}
+        steps = [(step + i + 1, data_type, name, failure) for i, (data_type, name, failure) in enumerate(SCAN_STEPS)]
+        if concurrent is None:
+            concurrent = get_settings().scan_concurrent
 
-        # Quote
-        step += 1
-        if on_progress:
-            on_progress("Fetching price data", step, total_steps, None)
-        cached = self._get_cached(symbol, "quote")
-        if cached:
-            result["quote"] = cached
-            logger.info("scan quote cache hit symbol=%s", symbol)
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+        timed_out: list[str] = []
+        if concurrent:
+            timed_out = self._scan_steps_concurrent(symbol, steps, result, total_steps, on_progress, remaining)
         else:
-            quote = self._fetch_quote(symbol)
-            if quote:
-                self._set_cached(symbol, "quote", quote)
-                result["quote"] = quote
-                logger.info("scan quote fetched symbol=%s", symbol)
-            else:
-                logger.warning("scan quote fetch failed symbol=%s", symbol)
+            for step_index, data_type, name, failure in steps:
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    timed_out.append(data_type)
+                    logger.warning("scan %s skipped (timeout) symbol=%s", data_type, symbol)
+                    if on_progress:
+                        on_progress(name, step_index, total_steps, SCAN_TIMEOUT_MESSAGE)
+                    continue
                 if on_progress:
-                    on_progress("Fetching price data", step, total_steps, "Quote fetch failed")
+                    on_progress(name, step_index, total_steps, None)
+                try:
+                    result[data_type] = self._call_within(remaining, "_scan_data_type", symbol, data_type)
+                except TimeoutError:
+                    timed_out.append(data_type)
+                    logger.warning("scan %s timed out symbol=%s timeout=%.1fs", data_type, symbol, timeout)
+                    if on_progress:
+                        on_progress(name, step_index, total_steps, SCAN_TIMEOUT_MESSAGE)
+                    continue
+                if result[data_type] is None:
+                    logger.warning("scan %s fetch failed symbol=%s", data_type, symbol)
+                    if on_progress:
+                        on_progress(name, step_index, total_steps, failure)
 
-        # Daily
-        step += 1
+        result["stale"] = sorted(self.stale_data_types)
+        result["timed_out"] = sorted(timed_out)
         if on_progress:
-            on_progress("Fetching daily series", step, total_steps, None)
-        cached = self._get_ohlcv_cached(symbol, "daily")
-        if cached:
-            result["daily"] = cached
-            logger.info("scan daily cache hit symbol=%s", symbol)
-        else:
-            series = self._fetch_series(symbol, "daily")
-            if series:
-                self._set_ohlcv_cached(symbol, "daily", series)
-                result["daily"] = series
-                logger.info("scan daily fetched symbol=%s points=%s", symbol, len(series))
-            else:
-                logger.warning("scan daily fetch failed symbol=%s", symbol)
-                if on_progress:
-                    on_progress("Fetching daily series", step, total_steps, "Daily series fetch failed")
+            on_progress("Scan complete", total_steps, total_steps, None)
+        return result
 
-        # Fundamentals
-        step += 1
-        if on_progress:
-            on_progress("Fetching fundamentals", step, total_steps, None)
-        cached = self._get_cached(symbol, "fundamentals")
+    # Async path: upstream waits happen on the event loop; DB work runs in short worker-thread calls on isolated sessions
+
+    async def _run_isolated(self, method: str, *args: Any) -> tuple[Any, set[str]]:
+        return await asyncio.to_thread(self._isolated, method, *args)
+
+    async def resolve_isin_async(self, isin: str) -> Optional[str]:
+        """Async resolve_isin: same caches and adapter order, with the adapter searches awaited on the loop."""
+        (answered, symbol), _ = await self._run_isolated("_resolve_isin_cached", isin)
+        if answered:
+            return symbol
+
+        async def load_name() -> Optional[str]:
+            return (await self._run_isolated("_stock_name", isin))[0]
+
+        adapters = await get_fetch_planner().plan_async(self._async_adapters, "resolve")
+        errors: list[BaseException] = []
+        resolved = await resolve_with_adapters_async(adapters, isin, load_name, errors)
+        return (await self._run_isolated("_finish_resolution", isin, resolved, bool(errors)))[0]
+
+    async def _fetch_async(self, symbol: str, data_type: str, since: Optional[str] = None) -> Any:
+        """Async counterpart of the _fetch_* entry points: negative cache, single-flight, then adapters in order."""
+        remember_miss = not since
+        negative = get_negative_cache()
+        if remember_miss and negative.is_negative((data_type, symbol)):
+            logger.debug("scan %s negative cache hit symbol=%s", data_type, symbol)
+            return None
+        errors: list[BaseException] = []
+        ran = []
+
+        def run() -> Awaitable[Any]:
+            ran.append(True)
+            return self._fetch_upstream_async(symbol, data_type, since, errors)
+
+        out = await get_single_flight().do_async(_flight_key(symbol, data_type, since), run)
+        if remember_miss and not out and ran:
+            negative.record((data_type, symbol), NEGATIVE_TTL_TRANSIENT if errors else None)
+        return out
+
+    async def _fetch_upstream_async(
+        self, symbol: str, data_type: str, since: Optional[str], errors: Optional[list[BaseException]] = None,
+    ) -> Any:
+        async def call(adapter: AsyncDataSourceAdapter) -> Any:
+            if data_type == "quote":
+                return await adapter.get_quote(symbol)
+            if data_type == "fundamentals":
+                return await adapter.get_fundamentals(symbol)
+            if data_type == "news":
+                return await adapter.get_news(symbol, limit=10)
+            return await adapter.get_series(symbol, data_type, since=since)
+
+        adapters = _routed(await get_fetch_planner().plan_async(self._async_adapters, data_type), data_type, errors)
+        router = get_adapter_router()
+        hedger = get_hedger()
+        if hedger.enabled_for(data_type):
+            return await hedger.first_result_async(adapters, data_type, call, errors)
+        return await router.first_result_async(adapters, data_type, call, errors)
+
+    async def _scan_data_type_async(self, symbol: str, data_type: str) -> tuple[Any, set[str]]:
+        """Async _scan_data_type for the SCAN_STEPS data types. Returns (value, data types served stale)."""
+        cached, stale = await self._run_isolated("_cached_value", symbol, data_type)
         if cached:
-            result["fundamentals"] = cached
-            logger.info("scan fundamentals cache hit symbol=%s", symbol)
+            logger.info("scan %s cache hit symbol=%s", data_type, symbol)
+            return cached, stale
+        if data_type == "daily":
+            anchor, _ = await self._run_isolated("_daily_anchor", symbol)
+            bars = await self._fetch_async(symbol, "daily", since=anchor["time"] if anchor else None)
+            # A basis change refetches the full history inside this worker-thread call
+            value, _ = await self._run_isolated("_apply_daily_fetch", symbol, anchor, bars)
+            return value, stale
+        value = await self._fetch_async(symbol, data_type)
+        if value:
+            await self._run_isolated("_store_fetched", symbol, data_type, value)
+        return value, stale
+
+    async def scan_async(
+        self,
+        identifier: str,
+        *,
+        on_progress: Optional[Callable[[str, int, int, Optional[str]], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Event-loop variant of scan(): same result shape and progress steps, data types fetched concurrently.
+        Adapter calls are awaited (async HTTP; yfinance in worker threads), so many scans can share one loop.
+        timeout as in scan(), ISIN resolution included; a resolution or data type fetch still running at the timeout
+        is cancelled.
+        In dev mode this runs the sync scan in a worker thread (mocks and DB only).
+        """
+        if get_settings().dev_mode:
+            return (await self._run_isolated("scan", identifier, on_progress))[0]
+        started = time.monotonic()
+        total_steps = 7
+        step = 0
+        if identifier.isupper() and len(identifier) <= 6 and " " not in identifier:
+            symbol: Optional[str] = identifier
         else:
-            fund = self._fetch_fundamentals(symbol)
-            if fund:
-                self._set_cached(symbol, "fundamentals", fund)
-                result["fundamentals"] = fund
-                logger.info("scan fundamentals fetched symbol=%s", symbol)
-            else:
-                logger.warning("scan fundamentals fetch failed symbol=%s", symbol)
+            step += 1
+            if on_progress:
+                on_progress("Resolving symbol", step, total_steps, None)
+            try:
+                symbol = await asyncio.wait_for(self.resolve_isin_async(identifier), timeout)
+            except TimeoutError:
+                logger.warning("scan resolve timed out identifier=%s timeout=%.1fs", identifier, timeout)
+                if on_progress:
+                    on_progress("Resolving symbol", step, total_steps, SCAN_TIMEOUT_MESSAGE)
+                return {"symbol": None, "error": "Could not resolve identifier to symbol in time", "timed_out": ["symbol"]}
+            if not symbol:
                 if on_progress:
-                    on_progress("Fetching fundamentals", step, total_steps, "Fundamentals fetch failed")
+                    on_progress("Resolving symbol", step, total_steps, "Could not resolve ISIN to symbol")
+                return {"symbol": None, "error": "Could not resolve identifier to symbol"}
 
-        # News
-        step += 1
-        if on_progress:
-            on_progress("Fetching news", step, total_steps, None)
-        cached = self._get_cached(symbol, "news")
-        if cached:
-            result["news"] = cached.get("items") if isinstance(cached, dict) else cached
-            logger.info("scan news cache hit symbol=%s", symbol)
-        else:
-            news = self._fetch_news(symbol, limit=10)
-            if news:
-                self._set_cached(symbol, "news", {"items": news})
-                result["news"] = news
-                logger.info("scan news fetched symbol=%s items=%s", symbol, len(news))
+        get_popularity().record(symbol)
+        result: dict[str, Any] = {"symbol": symbol, "quote": None, "daily": None, "weekly": None, "monthly": None, "fundamentals": None, "news": None}
+        steps = [(step + i + 1, data_type, name, failure) for i, (data_type, name, failure) in enumerate(SCAN_STEPS)]
+        for step_index, _, name, _ in steps:
+            if on_progress:
+                on_progress(name, step_index, total_steps, None)
+        logger.info("scan async fan-out symbol=%s data_types=%s", symbol, [s[1] for s in steps])
+        tasks = [asyncio.ensure_future(self._scan_data_type_async(symbol, data_type)) for _, data_type, _, _ in steps]
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+        _, pending = await asyncio.wait(tasks, timeout=remaining)
+        for task in pending:
+            task.cancel()
+        timed_out: list[str] = []
+        for (step_index, data_type, name, failure), task in zip(steps, tasks):
+            if task in pending:
+                logger.warning("scan %s timed out symbol=%s timeout=%.1fs", data_type, symbol, timeout)
+                timed_out.append(data_type)
+                result[data_type] = None
+                if on_progress:
+                    on_progress(name, step_index, total_steps, SCAN_TIMEOUT_MESSAGE)
+                continue
+            outcome = task.exception() or task.result()
+            if isinstance(outcome, BaseException):
+                logger.error("scan %s async step failed symbol=%s: %r", data_type, symbol, outcome)
+                result[data_type] = None
             else:
-                logger.warning("scan news fetch failed symbol=%s", symbol)
+                result[data_type], stale = outcome
+                self.stale_data_types |= stale
+            if result[data_type] is None:
+                logger.warning("scan %s fetch failed symbol=%s", data_type, symbol)
                 if on_progress:
-                    on_progress("Fetching news", step, total_steps, "News fetch failed")
+                    on_progress(name, step_index, total_steps, failure)
 
+        result["stale"] = sorted(self.stale_data_types)
+        result["timed_out"] = sorted(timed_out)
         if on_progress:
             on_progress("Scan complete", total_steps, total_steps, None)
         return result
 
     def get_series(self, identifier: str, interval: str) -> Optional[list[dict]]:
-        """Get OHLCV series for graph. interval: 1d, 1w, 1m -> daily, weekly, monthly. Prefer DB in dev_mode."""
+        """Get OHLCV series for graph. interval: 1d, 1w, 1m -> daily, weekly, monthly (the latter two resampled
+        from daily bars). Prefer DB in dev_mode."""
         symbol = self.resolve_isin(identifier) if not (identifier.isupper() and len(identifier) <= 6) else identifier
         if not symbol:
             return None
+        get_popularity().record(symbol)
         data_type = {"1d": "daily", "1w": "weekly", "1m": "monthly"}.get(interval, "daily")
-        cached = self._get_ohlcv_cached(symbol, data_type)
+        cached = self._get_ohlcv_cached(symbol, "daily")
         if cached:
-            if get_settings().dev_mode:
+            if data_type in RESAMPLED_DATA_TYPES:
+                cached = resample_ohlcv(cached, data_type)
+            if self._dev_mode:
                 logger.debug("dev_mode: get_series from DB symbol=%s data_type=%s points=%s", symbol, data_type, len(cached))
             return cached
-        if get_settings().dev_mode:
+        if self._dev_mode:
             # No cached data in dev: return 1 year of mock points so graph/forecast work
             n = 252 if data_type == "daily" else 52 if data_type == "weekly" else 12
             return _mock_series(n)
-        series = self._fetch_series(symbol, data_type)
-        if series:
-            self._set_ohlcv_cached(symbol, data_type, series)
-        return series
+        return self._fetch_and_store(symbol, data_type)
 
     def get_metrics(self, identifier: str) -> Optional[dict]:
         """Get fundamentals for metrics panel. Prefer DB in dev_mode."""
         symbol = self.resolve_isin(identifier) if not (identifier.isupper() and len(identifier) <= 6) else identifier
         if not symbol:
             return None
+        get_popularity().record(symbol)
         cached = self._get_cached(symbol, "fundamentals")
         if cached:
-            if get_settings().dev_mode:
+            if self._dev_mode:
                 logger.debug("dev_mode: get_metrics from DB symbol=%s", symbol)
             return cached
-        if get_settings().dev_mode:
+        if self._dev_mode:
             return _mock_fundamentals(symbol)
         fund = self._fetch_fundamentals(symbol)
         if fund:
@@ -0,0 +1,124 @@
+"""Single-flight: concurrent callers for the same fetch (symbol, data_type, since) share one in-flight upstream call."""
+import asyncio
+import logging
+from collections import defaultdict
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Process-local call coalescing. The first caller for a key runs fn; callers arriving while it runs
+    wait and receive the same result (or exception). Nothing is cached once the call finishes."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        # Async calls are keyed by (event loop id, key): their futures belong to one loop
+        self._async_calls: dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._coalesced_by_type: dict[str, int] = defaultdict(int)
+
+    def do(self, key: tuple[str, str], fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self._coalesced_by_type[key[1]] += 1
+        if not leader:
+            logger.debug("single-flight join key=%s", key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            if call.waiters:
+                logger.info("single-flight shared key=%s waiters=%s", key, call.waiters)
+
+    async def do_async(self, key: tuple[str, str], fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Event-loop variant of do(): waiters await the leader's future instead of blocking a thread."""
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(call_key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._async_calls[call_key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+                self._coalesced_by_type[key[1]] += 1
+        if not leader:
+            logger.debug("single-flight join key=%s (async)", key)
+            # shield: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(future)
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody was waiting
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._async_calls.pop(call_key, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "coalesced_by_data_type": dict(self._coalesced_by_type),
+            }
+
+
+# Singleton shared by all ScanService instances in this process
+_single_flight: SingleFlight | None = None
+_single_flight_lock = Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
@@ -0,0 +1,208 @@
+"""Background cache warm-up: refresh scan_cache entries of popular symbols shortly before they expire."""
+import logging
+import time
+from collections import deque
+from datetime import timezone
+from threading import Event, Lock, Thread
+from typing import Any, Optional
+
+from app.adapters.base import DataSourceAdapter
+from app.adapters.factory import create_adapters
+from app.adapters.yahoo import YAHOO_BATCH_SIZE
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.models.base import ScanCache
+from app.services.popularity import get_popularity
+from app.services.rate_limiter import get_alpha_vantage_limiter
+from app.services.scan_service import ScanService, _now, _ttl_seconds
+
+logger = logging.getLogger(__name__)
+
+# Data types kept warm (weekly/monthly are derived from daily)
+WARMUP_DATA_TYPES = ("quote", "news", "fundamentals", "daily")
+# Refresh when a row is within this fraction of its TTL from expiry (at least WARMUP_MIN_LEAD_SECONDS)
+WARMUP_LEAD_FRACTION = 0.1
+WARMUP_MIN_LEAD_SECONDS = 120
+
+
+def _lead_seconds(data_type: str) -> int:
+    return max(WARMUP_MIN_LEAD_SECONDS, int(_ttl_seconds(data_type) * WARMUP_LEAD_FRACTION))
+
+
+class WarmupScheduler:
+    """
+    Daemon thread that periodically refreshes due cache rows for the most requested symbols.
+    Candidates are ordered by popularity, then by time to expiry. Due daily series are refreshed together in
+    grouped Yahoo downloads (one budget unit per group); other rows are refreshed one by one up to the per-cycle
+    cap. Refreshes count against an hourly Yahoo budget, and Alpha Vantage is only used while its daily budget
+    stays above a reserve kept for interactive requests.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: int,
+        top_symbols: int,
+        max_refreshes_per_cycle: int,
+        av_reserve: int,
+        yahoo_per_hour: int,
+    ):
+        self.interval_seconds = interval_seconds
+        self.top_symbols = top_symbols
+        self.max_refreshes_per_cycle = max_refreshes_per_cycle
+        self.av_reserve = av_reserve
+        self.yahoo_per_hour = yahoo_per_hour
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._yahoo_calls: deque[float] = deque()
+        self.cycles = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.skipped_budget = 0
+        self.last_cycle_at: Optional[str] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="cache-warmup", daemon=True)
+        self._thread.start()
+        logger.info(
+            "warmup scheduler started interval_s=%s top_symbols=%s max_per_cycle=%s av_reserve=%s yahoo_per_hour=%s",
+            self.interval_seconds, self.top_symbols, self.max_refreshes_per_cycle, self.av_reserve, self.yahoo_per_hour,
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("warmup scheduler stopped")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_cycle()
+            except Exception:
+                logger.exception("warmup cycle failed")
+
+    def _yahoo_budget_left(self) -> int:
+        cutoff = time.monotonic() - 3600
+        with self._lock:
+            while self._yahoo_calls and self._yahoo_calls[0] < cutoff:
+                self._yahoo_calls.popleft()
+            return self.yahoo_per_hour - len(self._yahoo_calls)
+
+    def _adapters(self) -> list[DataSourceAdapter]:
+        """Yahoo only once Alpha Vantage is down to the reserve left for user requests."""
+        if get_alpha_vantage_limiter().remaining_today() > self.av_reserve:
+            return create_adapters()
+        return create_adapters(["YahooFinanceAdapter"])
+
+    def _due(self, db, top: list[tuple[str, float]]) -> list[tuple[float, float, str, str]]:
+        """(popularity, seconds to expiry, symbol, data_type) for cached rows that expire within their lead window."""
+        scores = dict(top)
+        rows = db.query(ScanCache.symbol, ScanCache.data_type, ScanCache.fetched_at).filter(
+            ScanCache.symbol.in_(list(scores)),
+            ScanCache.data_type.in_(WARMUP_DATA_TYPES),
+            ScanCache.interval == "",
+        ).all()
+        now = _now()
+        due = []
+        for symbol, data_type, fetched_at in rows:
+            if fetched_at.tzinfo is None:
+                fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+            expires_in = _ttl_seconds(data_type) - (now - fetched_at).total_seconds()
+            if expires_in <= _lead_seconds(data_type):
+                due.append((scores[symbol], expires_in, symbol, data_type))
+        due.sort(key=lambda d: (-d[0], d[1]))
+        return due
+
+    def run_cycle(self) -> int:
+        """One warm-up pass. Returns the number of rows refreshed."""
+        self.cycles += 1
+        self.last_cycle_at = _now().isoformat()
+        top = get_popularity().top(self.top_symbols)
+        if not top:
+            return 0
+        refreshed = 0
+        db = SessionLocal()
+        try:
+            due = self._due(db, top)
+            if due:
+                logger.info("warmup cycle due=%s symbols=%s", len(due), len(top))
+            daily = [d[2] for d in due if d[3] == "daily"]
+            if daily:
+                refreshed += self._refresh_daily_batch(db, daily)
+            singles = [d for d in due if d[3] != "daily"]
+            attempted = 0
+            for score, expires_in, symbol, data_type in singles:
+                if attempted >= self.max_refreshes_per_cycle:
+                    break
+                if self._yahoo_budget_left() <= 0:
+                    self.skipped_budget += len(singles) - attempted
+                    logger.info("warmup paused: hourly upstream budget used")
+                    break
+                attempted += 1
+                with self._lock:
+                    self._yahoo_calls.append(time.monotonic())
+                out = ScanService(db, adapters=self._adapters())._fetch_and_store(symbol, data_type)
+                if out:
+                    refreshed += 1
+                    self.refreshes += 1
+                    logger.info(
+                        "warmup refreshed symbol=%s data_type=%s score=%.2f expires_in_s=%d",
+                        symbol, data_type, score, expires_in,
+                    )
+                else:
+                    self.failures += 1
+                    logger.warning("warmup refresh failed symbol=%s data_type=%s", symbol, data_type)
+        finally:
+            db.close()
+        return refreshed
+
+    def _refresh_daily_batch(self, db, symbols: list[str]) -> int:
+        """Refresh due daily series in grouped Yahoo downloads while the hourly budget allows. Returns rows refreshed."""
+        groups = [symbols[i:i + YAHOO_BATCH_SIZE] for i in range(0, len(symbols), YAHOO_BATCH_SIZE)]
+        allowed = max(0, self._yahoo_budget_left())
+        if allowed < len(groups):
+            self.skipped_budget += sum(len(g) for g in groups[allowed:])
+            groups = groups[:allowed]
+        refreshed = 0
+        for group in groups:
+            with self._lock:
+                self._yahoo_calls.append(time.monotonic())
+            results = ScanService(db, adapters=create_adapters(["YahooFinanceAdapter"])).refresh_daily_many(group, fallback=False)
+            ok = sum(1 for v in results.values() if v)
+            refreshed += ok
+            self.refreshes += ok
+            self.failures += len(group) - ok
+            logger.info("warmup refreshed daily batch symbols=%s ok=%s", len(group), ok)
+        return refreshed
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "cycles": self.cycles,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "skipped_budget": self.skipped_budget,
+            "yahoo_budget_left": self._yahoo_budget_left(),
+            "last_cycle_at": self.last_cycle_at,
+        }
+
+
+_scheduler: WarmupScheduler | None = None
+
+
+def get_warmup_scheduler() -> WarmupScheduler:
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = WarmupScheduler(
+            interval_seconds=settings.warmup_interval_seconds,
+            top_symbols=settings.warmup_top_symbols,
+            max_refreshes_per_cycle=settings.warmup_max_refreshes_per_cycle,
+            av_reserve=settings.warmup_av_reserve,
+            yahoo_per_hour=settings.warmup_yahoo_per_hour,
+        )
+    return _scheduler
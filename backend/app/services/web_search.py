@@ -11,6 +11,7 @@ from urllib.parse import quote_plus
 import requests
 
 from app.agent.sub_agents import run_keywords_sub_agent
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +48,7 @@ def fetch_from_financial_news_api(symbol: str, api_key: str) -> list[dict[str, s
     params["size"] = size
 
     try:
-        r = requests.get(NEWSDATA_BASE_URL, params=params, timeout=10)
+        r = get_http_client().get(NEWSDATA_BASE_URL, params=params, read_timeout=10)
         r.raise_for_status()
         data = r.json()
         # Response: status, totalResults, results (array of articles)
@@ -84,7 +85,9 @@ def fetch_rss_feeds(keywords: str, max_results: int = 5) -> list[dict[str, str]]
     try:
         encoded = quote_plus(keywords)
         url = f"https://news.google.com/rss/search?q={encoded}&hl=en-US&gl=US&ceid=US:en"
-        feed = feedparser.parse(url, request_headers={"User-Agent": "FinancialAssistant/1.0"})
+        r = get_http_client().get(url, headers={"User-Agent": "FinancialAssistant/1.0"}, read_timeout=10)
+        r.raise_for_status()
+        feed = feedparser.parse(r.content)
         items = (feed.entries or [])[:max_results]
     except Exception as e:
         logger.warning("RSS feed parse failed: %s", e)
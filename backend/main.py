@@ -29,8 +29,10 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from app.api.routes import stocks, advice, chat, sessions
+from app.api.routes import stocks, advice, chat, diagnostics, sessions
 from app.config import get_settings
+from app.services.http_client import close_async_http_client
+from app.services.warmup import get_warmup_scheduler
 
 logger = logging.getLogger("app")
 
@@ -46,6 +48,26 @@ def log_startup_mode():
         logger.info("Backend started in NORMAL mode — real APIs and LLM.")
 
 
+@app.on_event("startup")
+def start_cache_warmup():
+    settings = get_settings()
+    if settings.warmup_enabled and not settings.dev_mode:
+        get_warmup_scheduler().start()
+    else:
+        logger.info("Cache warm-up scheduler disabled (WARMUP_ENABLED=%s, dev_mode=%s)", settings.warmup_enabled, settings.dev_mode)
+
+
+@app.on_event("shutdown")
+def stop_cache_warmup():
+    if get_settings().warmup_enabled:
+        get_warmup_scheduler().stop()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_async_http_client()
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(_request: Request, exc: Exception):
     """Return a generic error so we never expose stack traces or provider messages."""
@@ -81,6 +103,7 @@ app.include_router(stocks.router, prefix="/api", tags=["stocks"])
 app.include_router(advice.router, prefix="/api", tags=["advice"])
 app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(sessions.router, prefix="/api", tags=["sessions"])
+app.include_router(diagnostics.router, prefix="/api", tags=["diagnostics"])
 
 
 @app.get("/health")
@@ -0,0 +1,59 @@
+"""Benchmark compute_forecast (NumPy) against compute_forecast_reference (pure Python) and check they agree.
+
+No database or network. Series are seeded random walks of daily bars.
+
+Examples:
+    python scripts/benchmark_forecast.py                       # 252, 5,000 and 50,000 points
+    python scripts/benchmark_forecast.py --sizes 252,1000 --repeat 20
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.forecast_service import compute_forecast, compute_forecast_reference
+
+
+def _series(n: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    days = np.busday_offset(np.datetime64("1900-01-01"), np.arange(n), roll="forward").astype(str)
+    return [{"time": str(d), "close": float(c)} for d, c in zip(days, closes)]
+
+
+def _best_ms(fn, series: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(series)
+        best = min(best, time.perf_counter() - start)
+    return 1000 * best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="252,5000,50000", help="comma-separated series lengths (default 252,5000,50000)")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per implementation and size; the best is reported (default 10)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(f"{'points':>8} {'reference ms':>13} {'numpy ms':>9} {'speedup':>8}  identical")
+    all_identical = True
+    for n in sizes:
+        series = _series(n, args.seed)
+        identical = compute_forecast(series) == compute_forecast_reference(series)
+        all_identical &= identical
+        ref_ms = _best_ms(compute_forecast_reference, series, args.repeat)
+        np_ms = _best_ms(compute_forecast, series, args.repeat)
+        print(f"{n:>8} {ref_ms:>13.2f} {np_ms:>9.2f} {ref_ms / np_ms:>7.1f}x  {'yes' if identical else 'NO'}")
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Benchmark scan, forecast and the advice pipeline against the record/replay corpus. DATABASE_URL from .env.
+
+Replay needs no network. Use a scratch database: --cold deletes the benchmark symbols' scan_cache and ohlcv rows.
+
+Examples:
+    python scripts/benchmark_scan.py --mode record --identifiers US0378331005,US5949181045   # build the corpus (live)
+    python scripts/benchmark_scan.py --iterations 3 --concurrency 8 --latency-ms 150 --error-rate 0.05 --cold
+    python scripts/benchmark_scan.py --advice --cold       # full advice stream; LLM keys are cleared unless --llm
+    python scripts/benchmark_scan.py --mode synthetic --limit 500 --concurrency 16   # after scripts/populate_synthetic.py
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend_dir.parent / ".env")
+    load_dotenv(Path.cwd().parent / ".env")
+except ImportError:
+    pass
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("replay", "record", "live", "synthetic"), default="replay", help="DATA_SOURCE_MODE (default replay)")
+    parser.add_argument("--corpus", default=None, help="corpus path (default DATA_CORPUS_PATH or backend/.corpus/market_data.jsonl.gz)")
+    parser.add_argument("--identifiers", default=None, help="comma-separated ISINs/symbols (default: all ISINs in the corpus; synthetic: the first --limit universe ISINs)")
+    parser.add_argument("--limit", type=int, default=None, help="benchmark at most this many identifiers")
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=4, help="identifiers scanned in parallel (default 4)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="use ScanService.scan_async")
+    parser.add_argument("--advice", action="store_true", help="run the advice SSE pipeline instead of scan + forecast")
+    parser.add_argument("--llm", action="store_true", help="keep GROQ keys (advice makes live LLM calls)")
+    parser.add_argument("--cold", action="store_true", help="delete cached rows of the benchmark symbols before each iteration")
+    parser.add_argument("--latency-ms", default=None, help='injected latency per replayed call, or "recorded"')
+    parser.add_argument("--jitter-ms", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    """Settings are read from the environment, so set them before the app modules create their singletons."""
+    os.environ["DATA_SOURCE_MODE"] = args.mode
+    for env, value in (
+        ("DATA_CORPUS_PATH", args.corpus),
+        ("REPLAY_LATENCY_MS", args.latency_ms),
+        ("REPLAY_JITTER_MS", args.jitter_ms),
+        ("REPLAY_ERROR_RATE", args.error_rate),
+        ("REPLAY_SEED", args.seed),
+    ):
+        if value is not None:
+            os.environ[env] = str(value)
+    if not args.llm:
+        os.environ["GROQ_API_KEY"] = ""
+        os.environ["GROQ_API_KEY_FALLBACK"] = ""
+
+
+def _summary(name: str, timings: list[float], errors: int, wall: float) -> str:
+    if not timings:
+        return f"{name:<9} n=0 errors={errors}"
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return (
+        f"{name:<9} n={len(timings)} errors={errors} mean={1000 * statistics.fmean(timings):.1f}ms "
+        f"p50={1000 * statistics.median(timings):.1f}ms p95={1000 * p95:.1f}ms max={1000 * ordered[-1]:.1f}ms "
+        f"throughput={len(timings) / wall:.2f}/s"
+    )
+
+
+def main() -> int:
+    args = _parse_args()
+    _configure_env(args)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from app.adapters.factory import get_corpus, get_fault_injector
+    from app.adapters.synthetic import synthetic_universe
+    from app.api.routes.advice import _advice_stream, _scan
+    from app.db.session import SessionLocal
+    from app.models.base import OHLCV, ScanCache, SymbolResolution
+    from app.services.forecast_service import compute_forecast
+    from app.services.l1_cache import get_l1_cache
+    from app.services.negative_cache import get_negative_cache
+    from app.services.scan_service import ScanService
+
+    corpus = get_corpus()
+    if args.identifiers:
+        identifiers = [i.strip() for i in args.identifiers.split(",") if i.strip()]
+    elif args.mode == "synthetic":
+        identifiers = [u["isin"] for u in synthetic_universe(args.limit or 100)]
+    else:
+        known = corpus.identifiers()
+        identifiers = known["isins"] or known["symbols"]
+    if args.limit:
+        identifiers = identifiers[:args.limit]
+    if not identifiers:
+        print("no identifiers: pass --identifiers or record a corpus first (--mode record)")
+        return 1
+
+    def clear_caches() -> None:
+        db = SessionLocal()
+        try:
+            resolved = db.query(SymbolResolution.symbol).filter(SymbolResolution.isin.in_(identifiers)).all()
+            symbols = set(identifiers) | {s for (s,) in resolved}
+            db.query(ScanCache).filter(ScanCache.symbol.in_(symbols)).delete(synchronize_session=False)
+            db.query(OHLCV).filter(OHLCV.symbol.in_(symbols)).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        get_l1_cache().clear()
+        get_negative_cache().reset()
+
+    timings: dict[str, list[float]] = {"scan": [], "forecast": [], "advice": []}
+    errors: dict[str, int] = {"scan": 0, "forecast": 0, "advice": 0}
+
+    def run_one(identifier: str) -> None:
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            if args.advice:
+                events = list(_advice_stream(identifier, db, *asyncio.run(_scan(identifier, db))))
+                timings["advice"].append(time.perf_counter() - start)
+                if not any('"success": true' in e for e in events if e.startswith("event: done")):
+                    errors["advice"] += 1
+                return
+            service = ScanService(db)
+            ctx = asyncio.run(service.scan_async(identifier)) if args.use_async else service.scan(identifier)
+            timings["scan"].append(time.perf_counter() - start)
+            if not ctx.get("symbol"):
+                errors["scan"] += 1
+            daily = ctx.get("daily") or []
+            if len(daily) >= 2:
+                start = time.perf_counter()
+                compute_forecast(daily)
+                timings["forecast"].append(time.perf_counter() - start)
+        except Exception:
+            logging.getLogger(__name__).exception("benchmark run failed identifier=%s", identifier)
+            errors["advice" if args.advice else "scan"] += 1
+        finally:
+            db.close()
+
+    source = f"corpus={corpus.stats()}" if args.mode in ("record", "replay") else ""
+    print(f"mode={args.mode} {source} identifiers={len(identifiers)} concurrency={args.concurrency}")
+    wall_total = 0.0
+    for i in range(args.iterations):
+        if args.cold:
+            clear_caches()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            list(pool.map(run_one, identifiers))
+        wall = time.perf_counter() - start
+        wall_total += wall
+        print(f"iteration {i + 1}: {len(identifiers)} identifiers in {wall:.2f}s")
+
+    for stage in ("advice",) if args.advice else ("scan", "forecast"):
+        print(_summary(stage, timings[stage], errors[stage], wall_total))
+    if args.mode == "replay":
+        stats = corpus.stats()
+        print(f"corpus hits={stats['hits']} misses={stats['misses']} injected errors={get_fault_injector().injected_errors}")
+    elif args.mode == "record":
+        print(f"recorded={corpus.stats()['recorded']} -> {corpus.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
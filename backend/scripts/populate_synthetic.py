@@ -0,0 +1,119 @@
+"""Bulk-load synthetic market data into stocks, symbol_resolution, scan_cache and ohlcv. DATABASE_URL from .env.
+
+Symbols S00000.. with ZZ ISINs (app/adapters/synthetic.py); the same seed always produces the same data. Rows are
+upserted, so a rerun refreshes them. Run the app with DATA_SOURCE_MODE=synthetic (same SYNTHETIC_* settings) so
+cache misses and refreshes are served from the same generator. Use a scratch database.
+
+Examples:
+    python scripts/populate_synthetic.py --count 13600                    # full-universe scale, 2 years each
+    python scripts/populate_synthetic.py --count 1000 --years 10 --seed 7
+    python scripts/populate_synthetic.py --start 13600 --count 400 --types daily,quote
+"""
+import argparse
+import logging
+import sys
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend_dir.parent / ".env")
+    load_dotenv(Path.cwd().parent / ".env")
+except ImportError:
+    pass
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.adapters.synthetic import SyntheticMarket, synthetic_universe
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.models.base import ScanCache, Stock, SymbolResolution
+from app.services.ohlcv_store import OHLCVStore
+from app.services.scan_service import OHLCV_STORAGE
+
+DATA_TYPES = ("daily", "quote", "fundamentals", "news")
+
+
+def _upsert(db, model, rows: list[dict], keys: list[str]) -> None:
+    if not rows:
+        return
+    stmt = pg_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[getattr(model, k) for k in keys],
+        set_={c: stmt.excluded[c] for c in rows[0] if c not in keys},
+    )
+    db.execute(stmt)
+
+
+def main() -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000, help="symbols to generate (default 1000)")
+    parser.add_argument("--start", type=int, default=0, help="first universe index (default 0)")
+    parser.add_argument("--years", type=float, default=settings.synthetic_years, help="years of daily bars (default SYNTHETIC_YEARS)")
+    parser.add_argument("--seed", type=int, default=settings.synthetic_seed, help="default SYNTHETIC_SEED")
+    parser.add_argument("--end-date", default=settings.synthetic_end_date or None, help="YYYY-MM-DD of the last bar (default today)")
+    parser.add_argument("--types", default=",".join(DATA_TYPES), help=f"data types to load (default {','.join(DATA_TYPES)})")
+    parser.add_argument("--batch-size", type=int, default=100, help="symbols per transaction (default 100)")
+    parser.add_argument("--no-universe", action="store_true", help="do not write stocks / symbol_resolution rows")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    types = [t.strip() for t in args.types.split(",") if t.strip()]
+    unknown = set(types) - set(DATA_TYPES)
+    if unknown:
+        print(f"unknown data types: {', '.join(sorted(unknown))} (weekly/monthly are derived from daily on read)")
+        return 1
+    market = SyntheticMarket(
+        seed=args.seed,
+        years=args.years,
+        end_date=date.fromisoformat(args.end_date) if args.end_date else None,
+    )
+    universe = synthetic_universe(args.count, start=args.start)
+    db = SessionLocal()
+    started = time.perf_counter()
+    bars_written = 0
+    try:
+        for i in range(0, len(universe), args.batch_size):
+            chunk = universe[i:i + args.batch_size]
+            now = datetime.now(timezone.utc)
+            if not args.no_universe:
+                _upsert(db, Stock, [{"isin": u["isin"], "name": u["name"]} for u in chunk], ["isin"])
+                _upsert(db, SymbolResolution, [
+                    {"isin": u["isin"], "symbol": u["symbol"], "name": u["name"], "source": "SyntheticAdapter", "updated_at": now}
+                    for u in chunk
+                ], ["isin"])
+            cache_rows = []
+            if "daily" in types:
+                series = {u["symbol"]: market.daily(u["symbol"]) for u in chunk}
+                bars_written += OHLCVStore(db).append_many(series)
+                for symbol, bars in series.items():
+                    marker = {"storage": OHLCV_STORAGE, "bars": len(bars), "last_time": bars[-1]["time"] if bars else None}
+                    cache_rows.append({"symbol": symbol, "data_type": "daily", "interval": "", "payload": marker, "fetched_at": now})
+            for u in chunk:
+                symbol = u["symbol"]
+                if "quote" in types:
+                    cache_rows.append({"symbol": symbol, "data_type": "quote", "interval": "", "payload": market.quote(symbol), "fetched_at": now})
+                if "fundamentals" in types:
+                    cache_rows.append({"symbol": symbol, "data_type": "fundamentals", "interval": "", "payload": market.fundamentals(symbol), "fetched_at": now})
+                if "news" in types:
+                    cache_rows.append({"symbol": symbol, "data_type": "news", "interval": "", "payload": {"items": market.news(symbol)}, "fetched_at": now})
+            _upsert(db, ScanCache, cache_rows, ["symbol", "data_type", "interval"])
+            db.commit()
+            done = i + len(chunk)
+            elapsed = time.perf_counter() - started
+            print(f"{done}/{len(universe)} symbols, {bars_written} bars, {done / elapsed:.1f} symbols/s")
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(f"Loaded {len(universe)} symbols ({universe[0]['symbol']}..{universe[-1]['symbol']}), {bars_written} daily bars "
+          f"in {elapsed:.1f}s; seed={args.seed} years={args.years}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Bulk-resolve ISINs from the stocks table into symbol_resolution. Resumable; DATABASE_URL from .env.
+
+Examples:
+    python scripts/resolve_isins.py                       # Yahoo only, default budget
+    python scripts/resolve_isins.py --av-budget 20        # also spend up to 20 Alpha Vantage calls
+    python scripts/resolve_isins.py --restart             # ignore the checkpoint, start from the first ISIN
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend_dir.parent / ".env")
+    load_dotenv(Path.cwd().parent / ".env")
+except ImportError:
+    pass
+
+from app.adapters.alpha_vantage import AlphaVantageAdapter
+from app.adapters.yahoo import YahooFinanceAdapter
+from app.db.session import SessionLocal
+from app.services.isin_resolver import BudgetedResolver, BulkIsinResolver, ProviderBudget
+from app.services.rate_limiter import get_alpha_vantage_limiter
+
+DEFAULT_CHECKPOINT = backend_dir / ".resolve_isins.checkpoint.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel lookups (default 4)")
+    parser.add_argument("--batch-size", type=int, default=200, help="ISINs per chunk / upsert / checkpoint (default 200)")
+    parser.add_argument("--yahoo-budget", type=int, default=5000, help="max Yahoo search requests this run (default 5000)")
+    parser.add_argument("--yahoo-rps", type=float, default=4.0, help="Yahoo requests per second (default 4)")
+    parser.add_argument("--av-budget", type=int, default=0, help="max Alpha Vantage requests this run (default 0 = off)")
+    parser.add_argument("--av-rps", type=float, default=0.2, help="Alpha Vantage requests per second (default 0.2)")
+    parser.add_argument("--limit", type=int, default=None, help="resolve at most this many ISINs")
+    parser.add_argument("--missing-only", action="store_true", help="skip ISINs with an expired resolution")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="checkpoint file path")
+    parser.add_argument("--restart", action="store_true", help="delete the checkpoint and start over")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.restart and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+    adapters = [BudgetedResolver(YahooFinanceAdapter(), ProviderBudget("yahoo", args.yahoo_budget, args.yahoo_rps))]
+    if args.av_budget > 0:
+        # Never plan past today's remaining free-tier quota: a refused call looks like "not found"
+        av_budget = min(args.av_budget, get_alpha_vantage_limiter().remaining_today())
+        adapters.append(BudgetedResolver(AlphaVantageAdapter(), ProviderBudget("alpha_vantage", av_budget, args.av_rps)))
+
+    db = SessionLocal()
+    try:
+        summary = BulkIsinResolver(
+            db,
+            adapters,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint,
+            include_expired=not args.missing_only,
+            limit=args.limit,
+        ).run()
+    finally:
+        db.close()
+    print(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""Backend tests run without Postgres: services under test get fake adapters and stubbed storage."""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# app.db.session builds its engine at import; no connection is opened unless a test uses the database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
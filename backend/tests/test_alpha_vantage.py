@@ -0,0 +1,30 @@
+"""Alpha Vantage adapter: which answers are misses and which say nothing about the symbol."""
+import pytest
+
+from app.adapters import alpha_vantage
+from app.adapters.base import QuotaUnavailable, UpstreamUnavailable
+
+
+class RefusingLimiter:
+    def try_acquire(self, timeout=0.0):
+        return False
+
+
+def test_refused_slot_is_not_a_miss(monkeypatch):
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(alpha_vantage, "get_alpha_vantage_limiter", RefusingLimiter)
+    with pytest.raises(QuotaUnavailable):
+        alpha_vantage.AlphaVantageAdapter().get_quote("IBM")
+
+
+def test_rate_limit_bodies_are_transient():
+    with pytest.raises(UpstreamUnavailable):
+        alpha_vantage._check_response({"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute"})
+    with pytest.raises(UpstreamUnavailable):
+        alpha_vantage._check_response({"Information": "Our standard API rate limit is 25 requests per day."})
+
+
+def test_other_information_bodies_abstain():
+    assert alpha_vantage._check_response({"Information": "The **demo** API key is for demo purposes only."}) is None
+    assert alpha_vantage._check_response({"Information": "This is a premium endpoint."}) is None
+    assert alpha_vantage._check_response({"Error Message": "Invalid API call."}) is None
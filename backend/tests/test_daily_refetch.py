@@ -0,0 +1,83 @@
+"""Incremental daily refresh: basis-change detection and the full refetch that replaces stored history."""
+import threading
+
+from app.adapters.base import DataSourceAdapter
+from app.services.scan_service import ScanService, _basis_changed
+
+
+def _bars(days: int, close: float = 100.0) -> list[dict]:
+    return [
+        {"time": f"2024-{1 + d // 28:02d}-{1 + d % 28:02d}", "open": close, "high": close, "low": close, "close": close, "volume": 1}
+        for d in range(days)
+    ]
+
+
+class TestBasisChanged:
+    def test_same_close_is_unchanged(self):
+        assert not _basis_changed({"time": "2024-01-02", "close": 123.45}, [{"time": "2024-01-02", "close": 123.45}])
+
+    def test_adjusted_close_is_a_change(self):
+        assert _basis_changed({"time": "2024-01-02", "close": 123.45}, [{"time": "2024-01-02", "close": 61.725}])
+
+    def test_sub_dollar_storage_rounding_is_unchanged(self):
+        # Stored as Numeric(20, 4): 0.12345 went in as 0.1235 (off by 5e-5, 4e-4 relative)
+        anchor = {"time": "2024-01-02", "close": 0.1235}
+        assert not _basis_changed(anchor, [{"time": "2024-01-02", "close": 0.12345}])
+        assert not _basis_changed(anchor, [{"time": "2024-01-02", "close": 0.123549}])
+
+    def test_sub_dollar_change_of_a_tick_is_a_change(self):
+        assert _basis_changed({"time": "2024-01-02", "close": 0.1235}, [{"time": "2024-01-02", "close": 0.1237}])
+
+    def test_missing_anchor_day_is_unchanged(self):
+        assert not _basis_changed({"time": "2024-01-02", "close": 10.0}, [{"time": "2024-01-03", "close": 5.0}])
+
+
+class OverlapAdapter(DataSourceAdapter):
+    """Incremental fetches block until released; full fetches answer at once with the whole history."""
+
+    def __init__(self, full: list[dict], incremental: list[dict]):
+        self.full = full
+        self.incremental = incremental
+        self.incremental_started = threading.Event()
+        self.release = threading.Event()
+        self.full_calls = 0
+
+    def get_quote(self, symbol):
+        return None
+
+    def get_series(self, symbol, data_type, since=None):
+        if since:
+            self.incremental_started.set()
+            self.release.wait(5)
+            return self.incremental
+        self.full_calls += 1
+        self.release.set()
+        return self.full
+
+    def get_fundamentals(self, symbol):
+        return None
+
+    def get_news(self, symbol, limit=10):
+        return None
+
+
+def test_basis_change_replace_does_not_join_incremental_flight():
+    full = _bars(300, close=50.0)
+    incremental = full[-3:]
+    adapter = OverlapAdapter(full, incremental)
+    service = ScanService(None, adapters=[adapter], async_adapters=[])
+    stored: list[tuple[list[dict], bool]] = []
+    service._store_daily = lambda symbol, bars, replace=False: stored.append((bars, replace)) or bars
+    anchor = {"time": full[-3]["time"], "close": 100.0}  # stored before a 2:1 split
+
+    incremental_result: list = []
+    t = threading.Thread(target=lambda: incremental_result.append(service._fetch_series("OVLP", "daily", since=anchor["time"])))
+    t.start()
+    assert adapter.incremental_started.wait(5)
+    series = service._apply_daily_fetch("OVLP", anchor, incremental)
+    t.join(5)
+
+    assert adapter.full_calls == 1
+    assert stored == [(full, True)]
+    assert series == full
+    assert incremental_result == [incremental]
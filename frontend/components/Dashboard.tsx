@@ -28,14 +28,22 @@ const RANGES: { label: string; value: RangeKey }[] = [
   { label: "1Y", value: "1Y" },
 ];
 
+// Points requested from /series (about one per horizontal pixel of the chart); longer series are downsampled
+const CHART_MAX_POINTS = 500;
+
+// Calendar days per range (5 / 21 / 63 / 252 trading days); 1D reaches back over a weekend to the last session
+const RANGE_DAYS: Record<RangeKey, number> = { "1D": 4, "5D": 7, "1M": 30, "3M": 91, "1Y": 365 };
+
 function rangeToApiInterval(_range: RangeKey): string {
   return "1d";
 }
 
-function sliceSeriesByRange<T extends { time: string }>(series: T[], range: RangeKey): T[] {
-  if (series.length === 0) return series;
-  const n = range === "1D" ? 1 : range === "5D" ? 5 : range === "1M" ? 21 : range === "3M" ? 63 : 252;
-  return series.slice(-n);
+// First day of the range (YYYY-MM-DD). The server slices to it before downsampling, so short ranges keep
+// every bar and only long ones are thinned to CHART_MAX_POINTS.
+function rangeStart(range: RangeKey): string {
+  const start = new Date();
+  start.setUTCDate(start.getUTCDate() - RANGE_DAYS[range]);
+  return start.toISOString().slice(0, 10);
 }
 
 export function Dashboard({ isin }: Props) {
@@ -57,11 +65,10 @@ export function Dashboard({ isin }: Props) {
     setError(null);
     const intervalKey = rangeToApiInterval(range);
     const includeForecast = range === "1Y" || range === "3M" || range === "1M";
-    Promise.all([fetchSeries(isin, intervalKey, includeForecast), fetchMetrics(isin)])
+    const opts = { start: rangeStart(range), maxPoints: CHART_MAX_POINTS };
+    Promise.all([fetchSeries(isin, intervalKey, includeForecast, opts), fetchMetrics(isin)])
       .then(([s, m]) => {
-        const raw = (s.series || []).map((d) => ({ ...d, time: d.time?.slice(0, 10) || "" }));
-        const sliced = sliceSeriesByRange(raw, range);
-        setSeries(sliced);
+        setSeries((s.series || []).map((d) => ({ ...d, time: d.time?.slice(0, 10) || "" })));
         setMetrics(m);
         setForecastData(s);
       })
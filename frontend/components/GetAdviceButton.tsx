@@ -72,6 +72,8 @@ export function GetAdviceButton({ isin, onAdviceStart, onAdviceChunk, onAdviceCo
                       });
                     } else if (eventType === "step_failed") {
                       setSteps((prev) => [...prev, { step: d.step, stepIndex: prev.length, totalSteps: 10, percent: 0, status: "failed", message: d.message }]);
+                    } else if (eventType === "stage_skipped") {
+                      setSteps((prev) => [...prev, { step: d.step, stepIndex: prev.length, totalSteps: 10, percent: 0, status: "skipped", message: d.message }]);
                     } else if (eventType === "advice_chunk") {
                       const chunk = d.text ?? "";
                       adviceText += chunk;
@@ -128,9 +130,9 @@ export function GetAdviceButton({ isin, onAdviceStart, onAdviceChunk, onAdviceCo
             {steps.map((s, i) => (
               <li
                 key={`${s.step}-${i}`}
-                className={s.status === "failed" ? "text-red-400" : "text-zinc-500"}
+                className={s.status === "failed" ? "text-red-400" : s.status === "skipped" ? "text-amber-400" : "text-zinc-500"}
               >
-                {s.status === "failed" ? "✗ " : "✓ "}
+                {s.status === "failed" ? "✗ " : s.status === "skipped" ? "⏱ " : "✓ "}
                 {s.step}
                 {s.message && ` — ${s.message}`}
               </li>
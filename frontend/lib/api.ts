@@ -90,11 +90,25 @@ export type SeriesResponse = {
   upper_band?: TrendPoint[];
   lower_band?: TrendPoint[];
   forecast_stats?: { slope?: number; intercept?: number; std?: number; last_date?: string };
+  /** True when served from expired cache while a background refresh runs (stale-while-revalidate). */
+  stale?: boolean;
+  /** Points in the requested range before server-side downsampling. */
+  total_points?: number;
 };
 
-export async function fetchSeries(isin: string, interval: string, includeForecast = false): Promise<SeriesResponse> {
+export type SeriesOptions = { start?: string; end?: string; maxPoints?: number };
+
+export async function fetchSeries(
+  isin: string,
+  interval: string,
+  includeForecast = false,
+  opts: SeriesOptions = {}
+): Promise<SeriesResponse> {
   const params = new URLSearchParams({ interval });
   if (includeForecast) params.set("include_forecast", "true");
+  if (opts.start) params.set("start", opts.start);
+  if (opts.end) params.set("end", opts.end);
+  if (opts.maxPoints) params.set("max_points", String(opts.maxPoints));
   const r = await fetchWithError(`${API_URL}/api/stocks/${encodeURIComponent(isin)}/series?${params}`);
   if (!r.ok) throw new Error(await getErrorDetail(r));
   return r.json();
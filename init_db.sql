@@ -29,6 +29,7 @@ CREATE TABLE IF NOT EXISTS ohlcv (
     volume BIGINT,
     PRIMARY KEY (time, symbol)
 );
+CREATE INDEX IF NOT EXISTS ix_ohlcv_symbol_time ON ohlcv (symbol, time);
 
 CREATE TABLE IF NOT EXISTS sessions (
     id BIGSERIAL PRIMARY KEY,
@@ -52,6 +53,15 @@ CREATE TABLE IF NOT EXISTS stocks (
     name VARCHAR(255) NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS rate_limit_state (
+    name VARCHAR(50) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    refilled_at DOUBLE PRECISION NOT NULL,
+    day VARCHAR(10) NOT NULL,
+    daily_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+
 INSERT INTO stocks (isin, name) VALUES ('AN8068571086', 'Schlumberger') ON CONFLICT (isin) DO NOTHING;
 INSERT INTO stocks (isin, name) VALUES ('AT000000ETS9', 'Euro TeleSites') ON CONFLICT (isin) DO NOTHING;
 INSERT INTO stocks (isin, name) VALUES ('AT000000STR1', 'STRABAG') ON CONFLICT (isin) DO NOTHING;